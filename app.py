@@ -1,14 +1,34 @@
 import streamlit as st
-import re
 import os
-import json
-from collections import Counter
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Tuple
 
 import pandas as pd
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from yttrend import concurrency, fetch, history
+from yttrend.analytics import assign_channel_grade, get_channel_summary_row, make_simple_summary_for_channel
+from yttrend.concurrency import MAX_CONCURRENT_REQUESTS, ChannelFetchers, KeywordFetchers
+from yttrend.fetch import (
+    DEEP_CRAWL_MAX_VIDEOS, KEYWORD_MAX_PAGES, KeywordCrawler, concat_video_frames, iter_channel_upload_pages,
+)
+from yttrend.history import load_channel_history, load_channel_history_options, load_channel_snapshots
+from yttrend.ingest import INGEST_FLUSH_TIMEOUT, INGEST_QUEUE
+from yttrend.keyword_index import KEYWORD_INDEX
+from yttrend.momentum import load_view_momentum
+from yttrend.offline import API_MODE, OFFLINE_API_MODES
+from yttrend.perf import PERF_LOG_FILE, PerfRecorder, perf_span, recording, timed
+from yttrend.quota import (
+    QUOTA_LEDGER, QuotaBudgetExceeded, cache_only_mode, estimate_channel_run, estimate_comparison_run,
+    estimate_deep_crawl, estimate_keyword_run, estimate_multi_keyword_run,
+)
+from yttrend.text import extract_keywords_with_weight, extract_phrases
+from yttrend.utils import extract_channel_id, format_korean_unit
+from yttrend.watchlist import WATCHLIST, WatchlistPoller
 
 
 # ----------------------------
@@ -41,320 +61,109 @@ st.markdown(
 # ----------------------------
 
 def get_api_key() -> str:
-    """Streamlit Secrets 에서 API KEY 가져오기"""
+    """Streamlit Secrets 에서 API KEY 가져오기 (replay/synthetic 모드에서는 키 없이 동작)"""
+    if API_MODE in OFFLINE_API_MODES:
+        try:
+            return st.secrets.get("YOUTUBE_API_KEY", "") or "offline"
+        except Exception:
+            return "offline"
     key = st.secrets.get("YOUTUBE_API_KEY", "")
     if not key:
         st.error("❌ YOUTUBE_API_KEY 가 설정되지 않았습니다. Streamlit → App Settings → Secrets 에서 설정해 주세요.")
     return key
 
 
-def build_youtube(api_key: str):
-    """YouTube 클라이언트 생성"""
-    return build("youtube", "v3", developerKey=api_key)
-
-
-def parse_iso_duration(duration: str) -> int:
-    """ISO8601 duration(예: 'PT15M33S') → 초 단위 정수로 변환"""
-    if not duration:
-        return 0
-    pattern = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
-    match = pattern.match(duration)
-    if not match:
-        return 0
-    hours, mins, secs = match.groups()
-    hours = int(hours) if hours else 0
-    mins = int(mins) if mins else 0
-    secs = int(secs) if secs else 0
-    return hours * 3600 + mins * 60 + secs
-
-
-def weekday_kr_from_ts(ts: pd.Timestamp) -> str:
-    """요일을 한국어 한 글자로 반환"""
-    mapping = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
-    return mapping.get(ts.weekday(), "")
-
-
-def extract_channel_id(raw: str) -> str:
-    """사용자가 입력한 값에서 channelId 추출"""
-    raw = raw.strip()
-    if "youtube.com/channel/" in raw:
-        return raw.split("youtube.com/channel/")[-1].split("/")[0].split("?")[0]
-    if "youtube.com/" in raw:
-        path = raw.split("youtube.com/")[-1]
-        return path.split("/")[-1].split("?")[0]
-    return raw
-
-
-def safe_int(x):
-    try:
-        return int(x)
-    except Exception:
-        return 0
-
-
-def format_korean_unit(number):
-    """숫자를 한국어 단위(만, 억)로 포맷팅"""
-    if number >= 100000000:
-        return f"{number / 100000000:.1f}억"
-    elif number >= 10000:
-        return f"{number / 10000:.1f}만"
-    else:
-        return f"{number:,}"
-
-# --- UPGRADE: 4단계 - 성과 가중치 기반 키워드 추출 함수 ---
-
-def extract_keywords_with_weight(df: pd.DataFrame, top_n: int = 30) -> pd.DataFrame:
+@contextmanager
+def quota_preflight(estimated_units: int):
     """
-    UPGRADE: 조회수(views)를 가중치로 사용하여 키워드 점수를 매기고 추출
+    실행 전 예상 비용을 남은 예산과 비교
+    - 예산 안이면 그대로 실행
+    - 넘으면 새 API 호출 없이 캐시된 데이터만으로 실행 (없으면 QuotaBudgetExceeded)
     """
-    if df.empty:
-        return pd.DataFrame(columns=["keyword", "score"])
-
-    # 1. 불용어(Stopwords) 확장 및 정의
-    stopwords = {
-        "영상", "official", "video", "the", "and", "for", "with", "full", "ver",
-        "episode", "ep", "live", "tv", "show", "channel", "shorts", "공식", 
-        "하이라이트", "클립", "무대", "최신", "today", "day", "in", "of", "a", 
-        "이번주", "다시보기", "모음", "총정리", "최고", "오늘", "지금", "바로",
-        "story", "log", "vlog", "asmr", "asmr", "tip", "꿀팁", "방법", "하는법",
-        "저장", "구독", "좋아요", "댓글", "알림", "설정", "하나", "두개"
-    }
-
-    keyword_scores = Counter()
-
-    for _, row in df.iterrows():
-        title = row["title"].lower()
-        views = row["views"]
-        
-        # 조회수의 제곱근을 가중치로 사용
-        weight = views ** 0.5 
-        
-        # 정규식을 사용하여 한글, 영어, 숫자만 추출
-        tokens = re.findall(r"[가-힣a-zA-Z0-9]+", title)
-        
-        # 필터링 및 점수 합산
-        for t in tokens:
-            if len(t) >= 2 and t not in stopwords:
-                keyword_scores[t] += weight
-    
-    if not keyword_scores:
-        return pd.DataFrame(columns=["keyword", "score"])
-        
-    data = pd.DataFrame(
-        [{"keyword": k, "score": v} for k, v in keyword_scores.most_common(top_n)]
+    remaining = QUOTA_LEDGER.remaining()
+    if estimated_units <= remaining:
+        yield
+        return
+    st.warning(
+        f"⚠️ 예상 사용량 {estimated_units:,} units 가 오늘 남은 예산 {remaining:,} units 를 넘습니다. "
+        "새 API 호출 없이 캐시된 데이터만 사용합니다."
     )
-    data["score"] = data["score"].round(0).astype(int)
-    
-    return data
-
+    with cache_only_mode():
+        yield
 
-# --- UPGRADE: 3단계 - 히스토리 저장/로드 및 등급 부여 함수 ---
-
-HISTORY_FILE = "channel_history.json"
 
+# ----------------------------
+# 히스토리 저장 (화면용: 실패 시 오류 메시지 표시)
+# ----------------------------
 
-def save_channel_history(history_data: Dict):
-    """채널 히스토리 데이터를 JSON 파일에 저장"""
+def upsert_channel_history(row: Dict):
+    """채널 한 개의 요약 데이터를 히스토리에 추가/갱신하고, 같은 내용을 스냅샷으로 누적"""
     try:
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=4)
+        history.upsert_channel_history(row)
     except Exception as e:
         st.error(f"❌ 히스토리 저장 실패: {e}")
 
 
-def load_channel_history() -> Dict:
-    """JSON 파일에서 채널 히스토리 데이터를 불러오기"""
-    if not os.path.exists(HISTORY_FILE):
-        return {}
+def clear_channel_history():
+    """저장된 채널 요약과 스냅샷을 모두 삭제"""
     try:
-        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-
-def assign_channel_grade(info: Dict, recent_df: pd.DataFrame) -> str:
-    """채널 등급 (A1~C3)을 부여하는 간단한 로직"""
-    if recent_df.empty or info['subscriber_count'] == 0:
-        return "등급 외"
-
-    # 1. 규모 점수 (구독자 수) - 40%
-    sub_count = info['subscriber_count']
-    if sub_count >= 100000: rank_sub = 3
-    elif sub_count >= 10000: rank_sub = 2
-    else: rank_sub = 1
-    
-    # 2. 활동 점수 (일 평균 조회수) - 60%
-    avg_daily_views = recent_df['views_per_day'].mean()
-    if sub_count > 0:
-        daily_ratio = avg_daily_views / sub_count * 1000
-    else:
-        daily_ratio = 0
-        
-    if daily_ratio >= 10: rank_activity = 3
-    elif daily_ratio >= 3: rank_activity = 2
-    else: rank_activity = 1
-    
-    final_score = (rank_sub * 0.4 + rank_activity * 0.6)
-    
-    if final_score >= 2.6: grade_char = 'A'
-    elif final_score >= 1.8: grade_char = 'B'
-    else: grade_char = 'C'
-        
-    grade_num = 1
-    if sub_count < 10000: grade_num = 3
-    elif sub_count < 50000 and daily_ratio < 5: grade_num = 2 
-    elif sub_count >= 100000 and daily_ratio >= 10: grade_num = 1
-        
-    return f"{grade_char}{grade_num}"
+        history.clear_channel_history()
+    except Exception as e:
+        st.error(f"❌ 히스토리 삭제 실패: {e}")
 
 
-def get_channel_summary_row(info: Dict, df: pd.DataFrame) -> Dict:
-    """채널 히스토리에 저장할 핵심 데이터 요약"""
-    if df.empty:
-        return {}
-        
-    now = datetime.now(timezone.utc)
-    recent_30d = df[df["published_at"] > (now - timedelta(days=30))]
-
-    row = {
-        "channel_id": info["channel_id"],
-        "title": info["title"],
-        "subscriber_count": info["subscriber_count"],
-        "total_views": info["view_count"],
-        "video_count": info["video_count"],
-        "analysis_date": now.strftime('%Y-%m-%d %H:%M'),
-        "recent_video_count": len(df),
-        "recent_avg_views": int(df["views"].mean()),
-        "recent_avg_daily_views": int(df["views_per_day"].mean()),
-        "videos_last_30d": len(recent_30d),
-        "grade": assign_channel_grade(info, df)
-    }
-    return row
-
 # ----------------------------
 # 데이터 가져오기 (캐시 적용)
 # ----------------------------
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_videos_by_keyword(api_key: str, keyword: str, max_results: int) -> pd.DataFrame:
-    # (기존 코드와 동일하게 유지)
-    youtube = build_youtube(api_key)
-    max_results = max(1, min(max_results, 50))
-    search_resp = youtube.search().list(
-        part="snippet", q=keyword, type="video", order="relevance", maxResults=max_results,
-    ).execute()
-
-    video_ids = [item["id"]["videoId"] for item in search_resp.get("items", [])]
-    if not video_ids: return pd.DataFrame()
-
-    videos_resp = youtube.videos().list(
-        part="snippet,contentDetails,statistics", id=",".join(video_ids), maxResults=len(video_ids),
-    ).execute()
-
-    rows = []
-    for item in videos_resp.get("items", []):
-        snippet = item.get("snippet", {}); stats = item.get("statistics", {}); content = item.get("contentDetails", {})
-        published_at = snippet.get("publishedAt")
-        try: ts = pd.to_datetime(published_at).replace(tzinfo=timezone.utc)
-        except Exception: ts = pd.NaT
-        duration_sec = parse_iso_duration(content.get("duration", ""))
-
-        rows.append(
-            {
-                "video_id": item.get("id"), "title": snippet.get("title"), "description": snippet.get("description", ""),
-                "channel_title": snippet.get("channelTitle"), "channel_id": snippet.get("channelId"), "published_at": ts,
-                "views": safe_int(stats.get("viewCount")), "likes": safe_int(stats.get("likeCount")), "comments": safe_int(stats.get("commentCount")),
-                "duration_sec": duration_sec, "thumbnail_url": snippet.get("thumbnails", {}).get("medium", {}).get("url", ""),
-            }
-        )
+fetch_keyword_search_page = timed(cached=True)(
+    st.cache_data(ttl=3600, show_spinner=False)(fetch.fetch_keyword_search_page)
+)
+fetch_channel_basic = timed(cached=True)(st.cache_data(ttl=3600, show_spinner=False)(fetch.fetch_channel_basic))
+fetch_channel_video_ids = timed(cached=True)(st.cache_data(ttl=3600, show_spinner=False)(fetch.fetch_channel_video_ids))
+fetch_video_batch = timed(cached=True)(st.cache_data(ttl=3600, show_spinner=False)(fetch.fetch_video_batch))
+fetch_channel_recent_videos = timed(cached=True)(
+    st.cache_data(ttl=3600, show_spinner=False)(fetch.fetch_channel_recent_videos)
+)
 
-    df = pd.DataFrame(rows)
-    if df.empty: return df
-    now = datetime.now(timezone.utc)
-    df["days_since_publish"] = (now - df["published_at"]).dt.total_seconds() / (3600 * 24)
-    df["days_since_publish"] = df["days_since_publish"].replace(0, 0.1)
-    df["views_per_day"] = df["views"] / df["days_since_publish"]
-    df["duration_min"] = df["duration_sec"] / 60
-    df["weekday"] = df["published_at"].apply(weekday_kr_from_ts)
-    df["publish_hour"] = df["published_at"].dt.hour
-    df["max_watch_time_min"] = df["duration_min"] * df["views"]
-    return df.sort_values("views", ascending=False).reset_index(drop=True)
-
-
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_channel_basic(api_key: str, channel_id: str) -> Dict:
-    # (기존 코드와 동일하게 유지)
-    youtube = build_youtube(api_key)
-    resp = youtube.channels().list(
-        part="snippet,statistics,contentDetails", id=channel_id, maxResults=1,
-    ).execute()
-
-    items = resp.get("items", [])
-    if not items: return {}
-
-    item = items[0]
-    stats = item.get("statistics", {}); snippet = item.get("snippet", {})
-
-    return {
-        "channel_id": item.get("id"), "title": snippet.get("title"), "description": snippet.get("description", ""),
-        "published_at": pd.to_datetime(snippet.get("publishedAt")).replace(tzinfo=timezone.utc),
-        "subscriber_count": safe_int(stats.get("subscriberCount")), "video_count": safe_int(stats.get("videoCount")),
-        "view_count": safe_int(stats.get("viewCount")), "thumbnail_url": snippet.get("thumbnails", {}).get("medium", {}).get("url", ""),
-    }
+CACHED_FETCHERS = ChannelFetchers(fetch_channel_basic, fetch_channel_video_ids, fetch_video_batch)
+CACHED_KEYWORD_FETCHERS = KeywordFetchers(fetch_keyword_search_page, fetch_video_batch)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_channel_recent_videos(
-    api_key: str, channel_id: str, max_results: int
-) -> pd.DataFrame:
-    # (기존 코드와 동일하게 유지)
-    youtube = build_youtube(api_key)
-    max_results = max(1, min(max_results, 50))
-    search_resp = youtube.search().list(
-        part="snippet", channelId=channel_id, type="video", order="date", maxResults=max_results,
-    ).execute()
-
-    video_ids = [item["id"]["videoId"] for item in search_resp.get("items", [])]
-    if not video_ids: return pd.DataFrame()
-
-    videos_resp = youtube.videos().list(
-        part="snippet,contentDetails,statistics", id=",".join(video_ids), maxResults=len(video_ids),
-    ).execute()
-
-    rows = []
-    for item in videos_resp.get("items", []):
-        snippet = item.get("snippet", {}); stats = item.get("statistics", {}); content = item.get("contentDetails", {})
-        published_at = snippet.get("publishedAt")
-        try: ts = pd.to_datetime(published_at).replace(tzinfo=timezone.utc)
-        except Exception: ts = pd.NaT
-        duration_sec = parse_iso_duration(content.get("duration", ""))
-
-        rows.append(
-            {
-                "video_id": item.get("id"), "title": snippet.get("title"), "description": snippet.get("description", ""),
-                "published_at": ts, "views": safe_int(stats.get("viewCount")), "likes": safe_int(stats.get("likeCount")),
-                "comments": safe_int(stats.get("commentCount")), "duration_sec": duration_sec,
-                "thumbnail_url": snippet.get("thumbnails", {}).get("medium", {}).get("url", ""),
-            }
-        )
+def script_ctx_attacher() -> Callable:
+    """워커 스레드에서도 st.cache_data 가 동작하도록 현재 ScriptRunContext 를 붙이는 worker_init"""
+    ctx = get_script_run_ctx()
+
+    def attach_script_ctx():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    return attach_script_ctx
 
-    df = pd.DataFrame(rows)
-    if df.empty: return df
-    now = datetime.now(timezone.utc)
-    df["days_since_publish"] = (now - df["published_at"]).dt.total_seconds() / (3600 * 24)
-    df["days_since_publish"] = df["days_since_publish"].replace(0, 0.1)
-    df["views_per_day"] = df["views"] / df["days_since_publish"]
-    df["duration_min"] = df["duration_sec"] / 60
-    df["weekday"] = df["published_at"].apply(weekday_kr_from_ts)
-    df["publish_hour"] = df["published_at"].dt.hour
-    df["max_watch_time_min"] = df["duration_min"] * df["views"]
-    return df.sort_values("published_at", ascending=False).reset_index(drop=True)
+
+def fetch_channels_concurrently(
+    api_key: str, channel_ids: List[str], video_limit: int, max_workers: int = MAX_CONCURRENT_REQUESTS
+) -> Tuple[Dict[str, Tuple[Dict, pd.DataFrame]], Dict[str, str]]:
+    """캐시된 조회 함수로 동시 수집"""
+    return concurrency.fetch_channels_concurrently(
+        api_key, channel_ids, video_limit, max_workers, fetchers=CACHED_FETCHERS, worker_init=script_ctx_attacher(),
+    )
+
+
+def fetch_keywords_concurrently(
+    api_key: str, keywords: List[str], max_results: int, **crawler_options
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """캐시된 조회 함수로 여러 키워드 동시 수집 (videos.list 는 모든 키워드의 ID 를 모아 병합 조회)"""
+    return concurrency.fetch_keywords_concurrently(
+        api_key, keywords, max_results, fetchers=CACHED_KEYWORD_FETCHERS, worker_init=script_ctx_attacher(),
+        **crawler_options,
+    )
 
 
 # ----------------------------
 # SEO / 키워드 분석
 # ----------------------------
+@timed()
 def render_keyword_suggestions(df: pd.DataFrame):
     """
     UPGRADE: 가중치 기반으로 키워드 추천을 렌더링
@@ -386,35 +195,24 @@ def render_keyword_suggestions(df: pd.DataFrame):
         st.code(", ".join(tag_candidates), language="text")
         st.caption("※ 이 키워드를 제목, 설명, 태그에 활용해 보세요.")
 
-# ----------------------------
-# 요약 메시지 생성 (룰 기반)
-# ----------------------------
-
-def make_simple_summary_for_channel(df: pd.DataFrame) -> str:
-    # (기존 코드와 동일하게 유지)
-    if df.empty: return "최근 영상 데이터가 없어 패턴을 분석할 수 없습니다."
-    n = len(df); avg_views = int(df["views"].mean()); median_views = int(df["views"].median())
-    max_views = int(df["views"].max()); short = df[df["duration_min"] <= 8]; long = df[df["duration_min"] >= 20]
-    parts = []
-    parts.append(f"최근 {n}개 영상 기준으로 평균 조회수는 약 {avg_views:,}회, 중앙값은 {median_views:,}회입니다.")
-    parts.append(f"가장 많이 본 영상은 약 {max_views:,}회까지 기록했습니다.")
-    if not short.empty and not long.empty:
-        short_avg = int(short["views"].mean()); long_avg = int(long["views"].mean())
-        if short_avg > long_avg * 1.3:
-            parts.append(f"8분 이하 짧은 영상의 평균 조회수가 {short_avg:,}회로, 20분 이상 긴 영상({long_avg:,}회)보다 꽤 잘 나오는 편입니다. " "짧은 길이의 콘텐츠 비중을 조금 더 늘려보는 것도 좋겠습니다.")
-        elif long_avg > short_avg * 1.3:
-            parts.append(f"20분 이상 긴 영상의 평균 조회수가 {long_avg:,}회로, 8분 이하 영상({short_avg:,}회)보다 유리합니다. " "깊이 있는 장편 콘텐츠가 채널에 잘 맞는 편으로 보입니다.")
-    weekday_mean = df.groupby("weekday")["views"].mean().sort_values(ascending=False)
-    if len(weekday_mean) >= 3:
-        best_day = weekday_mean.index[0]
-        parts.append(f"요일별 평균 조회수는 **{best_day}요일 업로드분**이 가장 높게 나타납니다. " "해당 요일 전후로 중요한 영상을 배치하는 전략을 고려해볼 만합니다.")
-    return "\n\n".join(parts)
+    phrase_df = extract_phrases(df, top_n=15)
+    if not phrase_df.empty:
+        st.markdown("**자주 함께 쓰이는 구문**")
+        st.dataframe(
+            phrase_df[["phrase", "count", "pmi", "score"]].rename(
+                columns={"phrase": "구문", "count": "등장 수", "pmi": "결합도(PMI)", "score": "성과 점수"}
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption("※ 결합도가 높을수록 두세 단어가 우연보다 훨씬 자주 붙어 나옵니다. 통째로 제목/태그에 쓰기 좋습니다.")
 
 
 # ----------------------------
 # 화면 구성 함수들
 # ----------------------------
 
+@timed()
 def render_channel_kpi_cards(info: Dict, df: pd.DataFrame):
     """
     UPGRADE: 채널 분석 페이지 상단에 구독자, 총 조회수, 평균 조회수, 성장률을 보여주는 KPI 카드 4개 배치
@@ -462,6 +260,7 @@ def render_channel_kpi_cards(info: Dict, df: pd.DataFrame):
         delta_color="inverse" if growth_delta < 0 else "normal"
     )
 
+@timed()
 def render_basic_stats_cards_for_videos(df: pd.DataFrame, title: str):
     """
     UPGRADE: 키워드 분석 페이지의 기본 통계 카드를 깔끔하게 재구성
@@ -484,6 +283,7 @@ def render_basic_stats_cards_for_videos(df: pd.DataFrame, title: str):
     st.caption(f"※ 분석된 영상의 중앙값 조회수는 {median_views:,}회이며, 이론상 최대 시청시간은 {total_max_watch_min:,}분입니다. ")
 
 
+@timed()
 def render_video_table(df: pd.DataFrame):
     # (기존 코드에서 채널명 칼럼 추가)
     if df.empty: return
@@ -505,6 +305,7 @@ def render_video_table(df: pd.DataFrame):
     )
 
 
+@timed()
 def render_pattern_charts(df: pd.DataFrame):
     # (기존 코드와 동일하게 유지)
     if df.empty: return
@@ -514,7 +315,7 @@ def render_pattern_charts(df: pd.DataFrame):
         st.markdown("**요일별 평균 조회수**")
         weekday_order = ["월", "화", "수", "목", "금", "토", "일"]
         weekday_mean = (
-            df.groupby("weekday")["views"].mean().reindex(weekday_order).dropna().astype(int)
+            df.groupby("weekday", observed=True)["views"].mean().reindex(weekday_order).dropna().astype(int)
         )
         if not weekday_mean.empty: st.bar_chart(weekday_mean)
     with c2:
@@ -538,6 +339,7 @@ def render_pattern_charts(df: pd.DataFrame):
         )
 
 
+@timed()
 def render_top_thumbnails(df: pd.DataFrame):
     # (기존 코드와 동일하게 유지)
     if df.empty: return
@@ -551,34 +353,168 @@ def render_top_thumbnails(df: pd.DataFrame):
             st.caption(f"조회수: {row['views']:,}회")
 
 
+@timed()
+def render_view_momentum(df: pd.DataFrame):
+    """관측 이력이 두 번 이상 쌓인 영상의 최근 조회 속도/가속도와 급상승 여부"""
+    if df.empty: return
+    INGEST_QUEUE.flush(INGEST_FLUSH_TIMEOUT)  # 이번 rerun 에서 받은 조회수까지 관측 이력에 반영된 뒤 계산
+    momentum = load_view_momentum(video_ids=df["video_id"].tolist())
+    momentum = momentum[momentum["velocity"].notna()]
+    if momentum.empty: return
+    st.subheader("🚀 조회 속도 추이 (반복 관측 기준)")
+    n_breakout = int(momentum["breakout"].sum())
+    st.caption(
+        f"관측 2회 이상 영상 {len(momentum):,}개 · 채널 기준선 대비 급상승 {n_breakout:,}개 "
+        "(속도: 최근 두 관측 사이 일 조회수 증가, z 점수: 같은 채널 최근 30일 속도 분포 대비)"
+    )
+    table = momentum.merge(df[["video_id", "title"]], on="video_id", how="left")
+    st.dataframe(
+        table[["title", "velocity", "acceleration", "baseline_velocity", "zscore", "breakout", "observations"]].rename(
+            columns={
+                "title": "제목", "velocity": "조회 속도(회/일)", "acceleration": "가속도(회/일²)",
+                "baseline_velocity": "채널 기준 속도", "zscore": "z 점수", "breakout": "급상승", "observations": "관측 수",
+            }
+        ),
+        use_container_width=True, hide_index=True,
+        column_config={
+            "조회 속도(회/일)": st.column_config.NumberColumn(format="%.0f"),
+            "가속도(회/일²)": st.column_config.NumberColumn(format="%.1f"),
+            "채널 기준 속도": st.column_config.NumberColumn(format="%.0f"),
+            "z 점수": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+
+
 # ----------------------------
 # 각 분석 모드 렌더링
 # ----------------------------
 
-def page_keyword_trend(api_key: str, video_limit: int):
+def page_keyword_trend(api_key: str):
     st.title("🎯 키워드 트렌드 분석")
     st.markdown("##### 현재 검색 키워드를 중심으로 유튜브 트렌드를 분석합니다.")
 
-    keyword = st.text_input("분석할 키워드를 입력하세요 (예: 시니어 쇼핑, 건강, 요리 등)", key="kw_input")
-    st.caption(f"※ 가져올 영상 수: {video_limit}개. API 할당량 소모에 주의하세요.")
+    keyword = st.text_input(
+        "분석할 키워드를 입력하세요 (예: 시니어 쇼핑 · 여러 키워드는 쉼표로 구분: 건강, 요리)", key="kw_input",
+    )
+    video_limit = st.slider(
+        "가져올 영상 수 (키워드 검색)",
+        min_value=10, max_value=KEYWORD_MAX_PAGES * 50, value=50, step=10, key="kw_max_results",
+        help="검색 결과 50개마다 search.list 1회(100 units)가 추가됩니다. 여러 페이지에 겹쳐 나온 영상은 한 번만 조회합니다.",
+    )
+    keywords = list(dict.fromkeys(k.strip() for k in keyword.split(",") if k.strip()))
+    estimated = estimate_multi_keyword_run(len(keywords), video_limit) if len(keywords) > 1 else estimate_keyword_run(video_limit)
+    st.caption(f"※ 키워드당 가져올 영상 수: {video_limit}개. 예상 쿼터 사용량 최대 {estimated:,} units.")
+
+    if not keywords: st.info("키워드를 입력한 뒤 Enter 를 눌러주세요."); return
+    if len(keywords) > 1:
+        page_multi_keyword_trend(api_key, keywords, video_limit)
+        return
+    keyword = keywords[0]
+
+    # 검색 결과가 페이지 단위로 도착할 때마다 같은 자리에 다시 그림
+    # (도착하는 동안에는 요약 카드/키워드/표만, 다 받으면 썸네일과 차트까지 전체 화면)
+    status = st.empty()
+    results = st.empty()
+    frames, df = [], pd.DataFrame()
+    # 남은 쿼터 안에서 갈 수 있는 페이지까지만 검색 (한 페이지도 못 가면 캐시된 결과만 사용)
+    remaining = QUOTA_LEDGER.remaining()
+    crawler = KeywordCrawler(
+        api_key, keyword, video_limit,
+        budget_units=remaining if remaining >= estimate_keyword_run(1) else None,
+        search_page=fetch_keyword_search_page, video_batch=fetch_video_batch,
+    )
+    try:
+        with quota_preflight(estimate_keyword_run(1)):
+            status.info(f"키워드 '{keyword}' 관련 YouTube 데이터 불러오는 중...")
+            for page_df in crawler:
+                frames.append(page_df)
+                df = concat_video_frames(frames, sort_by="views")
+                if len(df) < video_limit:
+                    status.info(f"키워드 '{keyword}' 관련 영상 {len(df):,} / {video_limit:,}개 불러오는 중...")
+                    with results.container():
+                        render_keyword_results(keyword, df, complete=False)
+    except HttpError as e:
+        status.empty()
+        msg = str(e)
+        if "quotaExceeded" in msg: st.error("❌ YouTube API 일일 할당량이 초과되었습니다. 내일 다시 시도하거나, 가져올 영상 수를 줄여 주세요.")
+        elif "keyInvalid" in msg: st.error("❌ YouTube API 키가 유효하지 않습니다. 키를 다시 확인해 주세요.")
+        else: st.error(f"API 호출 중 오류가 발생했습니다: {msg}")
+        if df.empty: return
+    except QuotaBudgetExceeded as e:
+        status.empty()
+        st.error(f"❌ 쿼터 예산 부족으로 실행하지 않았습니다. {e}")
+        if df.empty: return
+    else:
+        status.empty()
+
+    if df.empty: st.warning("검색된 영상이 없습니다."); return
+
+    if crawler.stop_reason == "budget":
+        st.info(f"ℹ️ 오늘 남은 쿼터 안에서 {crawler.pages}페이지까지만 검색해 {len(df):,}개 영상을 분석합니다.")
+    elif crawler.stop_reason == "depth" and len(df) < video_limit:
+        st.info(f"ℹ️ 최대 검색 깊이({crawler.max_pages}페이지)까지 검색해 {len(df):,}개 영상을 분석합니다.")
+    if crawler.duplicates:
+        st.caption(f"※ 여러 페이지에 겹쳐 나온 영상 {crawler.duplicates:,}개는 한 번만 집계했습니다.")
 
-    if not keyword: st.info("키워드를 입력한 뒤 Enter 를 눌러주세요."); return
+    with results.container():
+        render_keyword_results(keyword, df, complete=True)
 
+
+def page_multi_keyword_trend(api_key: str, keywords: List[str], video_limit: int):
+    """여러 키워드를 한 번에 수집해 나란히 비교 (영상 상세 조회는 모든 키워드를 모아 50개 배치로 병합)"""
+    remaining = QUOTA_LEDGER.remaining()
     try:
-        with st.spinner(f"키워드 '{keyword}' 관련 YouTube 데이터 불러오는 중..."):
-            df = fetch_videos_by_keyword(api_key, keyword, video_limit)
+        with quota_preflight(estimate_multi_keyword_run(len(keywords), 1)):
+            with st.spinner(f"키워드 {len(keywords)}개 동시 분석 중..."):
+                results, errors = fetch_keywords_concurrently(
+                    api_key, keywords, video_limit,
+                    budget_units=remaining // len(keywords) if remaining >= estimate_multi_keyword_run(len(keywords), 1) else None,
+                )
     except HttpError as e:
         msg = str(e)
         if "quotaExceeded" in msg: st.error("❌ YouTube API 일일 할당량이 초과되었습니다. 내일 다시 시도하거나, 가져올 영상 수를 줄여 주세요.")
         elif "keyInvalid" in msg: st.error("❌ YouTube API 키가 유효하지 않습니다. 키를 다시 확인해 주세요.")
         else: st.error(f"API 호출 중 오류가 발생했습니다: {msg}")
         return
+    except QuotaBudgetExceeded as e:
+        st.error(f"❌ 쿼터 예산 부족으로 실행하지 않았습니다. {e}")
+        return
 
-    if df.empty: st.warning("검색된 영상이 없습니다."); return
+    for kw, message in errors.items():
+        st.warning(f"⚠️ '{kw}' 검색 중 오류가 발생해 제외했습니다: {message}")
+    found = [kw for kw in keywords if kw in results and not results[kw].empty]
+    if not found: st.warning("검색된 영상이 없습니다."); return
 
+    st.markdown("---")
+    st.subheader("📊 키워드별 비교")
+    summary = pd.DataFrame([
+        {
+            "키워드": kw, "영상 수": len(results[kw]), "총 조회수": int(results[kw]["views"].sum()),
+            "평균 조회수": int(results[kw]["views"].mean()), "중앙값 조회수": int(results[kw]["views"].median()),
+        }
+        for kw in found
+    ])
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    shared = sum(len(results[kw]) for kw in found) - len(set().union(*(results[kw]["video_id"] for kw in found)))
+    if shared:
+        st.caption(f"※ 여러 키워드 검색에 겹쳐 나온 영상 {shared:,}건은 영상 상세를 한 번만 조회했습니다.")
+
+    for tab, kw in zip(st.tabs(found), found):
+        with tab:
+            render_keyword_results(kw, results[kw], complete=False)
+
+
+def render_keyword_results(keyword: str, df: pd.DataFrame, complete: bool):
+    """키워드 분석 결과 화면 (complete=False 면 수집 도중 보여줄 요약 카드/키워드 순위/표만)"""
     st.markdown("---")
     render_basic_stats_cards_for_videos(df, f"'{keyword}' 관련 영상 요약")
     st.markdown("---")
+    if not complete:
+        render_keyword_suggestions(df)
+        st.markdown("---")
+        render_video_table(df)
+        return
+
     render_top_thumbnails(df)
     st.markdown("---")
     
@@ -588,6 +524,74 @@ def page_keyword_trend(api_key: str, video_limit: int):
         
     st.markdown("---")
     render_video_table(df)
+    st.markdown("---")
+    render_indexed_keywords(keyword)
+
+
+# 누적 키워드 색인 조회 기간 (게시일 기준, None = 전체)
+INDEX_WINDOW_DAYS = {"전체 기간": None, "최근 7일": 7, "최근 30일": 30, "최근 90일": 90, "최근 1년": 365}
+
+
+@timed()
+def render_indexed_keywords(keyword: str):
+    """지금까지 조회한 모든 영상으로 쌓은 키워드 색인의 상위 키워드 (API 호출 없음)"""
+    INGEST_QUEUE.flush(INGEST_FLUSH_TIMEOUT)  # 이번 rerun 에서 받은 영상까지 색인에 반영된 뒤 조회
+    stats = KEYWORD_INDEX.stats()
+    if not stats["videos"]: return
+    st.subheader("📚 누적 키워드 색인")
+    c_scope, c_window = st.columns(2)
+    with c_scope:
+        scope = st.radio(
+            "대상 영상", [f"'{keyword}' 검색으로 찾은 영상", "지금까지 조회한 전체 영상"],
+            horizontal=True, key="kw_index_scope",
+        )
+    with c_window:
+        window = st.selectbox("게시일 기준 기간", list(INDEX_WINDOW_DAYS), key="kw_index_window")
+    days = INDEX_WINDOW_DAYS[window]
+    kw_df = KEYWORD_INDEX.top_keywords(
+        30, query=keyword if scope.startswith("'") else None,
+        since=time.time() - days * 86400 if days else None,
+    )
+    st.caption(
+        f"※ 색인된 영상 {stats['videos']:,}개 · 키워드 {stats['keywords']:,}개. "
+        "영상을 새로 조회하거나 조회수가 갱신될 때마다 점수가 누적 반영됩니다."
+    )
+    if kw_df.empty:
+        st.info("조건에 맞는 색인 영상이 없습니다.")
+        return
+    st.dataframe(
+        kw_df.rename(columns={"score": "성과 점수", "videos": "영상 수"}),
+        use_container_width=True, hide_index=True,
+    )
+
+
+@timed()
+def crawl_channel_uploads(api_key: str, info: Dict, max_videos: int) -> pd.DataFrame:
+    """업로드 재생목록 심층 크롤링 (진행률 표시, 같은 세션에서는 결과 재사용)"""
+    cache = st.session_state.setdefault("deep_crawl_results", {})
+    key = (info["channel_id"], max_videos)
+    if key in cache:
+        return cache[key]
+
+    if not info.get("uploads_playlist_id"):
+        return pd.DataFrame()
+
+    target = min(max_videos, info["video_count"]) or max_videos
+    progress = st.progress(0.0, text="업로드 재생목록 크롤링 중...")
+    pages = []
+    collected = 0
+    for page_df in iter_channel_upload_pages(api_key, info["uploads_playlist_id"], max_videos):
+        pages.append(page_df)
+        collected += len(page_df)
+        progress.progress(min(collected / target, 1.0), text=f"업로드 재생목록 크롤링 중... {collected:,} / {target:,}개")
+    progress.empty()
+
+    pages = [p for p in pages if not p.empty]
+    if not pages:
+        return pd.DataFrame()
+    df = pd.concat(pages, ignore_index=True).sort_values("published_at", ascending=False).reset_index(drop=True)
+    cache[key] = df
+    return df
 
 
 def page_single_channel(api_key: str, video_limit: int):
@@ -603,33 +607,60 @@ def page_single_channel(api_key: str, video_limit: int):
 
     channel_id = extract_channel_id(raw_input)
 
+    c_deep, c_max = st.columns([2, 1])
+    with c_deep:
+        deep_crawl = st.checkbox(
+            "📚 전체 업로드 심층 크롤링 (최근 영상 대신 채널의 전체 영상 분석)", key="deep_crawl",
+            help="업로드 재생목록을 50개씩 넘기며 수집합니다. 50개당 약 2 units 로, 검색 기반 수집보다 훨씬 저렴합니다.",
+        )
+    with c_max:
+        deep_max = st.number_input(
+            "최대 영상 수", min_value=50, max_value=DEEP_CRAWL_MAX_VIDEOS, value=500, step=50,
+            key="deep_max", disabled=not deep_crawl,
+        )
+
+    estimated = estimate_deep_crawl(int(deep_max)) if deep_crawl else estimate_channel_run(video_limit)
     try:
-        with st.spinner("채널/영상 데이터 수집 중..."):
-            info = fetch_channel_basic(api_key, channel_id)
-            df = fetch_channel_recent_videos(api_key, channel_id, video_limit)
+        with quota_preflight(estimated):
+            with st.spinner("채널/영상 데이터 수집 중..."):
+                info = fetch_channel_basic(api_key, channel_id)
+                if not deep_crawl:
+                    df = fetch_channel_recent_videos(api_key, channel_id, video_limit)
+            if deep_crawl and info:
+                df = crawl_channel_uploads(api_key, info, int(deep_max))
     except HttpError as e:
         msg = str(e)
         if "quotaExceeded" in msg: st.error("❌ YouTube API 일일 할당량이 초과되었습니다. 내일 다시 시도하거나, 가져올 영상 수를 줄여 주세요.")
         elif "keyInvalid" in msg: st.error("❌ YouTube API 키가 유효하지 않습니다. 키를 다시 확인해 주세요.")
         else: st.error(f"API 호출 중 오류가 발생했습니다: {msg}")
         return
+    except QuotaBudgetExceeded as e:
+        st.error(f"❌ 쿼터 예산 부족으로 실행하지 않았습니다. {e}"); return
 
     if not info: st.error("채널 정보를 가져오지 못했습니다. 채널 ID/URL을 다시 확인해 주세요."); return
     
     # --- UPGRADE: 채널 히스토리 저장 기능 추가 및 등급 표시 ---
-    history_data = load_channel_history()
-
     st.markdown("---")
-    col_save, col_grade = st.columns([1, 4])
+    col_save, col_watch, col_grade = st.columns([1, 1, 3])
     
     with col_save:
         save_button = st.button("💾 이 채널 히스토리에 저장", type="secondary")
+    with col_watch:
+        watch_button = st.button("👀 워치리스트에 추가", type="secondary")
+
+    if watch_button:
+        try:
+            if WATCHLIST.add("channel", [info["channel_id"]]):
+                st.success(f"✅ 채널 '{info['title']}' 을(를) 워치리스트에 추가했습니다.")
+            else:
+                st.info("이미 워치리스트에 있는 채널입니다.")
+        except Exception as e:
+            st.error(f"❌ 워치리스트 추가 실패: {e}")
 
     if save_button:
         summary_data = get_channel_summary_row(info, df)
         if summary_data:
-            history_data[channel_id] = summary_data
-            save_channel_history(history_data)
+            upsert_channel_history(summary_data)
             st.success(f"✅ 채널 '{info['title']}' 정보가 히스토리에 저장되었습니다!")
         else:
             st.warning("저장할 최근 영상 데이터가 충분하지 않습니다.")
@@ -660,11 +691,47 @@ def page_single_channel(api_key: str, video_limit: int):
     st.markdown("---")
 
     render_top_thumbnails(df)
+    render_view_momentum(df)
     render_pattern_charts(df)
     render_keyword_suggestions(df)
     render_video_table(df)
 
 
+@timed()
+def render_channel_trajectory(df_history: pd.DataFrame):
+    """저장된 스냅샷으로 채널의 구독자/조회수 변화를 API 호출 없이 보여줌"""
+    st.subheader("📅 채널 성장 추이 (저장 시점별 스냅샷)")
+
+    channel_options = dict(zip(df_history["title"], df_history["channel_id"]))
+    selected_title = st.selectbox("추이를 볼 채널", options=list(channel_options.keys()), key="traj_select")
+    snapshots = load_channel_snapshots(channel_options[selected_title])
+
+    if len(snapshots) < 2:
+        st.info("스냅샷이 2개 이상 쌓이면 변화량을 볼 수 있습니다. 다른 날 같은 채널을 다시 저장해 보세요.")
+        return
+
+    snapshots["analysis_date"] = pd.to_datetime(snapshots["analysis_date"])
+    snapshots = snapshots.set_index("analysis_date")
+    deltas = snapshots[["subscriber_count", "total_views"]].diff().dropna().astype(int)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("**구독자 수 추이**")
+        st.line_chart(snapshots["subscriber_count"])
+        st.markdown("**직전 스냅샷 대비 구독자 증감**")
+        st.bar_chart(deltas["subscriber_count"])
+    with c2:
+        st.markdown("**총 조회수 추이**")
+        st.line_chart(snapshots["total_views"])
+        st.markdown("**직전 스냅샷 대비 조회수 증감**")
+        st.bar_chart(deltas["total_views"])
+
+    st.dataframe(
+        deltas.rename(columns={"subscriber_count": "구독자 증감", "total_views": "조회수 증감"}),
+        use_container_width=True,
+    )
+
+
 def page_channel_history():
     """UPGRADE: 3단계 - 히스토리 저장 채널 목록을 보여주는 페이지"""
     st.title("📚 채널 히스토리 및 비교 분석")
@@ -692,7 +759,7 @@ def page_channel_history():
     
     st.subheader("🏁 저장된 채널 요약 테이블")
     st.dataframe(
-        df_history[show_cols].rename(columns=rename).sort_values("subscriber_count", ascending=False),
+        df_history[show_cols].sort_values("subscriber_count", ascending=False).rename(columns=rename),
         use_container_width=True, hide_index=True
     )
 
@@ -708,9 +775,13 @@ def page_channel_history():
         st.bar_chart(df_history.set_index("title")["recent_avg_views"])
         
     st.markdown("---")
+
+    render_channel_trajectory(df_history)
+
+    st.markdown("---")
     
-    if st.button("🗑️ 저장된 히스토리 전체 삭제", type="danger"):
-        save_channel_history({})
+    if st.button("🗑️ 저장된 히스토리 전체 삭제", type="secondary"):
+        clear_channel_history()
         st.success("✅ 채널 히스토리가 모두 삭제되었습니다. 페이지를 새로고침합니다.")
         st.rerun()
 
@@ -720,16 +791,11 @@ def page_competitive_channels(api_key: str, video_limit: int):
     st.title("🎯 경쟁 채널 벤치마킹")
     st.markdown("##### 히스토리에 저장된 채널들을 비교하여 벤치마킹합니다.")
 
-    history_data = load_channel_history()
+    channel_options = load_channel_history_options()
     
-    if not history_data:
+    if not channel_options:
         st.info("비교할 채널이 없습니다. '특정 채널 심층 분석' 페이지에서 채널을 분석하고 저장해 주세요.")
         return
-
-    channel_options = {
-        data['title']: data['channel_id']
-        for data in history_data.values()
-    }
     
     selected_titles = st.multiselect(
         "🔎 비교할 채널을 선택하세요 (최소 2개)",
@@ -744,22 +810,32 @@ def page_competitive_channels(api_key: str, video_limit: int):
 
     selected_ids = [channel_options[title] for title in selected_titles]
 
+    max_workers = st.slider(
+        "동시 요청 수", min_value=1, max_value=16, value=MAX_CONCURRENT_REQUESTS,
+        help="채널 정보/영상 요청을 동시에 몇 개까지 보낼지 정합니다. 너무 크면 API 오류가 날 수 있습니다.",
+        key="comp_workers",
+    )
+
     if st.button("📊 경쟁 채널 비교 실행", type="primary"):
         rows = []
         error_channels = []
 
+        try:
+            with quota_preflight(estimate_comparison_run(len(selected_ids), video_limit)):
+                with st.spinner(f"채널 {len(selected_ids)}개 동시 분석 중..."):
+                    results, errors = fetch_channels_concurrently(api_key, selected_ids, video_limit, max_workers)
+        except HttpError as e:
+            if "quotaExceeded" in str(e):
+                st.error("❌ YouTube API 일일 할당량이 초과되었습니다. 더 이상 채널을 분석할 수 없습니다."); return
+            raise
+        except QuotaBudgetExceeded as e:
+            st.error(f"❌ 쿼터 예산 부족으로 비교를 실행하지 않았습니다. {e}"); return
+
         for title, cid in zip(selected_titles, selected_ids):
-            try:
-                with st.spinner(f"채널 '{title}' 분석 중..."):
-                    info = fetch_channel_basic(api_key, cid)
-                    df = fetch_channel_recent_videos(api_key, cid, video_limit)
-            except HttpError as e:
-                msg = str(e)
-                if "quotaExceeded" in msg:
-                    st.error("❌ YouTube API 일일 할당량이 초과되었습니다. 더 이상 채널을 분석할 수 없습니다."); return
-                else:
-                    error_channels.append(f"{title} (ID: {cid}, 오류: {msg})"); continue
+            if cid in errors:
+                error_channels.append(f"{title} (ID: {cid}, 오류: {errors[cid]})"); continue
 
+            info, df = results.get(cid, ({}, pd.DataFrame()))
             if not info or df.empty:
                 error_channels.append(f"{title} (ID: {cid}, 데이터 부족)"); continue
 
@@ -800,6 +876,65 @@ def page_competitive_channels(api_key: str, video_limit: int):
 # 메인
 # ----------------------------
 
+def render_quota_status():
+    """사이드바: 오늘 쿼터 사용량 (태평양 시간 기준 하루)"""
+    usage = QUOTA_LEDGER.usage_today()
+    used = sum(usage.values())
+    st.sidebar.markdown("### 📒 오늘 쿼터 사용량")
+    st.sidebar.progress(min(used / QUOTA_LEDGER.budget, 1.0) if QUOTA_LEDGER.budget else 1.0)
+    st.sidebar.caption(
+        f"{used:,} / {QUOTA_LEDGER.budget:,} units"
+        + (" (" + ", ".join(f"{k} {v:,}" for k, v in sorted(usage.items())) + ")" if usage else "")
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def start_watchlist_poller(api_key: str) -> WatchlistPoller:
+    """프로세스당 하나의 백그라운드 워치리스트 폴러 (YT_WATCHLIST_AUTOPOLL=1 일 때만 시작)"""
+    return WatchlistPoller(api_key).start()
+
+
+def render_watchlist_status(api_key: str):
+    """사이드바: 워치리스트 크기와 백그라운드 폴링 결과"""
+    counts = WATCHLIST.counts()
+    if not counts:
+        return
+    poller = start_watchlist_poller(api_key) if os.environ.get("YT_WATCHLIST_AUTOPOLL") == "1" else None
+    st.sidebar.markdown("### 👀 워치리스트")
+    caption = f"채널 {counts.get('channel', 0):,}개 · 영상 {counts.get('video', 0):,}개"
+    report = poller.last_report if poller else None
+    if report is not None and report.batches:
+        caption += (
+            f" · 최근 폴링 {report.batches:,}배치 (304 {report.not_modified:,}, "
+            f"변경 {sum(len(v) for v in report.changed.values()):,})"
+        )
+    st.sidebar.caption(caption)
+
+
+def render_perf_panel(recorder: PerfRecorder):
+    """사이드바: 이번 rerun 의 구간별 실행 시간 / 캐시 적중 / 쿼터 사용량"""
+    if not st.sidebar.checkbox("⏱ 성능 패널 보기", key="show_perf_panel"):
+        return
+    elapsed = time.perf_counter() - recorder.started
+    totals = recorder.totals
+    st.sidebar.markdown("### ⏱ 이번 실행 성능")
+    st.sidebar.caption(
+        f"전체 {elapsed * 1000:,.0f} ms · API 호출 {totals['api_calls']:,}회 · "
+        f"디스크 캐시 {totals['disk_hits']:,}회 · 쿼터 {totals['quota_units']:,} units"
+    )
+    summary = recorder.summary()
+    if summary.empty:
+        return
+    st.sidebar.dataframe(
+        summary.rename(columns={
+            "name": "구간", "calls": "호출", "total_ms": "합계(ms)", "max_ms": "최대(ms)", "api_calls": "API",
+            "disk_hits": "디스크", "quota_units": "쿼터", "cache": "캐시",
+        }),
+        hide_index=True, use_container_width=True,
+        column_config={"합계(ms)": st.column_config.NumberColumn(format="%.1f"), "최대(ms)": st.column_config.NumberColumn(format="%.1f")},
+    )
+
+
 def main():
     api_key = get_api_key()
     if not api_key: st.stop()
@@ -815,8 +950,9 @@ def main():
     st.sidebar.markdown("---")
     video_limit = st.sidebar.slider(
         "가져올 영상 개수 (1회 분석당)",
-        min_value=5, max_value=30, value=10,
-        help="값이 클수록 분석은 풍부해지지만, YouTube API 일일 할당량이 더 빨리 소모됩니다. 5~15 권장.",
+        min_value=5, max_value=50, value=10,
+        help="채널 분석에서 채널당 가져올 최근 영상 수입니다. 값이 클수록 분석은 풍부해지지만, YouTube API 일일 할당량이 더 빨리 소모됩니다. "
+        "키워드 분석의 영상 수는 키워드 페이지에서 따로 정합니다.",
     )
 
     st.sidebar.markdown("---")
@@ -824,21 +960,36 @@ def main():
         """
         ### 🚨 API 쿼터 절약 가이드
         - **추천값 유지**: 영상 개수는 **5~15개** 정도로 유지하세요.
-        - **캐시 활용**: 동일한 채널/키워드는 1시간 동안 API를 재사용하지 않습니다.
+        - **캐시 활용**: 동일한 채널/키워드는 1시간 동안 API를 재사용하지 않습니다. (디스크 캐시라 재시작/재배포 후에도 유지)
         - **초과 시**: 쿼터는 매일 자동으로 초기화됩니다.
         """
     )
+
+    render_quota_status()
+    render_watchlist_status(api_key)
     
     st.markdown("---")
 
-    if mode == "키워드 트렌드 분석":
-        page_keyword_trend(api_key, video_limit)
-    elif mode == "특정 채널 심층 분석":
-        page_single_channel(api_key, video_limit)
-    elif mode == "채널 히스토리 및 비교 분석": 
-        page_channel_history()
-    elif mode == "경쟁 채널 벤치마킹":
-        page_competitive_channels(api_key, video_limit)
+    # 이번 rerun 의 구간별 시간 측정 (워커 스레드도 contextvars 로 같은 recorder 에 기록)
+    recorder = PerfRecorder(mode)
+    try:
+        with recording(recorder), perf_span("page", mode=mode):
+            if mode == "키워드 트렌드 분석":
+                page_keyword_trend(api_key)
+            elif mode == "특정 채널 심층 분석":
+                page_single_channel(api_key, video_limit)
+            elif mode == "채널 히스토리 및 비교 분석":
+                page_channel_history()
+            elif mode == "경쟁 채널 벤치마킹":
+                page_competitive_channels(api_key, video_limit)
+    finally:
+        if PERF_LOG_FILE:
+            try:
+                recorder.export_jsonl(PERF_LOG_FILE)
+            except OSError:
+                pass
+
+    render_perf_panel(recorder)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""
+ISO8601 duration 파싱 벤치마크 (행 단위 parse_iso_duration vs 컬럼 단위 parse_iso_duration_series)
+
+실행: python benchmarks/bench_duration.py [문자열 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from yttrend.utils import parse_iso_duration, parse_iso_duration_series  # noqa: E402
+
+
+def make_durations(n: int, seed: int = 0):
+    """쇼츠/일반 영상/장편/라이브(일 단위)가 섞인 duration 문자열과 정답(초)"""
+    rng = np.random.default_rng(seed)
+    seconds = np.concatenate([
+        rng.integers(5, 60, size=n // 4),            # 쇼츠
+        rng.integers(60, 30 * 60, size=n // 2),      # 일반 영상
+        rng.integers(30 * 60, 6 * 3600, size=n // 5),  # 장편
+        rng.integers(86400, 3 * 86400, size=n - n // 4 - n // 2 - n // 5),  # 라이브 다시보기
+    ])
+    rng.shuffle(seconds)
+
+    def to_iso(sec: int) -> str:
+        days, rest = divmod(int(sec), 86400)
+        hours, rest = divmod(rest, 3600)
+        mins, secs = divmod(rest, 60)
+        out = "P" + (f"{days}D" if days else "") + "T"
+        out += (f"{hours}H" if hours else "") + (f"{mins}M" if mins else "") + (f"{secs}S" if secs else "")
+        return out.rstrip("T") if out.endswith("T") else out
+
+    return pd.Series([to_iso(s) for s in seconds]), seconds
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    durations, expected = make_durations(n)
+
+    start = time.perf_counter()
+    per_row = np.array([parse_iso_duration(d) for d in durations], dtype=np.int64)
+    t_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    column = parse_iso_duration_series(durations).to_numpy()
+    t_col = time.perf_counter() - start
+
+    assert (per_row == expected).all() and (column == expected).all()
+    print(f"strings={n:,} per-row={t_row:.3f}s column={t_col:.3f}s speedup={t_row / t_col:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
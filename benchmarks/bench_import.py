@@ -0,0 +1,65 @@
+"""
+콜드 스타트(import) 시간 벤치마크
+
+새 파이썬 프로세스에서 각 진입점을 import 하는 데 걸린 시간을 재고,
+분석 코어가 streamlit / googleapiclient 없이 로드되는지 확인
+
+실행: python benchmarks/bench_import.py [반복 횟수]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# (진입점, import 되면 안 되는 모듈)
+TARGETS = [
+    ("yttrend", ["pandas", "streamlit", "googleapiclient"]),
+    ("yttrend.analytics", ["streamlit", "googleapiclient"]),
+    ("yttrend.text", ["streamlit", "googleapiclient"]),
+    ("yttrend.history", ["streamlit", "googleapiclient"]),
+    ("yttrend.fetch", ["streamlit", "googleapiclient.discovery", "httplib2"]),
+    ("yttrend.concurrency", ["streamlit", "googleapiclient.discovery", "httplib2"]),
+    ("yttrend.cli", ["pandas", "streamlit", "googleapiclient"]),
+    ("googleapiclient.discovery", []),
+    ("streamlit", []),
+]
+
+
+def measure(module: str, forbidden, repeat: int):
+    code = (
+        "import sys, time; t = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - t); "
+        f"print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    )
+    times, leaked = [], ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+        times.append(float(out[0]))
+        leaked = out[1] if len(out) > 1 else ""
+    return statistics.median(times), leaked
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+    for module, forbidden in TARGETS:
+        seconds, leaked = measure(module, forbidden, repeat)
+        status = f"  ✗ 로드됨: {leaked}" if leaked else ""
+        print(f"{module:<28} {seconds * 1000:8.1f} ms{status}")
+        failed = failed or bool(leaked)
+
+    t = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "yttrend", "crawl", "--help"], cwd=ROOT, capture_output=True, check=True)
+    print(f"{'python -m yttrend crawl --help':<28} {(time.perf_counter() - t) * 1000:8.1f} ms (프로세스 전체)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+누적 키워드 색인 증분 갱신(update_items) 벤치마크
++ 새 영상 / 조회수만 갱신 / 제목 변경 / 중복 item 을 넣을 때마다 점수가 rebuild_scores 결과와 같은지 확인
+
+실행: python benchmarks/bench_keyword_index.py [영상 수]
+"""
+import copy
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from yttrend.keyword_index import KeywordIndex  # noqa: E402
+from yttrend.offline import SyntheticYouTubeClient  # noqa: E402
+
+VIDEOS_PER_CHANNEL = 50
+
+
+def make_items(n: int):
+    """SyntheticYouTubeClient 의 videos.list item (conftest.video_items 와 같은 규칙)"""
+    n_channels = max(n // VIDEOS_PER_CHANNEL, 1)
+    client = SyntheticYouTubeClient(n_channels, -(-n // n_channels))
+    return [client._video_item(client.video_id(i % n_channels, i // n_channels)) for i in range(n)]
+
+
+def bump_views(items, step: int):
+    items = copy.deepcopy(items)
+    for i, item in enumerate(items):
+        item["statistics"]["viewCount"] = str(int(item["statistics"]["viewCount"]) + step * (i % 7 + 1))
+    return items
+
+
+def score_tables(conn: sqlite3.Connection):
+    scores = pd.DataFrame(
+        conn.execute("SELECT token, score, videos FROM keyword_scores ORDER BY token").fetchall(),
+        columns=["token", "score", "videos"],
+    )
+    daily = pd.DataFrame(
+        conn.execute("SELECT day, token, score, videos FROM keyword_daily ORDER BY day, token").fetchall(),
+        columns=["day", "token", "score", "videos"],
+    )
+    return scores, daily
+
+
+def check_against_rebuild(index: KeywordIndex, step: str):
+    """색인을 복사해 rebuild_scores 를 돌린 결과와 누적 점수를 비교 (원본 색인은 건드리지 않음)"""
+    rebuilt = KeywordIndex(index.path + f".{step}.rebuilt")
+    index._conn().backup(rebuilt._conn())
+    rebuilt.rebuild_scores()
+    for name, got, want in zip(["keyword_scores", "keyword_daily"], score_tables(index._conn()),
+                               score_tables(rebuilt._conn())):
+        try:
+            pd.testing.assert_frame_equal(got, want, check_exact=False, rtol=1e-9, atol=1e-6)
+        except AssertionError as e:
+            sys.exit(f"❌ {step}: {name} 가 rebuild_scores 결과와 다릅니다.\n{e}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    items = make_items(n)
+    index = KeywordIndex(os.path.join(tempfile.mkdtemp(prefix="bench_keyword_index_"), "keyword_index.sqlite3"))
+
+    retitled = copy.deepcopy(items[::10])
+    for item in retitled:
+        words = item["snippet"]["title"].split()
+        item["snippet"]["title"] = " ".join(words[1:] + ["리메이크", words[0]])
+    half = n // 2
+    steps = [
+        ("새 영상", items),
+        ("조회수만 갱신", bump_views(items[:half], 1000)),
+        ("제목 변경", bump_views(retitled, 500)),
+        # 같은 영상이 두 번 들어오면 마지막 item 만 반영 (첫 item 의 조회수는 무시돼야 함)
+        ("중복 item", bump_views(items[:half], 100_000) + bump_views(items[:half], 2000)),
+    ]
+    for step, batch in steps:
+        t0 = time.perf_counter()
+        index.update_items(batch)
+        elapsed = time.perf_counter() - t0
+        print(f"{step}: items={len(batch):,} update={elapsed:.3f}s")
+        check_against_rebuild(index, step)
+
+    views = dict(index._conn().execute("SELECT video_id, views FROM indexed_videos").fetchall())
+    expected = bump_views(items[:half], 2000)
+    if any(views[item["id"]] != int(item["statistics"]["viewCount"]) for item in expected):
+        sys.exit("❌ 중복 item 중 마지막 조회수가 반영되지 않았습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+extract_keywords_with_weight 벤치마크 (iterrows 버전 vs 벡터화 버전)
++ 조사가 붙은 제목으로 토크나이저 파이프라인(메모 없음/있음)과 구문 추출 시간
+
+실행: python benchmarks/bench_keywords.py [제목 수]
+"""
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from yttrend.text import DEFAULT_PIPELINE, extract_keywords_with_weight, extract_phrases, tokenize  # noqa: E402
+
+
+WORDS = [
+    "요리", "레시피", "김치찌개", "다이어트", "운동", "홈트", "브이로그", "여행", "제주도", "캠핑",
+    "먹방", "리뷰", "아이폰", "갤럭시", "언박싱", "주식", "부동산", "시니어", "건강", "쇼핑",
+    "cooking", "recipe", "travel", "review", "vlog", "korea", "seoul", "best", "top10", "2024",
+    "영상", "official", "live", "shorts", "꿀팁", "방법", "the", "and", "a", "ep",
+]
+
+
+def make_titles(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    lengths = rng.integers(3, 10, size=n)
+    titles = [" ".join(rng.choice(words, size=k)) + f" #{i % 997}" for i, k in enumerate(lengths)]
+    views = rng.lognormal(mean=9, sigma=2, size=n).astype(np.int64)
+    return pd.DataFrame({"title": titles, "views": views})
+
+
+PARTICLES = ["", "", "은", "는", "이", "가", "을", "를", "의", "에서", "으로", "로", "와", "과", "도"]
+PHRASES = ["김치찌개 황금 레시피", "제주도 한달 살기", "아이폰 16 프로", "새벽 감성 플레이리스트"]
+
+
+# 조사/어미가 붙은 제목 → 기대 토큰 (조사 떼기 규칙 확인용)
+PARTICLE_CASES = [
+    ("김치찌개 리뷰입니다", ["김치찌개", "리뷰"]),
+    ("고양이는 요리를 잘하는 친구와", ["고양이", "요리", "잘하는", "친구"]),
+    ("부산으로 가는 제주도 여행에서는", ["부산", "가는", "제주도", "여행"]),
+    ("전문가가 공부하는 주식을 안되는 이유", ["전문가", "공부", "주식", "안되는", "이유"]),
+    ("서울로 이사한 어린이의 홈트", ["서울", "이사한", "어린이", "홈트"]),
+    # 조사처럼 보이는 글자로 끝나는 단어는 그대로
+    ("물놀이 영상", ["물놀이"]),
+    ("스스로 해냈다", ["스스로", "해냈다"]),
+    ("사이로 지나가", ["사이", "지나가"]),
+    ("마이크로 리뷰", ["마이크로", "리뷰"]),
+]
+
+
+def check_particle_cases():
+    tokens = tokenize(pd.Series([title for title, _ in PARTICLE_CASES]))
+    for (title, expected), got in zip(PARTICLE_CASES, tokens):
+        if list(got) != expected:
+            sys.exit(f"❌ '{title}' → {list(got)} (기대: {expected})")
+
+
+def make_particle_titles(n: int, seed: int = 1) -> pd.DataFrame:
+    """단어마다 조사를 붙이고 10% 제목에 고정 구문을 넣은 제목"""
+    rng = np.random.default_rng(seed)
+    words, particles = np.array(WORDS[:20]), np.array(PARTICLES)
+    lengths = rng.integers(3, 8, size=n)
+    titles = []
+    for i, k in enumerate(lengths):
+        parts = [w + p for w, p in zip(rng.choice(words, size=k), rng.choice(particles, size=k))]
+        if rng.random() < 0.1:
+            parts.insert(1, PHRASES[i % len(PHRASES)])
+        titles.append(" ".join(parts) + f" #{i}")
+    views = rng.lognormal(mean=9, sigma=2, size=n).astype(np.int64)
+    return pd.DataFrame({"title": titles, "views": views})
+
+
+def extract_keywords_legacy(df: pd.DataFrame, top_n: int = 30) -> pd.DataFrame:
+    """벡터화 이전 구현 (비교 기준)"""
+    stopwords = {
+        "영상", "official", "video", "the", "and", "for", "with", "full", "ver",
+        "episode", "ep", "live", "tv", "show", "channel", "shorts", "공식",
+        "하이라이트", "클립", "무대", "최신", "today", "day", "in", "of", "a",
+        "이번주", "다시보기", "모음", "총정리", "최고", "오늘", "지금", "바로",
+        "story", "log", "vlog", "asmr", "asmr", "tip", "꿀팁", "방법", "하는법",
+        "저장", "구독", "좋아요", "댓글", "알림", "설정", "하나", "두개"
+    }
+    keyword_scores = Counter()
+    for _, row in df.iterrows():
+        title = row["title"].lower()
+        weight = row["views"] ** 0.5
+        for t in re.findall(r"[가-힣a-zA-Z0-9]+", title):
+            if len(t) >= 2 and t not in stopwords:
+                keyword_scores[t] += weight
+    data = pd.DataFrame([{"keyword": k, "score": v} for k, v in keyword_scores.most_common(top_n)])
+    data["score"] = data["score"].round(0).astype(int)
+    return data
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = make_titles(n)
+
+    legacy = extract_keywords_legacy(df)
+    fast = extract_keywords_with_weight(df)
+    # WORDS 에는 조사가 없어 조사 떼기 전후 결과가 같아야 함 (조사 떼기 자체는 check_particle_cases 에서 확인)
+    pd.testing.assert_frame_equal(legacy, fast)
+
+    t_legacy = best_of(lambda: extract_keywords_legacy(df), repeat=1)
+    t_fast = best_of(lambda: extract_keywords_with_weight(df))
+    speedup = t_legacy / t_fast
+    print(f"titles={n:,} legacy={t_legacy:.3f}s vectorized={t_fast:.3f}s speedup={speedup:.1f}x")
+    if n >= 100_000 and speedup < 10:
+        sys.exit("❌ 10배 이상 빨라지지 않았습니다.")
+
+    check_particle_cases()
+    particle_df = make_particle_titles(n)
+    t_cold = best_of(lambda: (DEFAULT_PIPELINE.clear_memo(), tokenize(particle_df["title"])))
+    t_warm = best_of(lambda: tokenize(particle_df["title"]))
+    particle_df["title_tokens"] = tokenize(particle_df["title"])
+    t_phrases = best_of(lambda: extract_phrases(particle_df))
+    phrases = extract_phrases(particle_df)
+    print(f"tokenize cold={t_cold:.3f}s warm={t_warm:.3f}s phrases={t_phrases:.3f}s")
+    print(phrases.head(len(PHRASES)).to_string(index=False))
+    missing = set(PHRASES) - set(phrases["phrase"])
+    if n >= 10_000 and missing:
+        sys.exit(f"❌ 구문을 찾지 못했습니다: {sorted(missing)}")
+
+
+if __name__ == "__main__":
+    main()
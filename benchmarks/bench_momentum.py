@@ -0,0 +1,65 @@
+"""
+조회 속도/급상승 계산(compute_view_momentum) 벤치마크
++ 일정한 속도로 크는 영상들 사이에 마지막 관측에서 조회수가 급증하는 영상을 심어 그 영상만 급상승으로 잡히는지 확인
+
+실행: python benchmarks/bench_momentum.py [영상 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from yttrend.momentum import compute_view_momentum  # noqa: E402
+
+VIDEOS_PER_CHANNEL = 50
+OBSERVATIONS_PER_VIDEO = 8
+BURST_RATE = 0.01
+BURST_FACTOR = 20
+
+
+def make_observations(n: int, seed: int = 0):
+    """하루 간격 관측 (채널 안 영상 속도는 로그정규 σ=0.3, 관측마다 ±20% 잡음), 1% 영상은 마지막 관측 속도가 20배"""
+    rng = np.random.default_rng(seed)
+    k = OBSERVATIONS_PER_VIDEO
+    video_ids = np.array([f"v{i:07d}" for i in range(n)], dtype=object)
+    channel_ids = np.array([f"UC{i // VIDEOS_PER_CHANNEL:05d}" for i in range(n)], dtype=object)
+    base_velocity = np.repeat(rng.lognormal(mean=7, sigma=0.3, size=n), k)
+    daily = base_velocity * rng.uniform(0.8, 1.2, n * k)
+    step = np.tile(np.arange(k), n)
+    planted = rng.random(n) < BURST_RATE
+    daily[np.repeat(planted, k) & (step == k - 1)] *= BURST_FACTOR
+    views = (daily * (step > 0)).reshape(n, k).cumsum(axis=1).ravel() + 1000
+    observations = pd.DataFrame({
+        "video_id": np.repeat(video_ids, k),
+        "channel_id": np.repeat(channel_ids, k),
+        "observed_at": 1.7e9 + step * 86400.0,
+        "views": views.astype(np.int64),
+    })
+    return observations, set(video_ids[planted])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    observations, planted = make_observations(n)
+
+    t0 = time.perf_counter()
+    result = compute_view_momentum(observations)
+    elapsed = time.perf_counter() - t0
+    flagged = set(result.loc[result["breakout"], "video_id"])
+    false_positive = flagged - planted
+    print(f"videos={n:,} observations={len(observations):,} momentum={elapsed:.3f}s "
+          f"planted={len(planted)} flagged={len(flagged)} false_positive={len(false_positive)}")
+
+    missed = planted - flagged
+    if missed:
+        sys.exit(f"❌ 심어 둔 급상승 영상을 놓쳤습니다: {sorted(missed)[:10]}")
+    # 채널 기준선은 여러 영상의 속도를 섞으므로 원래 빠른 영상 일부(z ≥ 3 꼬리, 약 0.1~0.2%)는 급상승으로 잡힐 수 있음
+    if len(false_positive) > max(n // 200, 1):
+        sys.exit(f"❌ 일정한 속도의 영상이 급상승으로 너무 많이 잡혔습니다: {len(false_positive)}개")
+
+
+if __name__ == "__main__":
+    main()
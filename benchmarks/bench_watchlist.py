@@ -0,0 +1,89 @@
+"""
+워치리스트 폴링 벤치마크 (합성 API 로 첫 폴링 vs ETag 304 폴링)
++ 두 번째 폴링은 모든 배치가 304, 리소스를 빼면 그 배치의 ETag 가 비워지는지 확인
+
+실행: python benchmarks/bench_watchlist.py [영상 수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# yttrend 를 불러오기 전에 저장소를 임시 폴더로 돌리고 합성 API 를 씀 (조회수가 실행 중에 바뀌지 않게 틱을 길게)
+_TMP = tempfile.mkdtemp(prefix="bench_watchlist_")
+os.environ["YT_API_MODE"] = "synthetic"
+os.environ["YT_SYNTHETIC_TICK_SEC"] = str(365 * 86400)
+os.environ["YT_QUOTA_BUDGET"] = str(10 ** 9)
+for _var, _name in [
+    ("YT_API_CACHE_FILE", "api_cache"), ("YT_QUOTA_DB", "quota"), ("YT_HISTORY_DB", "history"),
+    ("YT_VIDEO_DB", "video"), ("YT_KEYWORD_INDEX_DB", "keyword_index"), ("YT_WATCHLIST_DB", "watchlist"),
+]:
+    os.environ[_var] = os.path.join(_TMP, f"{_name}.sqlite3")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from yttrend.ingest import INGEST_QUEUE  # noqa: E402
+from yttrend.offline import SYNTHETIC_VIDEOS_PER_CHANNEL, SyntheticYouTubeClient  # noqa: E402
+from yttrend.quota import VIDEOS_LIST_BATCH  # noqa: E402
+from yttrend.watchlist import Watchlist  # noqa: E402
+
+INTERVAL = 3600
+
+
+def batch_etags(wl: Watchlist) -> dict:
+    return dict(wl._conn().execute("SELECT batch_no, etag FROM watch_batches WHERE kind = 'video'").fetchall())
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    ids = [
+        SyntheticYouTubeClient.video_id(i // SYNTHETIC_VIDEOS_PER_CHANNEL, i % SYNTHETIC_VIDEOS_PER_CHANNEL)
+        for i in range(n)
+    ]
+    wl = Watchlist(os.path.join(_TMP, "bench_watchlist.sqlite3"))
+    wl.add("video", ids, INTERVAL)
+    n_batches = -(-n // VIDEOS_LIST_BATCH)
+
+    # 1) 첫 폴링: 모든 배치가 새 응답 (배치 시작 시각이 주기 안에 흩어져 있으니 주기만큼 뒤로)
+    now = time.time() + INTERVAL
+    t0 = time.perf_counter()
+    first = wl.poll_due("", now=now)
+    t_first = time.perf_counter() - t0
+    changed = len(first.changed.get("video", []))
+    if first.batches != n_batches or first.not_modified or changed != n:
+        sys.exit(f"❌ 첫 폴링: batches={first.batches}/{n_batches} 304={first.not_modified} changed={changed}/{n}")
+
+    # 2) 같은 틱 안에서 다시 폴링: 모든 배치가 304
+    now += INTERVAL
+    t0 = time.perf_counter()
+    second = wl.poll_due("", now=now)
+    t_second = time.perf_counter() - t0
+    if second.batches != n_batches or second.not_modified != n_batches or second.changed:
+        sys.exit(f"❌ 두 번째 폴링이 모두 304 가 아닙니다: batches={second.batches} 304={second.not_modified}")
+    print(f"videos={n:,} batches={n_batches} first={t_first:.3f}s 304={t_second:.3f}s")
+
+    # 3) 한 배치에서 영상을 빼면 그 배치만 ETag 가 비워지고, 다음 폴링에서 그 배치만 새 응답
+    before = batch_etags(wl)
+    removed_batch = wl._conn().execute(
+        "SELECT batch_no FROM watch_resources WHERE kind = 'video' AND resource_id = ?", (ids[0],)
+    ).fetchone()[0]
+    wl.remove("video", [ids[0]])
+    after = batch_etags(wl)
+    if after[removed_batch] is not None:
+        sys.exit(f"❌ 영상을 뺀 배치 {removed_batch} 의 ETag 가 남아 있습니다.")
+    kept = {b: e for b, e in before.items() if b != removed_batch}
+    if {b: after.get(b) for b in kept} != kept:
+        sys.exit("❌ 구성이 그대로인 배치의 ETag 가 바뀌었습니다.")
+
+    now += INTERVAL
+    third = wl.poll_due("", now=now)
+    if third.batches != n_batches or third.not_modified != n_batches - 1:
+        sys.exit(f"❌ 영상을 뺀 뒤 폴링: batches={third.batches} 304={third.not_modified} (기대 {n_batches - 1})")
+    if batch_etags(wl)[removed_batch] is None:
+        sys.exit(f"❌ 다시 폴링한 배치 {removed_batch} 에 ETag 가 저장되지 않았습니다.")
+
+    if not INGEST_QUEUE.flush(timeout=60):
+        sys.exit("❌ 조회수 관측/색인 쓰기가 끝나지 않았습니다.")
+
+
+if __name__ == "__main__":
+    main()
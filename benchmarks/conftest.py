@@ -0,0 +1,81 @@
+"""
+벤치마크 공용 fixture
+
+- 영상 수(n_videos)별로 합성 데이터셋을 만들어 세션 동안 재사용 (기본 100 ~ 100,000)
+- 크기 조절: pytest benchmarks --bench-sizes=100,10000
+  (1,000,000 은 조회수 관측이 수백만 행이라 메모리가 넉넉할 때만: --bench-sizes=1000000)
+- 히스토리/캐시/쿼터/메타데이터/키워드 색인/관심 목록 DB 는 임시 폴더를 쓰도록 yttrend import 전에 환경 변수로 지정
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BENCH_TMP_DIR = tempfile.mkdtemp(prefix="yt-bench-")
+os.environ.setdefault("YT_HISTORY_DB", os.path.join(BENCH_TMP_DIR, "channel_history.sqlite3"))
+os.environ.setdefault("YT_API_CACHE_FILE", os.path.join(BENCH_TMP_DIR, "api_cache.sqlite3"))
+os.environ.setdefault("YT_QUOTA_DB", os.path.join(BENCH_TMP_DIR, "quota_ledger.sqlite3"))
+os.environ.setdefault("YT_VIDEO_DB", os.path.join(BENCH_TMP_DIR, "video_metadata.sqlite3"))
+os.environ.setdefault("YT_KEYWORD_INDEX_DB", os.path.join(BENCH_TMP_DIR, "keyword_index.sqlite3"))
+os.environ.setdefault("YT_WATCHLIST_DB", os.path.join(BENCH_TMP_DIR, "watchlist.sqlite3"))
+os.environ.setdefault("YT_QUOTA_BUDGET", str(10 ** 9))
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_SIZES = "100,10000,100000"
+VIDEOS_PER_CHANNEL = 50
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes", default=DEFAULT_SIZES,
+        help=f"쉼표로 구분한 합성 영상 수 목록 (기본 {DEFAULT_SIZES})",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "n_videos" in metafunc.fixturenames:
+        sizes = [int(s) for s in metafunc.config.getoption("--bench-sizes").split(",") if s.strip()]
+        metafunc.parametrize("n_videos", sizes, indirect=True, scope="session")
+
+
+@pytest.fixture(scope="session")
+def n_videos(request) -> int:
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def video_items(n_videos):
+    """videos.list 응답 item 목록 (SyntheticYouTubeClient 와 같은 규칙으로 생성, 채널당 50개)"""
+    from yttrend.offline import SyntheticYouTubeClient
+
+    n_channels = max(n_videos // VIDEOS_PER_CHANNEL, 1)
+    client = SyntheticYouTubeClient(n_channels, -(-n_videos // n_channels))
+    return [
+        client._video_item(client.video_id(i % n_channels, i // n_channels))
+        for i in range(n_videos)
+    ]
+
+
+@pytest.fixture(scope="session")
+def video_df(video_items):
+    """채널 정보가 포함된 영상 DataFrame (build_video_dataframe 결과)"""
+    from yttrend.fetch import build_video_dataframe
+
+    return build_video_dataframe(video_items, include_channel=True, sort_by="views")
+
+
+@pytest.fixture(scope="session")
+def channel_frames(video_df):
+    """채널별 (info, 최근 영상 DataFrame) 목록"""
+    frames = []
+    for cid, df in video_df.groupby("channel_id", observed=True, sort=False):
+        df = df.reset_index(drop=True)
+        subscribers = int(df["views"].median()) * 10
+        info = {
+            "channel_id": cid, "title": f"채널 {cid}", "subscriber_count": subscribers,
+            "view_count": int(df["views"].sum()), "video_count": len(df),
+        }
+        frames.append((info, df))
+    return frames
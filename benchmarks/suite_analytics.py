@@ -0,0 +1,63 @@
+"""제목 키워드 / duration 파싱 / 요약 메시지 벤치마크"""
+import pytest
+
+from yttrend.analytics import make_simple_summary_for_channel
+from yttrend.text import DEFAULT_PIPELINE, extract_keywords_with_weight, extract_phrases, tokenize
+from yttrend.utils import parse_iso_duration, parse_iso_duration_series
+
+
+@pytest.fixture(scope="session")
+def durations(video_items):
+    import pandas as pd
+
+    return pd.Series([item["contentDetails"]["duration"] for item in video_items])
+
+
+@pytest.mark.benchmark(group="extract_keywords_with_weight")
+def test_extract_keywords_with_weight(benchmark, video_df):
+    result = benchmark(extract_keywords_with_weight, video_df, 30)
+    assert len(result) == 30
+
+
+@pytest.mark.benchmark(group="extract_keywords_with_weight (토큰화 포함)")
+def test_extract_keywords_without_tokens(benchmark, video_df):
+    df = video_df.drop(columns=["title_tokens"])
+    result = benchmark(extract_keywords_with_weight, df, 30)
+    assert len(result) == 30
+
+
+@pytest.mark.benchmark(group="tokenize")
+def test_tokenize(benchmark, video_df):
+    tokens = benchmark(tokenize, video_df["title"])
+    assert len(tokens) == len(video_df)
+
+
+@pytest.mark.benchmark(group="tokenize (메모 없음)")
+def test_tokenize_cold(benchmark, video_df):
+    tokens = benchmark.pedantic(
+        tokenize, args=(video_df["title"],), setup=DEFAULT_PIPELINE.clear_memo, rounds=5, iterations=1,
+    )
+    assert len(tokens) == len(video_df)
+
+
+@pytest.mark.benchmark(group="extract_phrases")
+def test_extract_phrases(benchmark, video_df):
+    result = benchmark(extract_phrases, video_df, 30)
+    assert list(result.columns) == ["phrase", "n", "count", "pmi", "score"]
+
+
+@pytest.mark.benchmark(group="parse_iso_duration (행 단위)")
+def test_parse_iso_duration_rows(benchmark, durations):
+    result = benchmark.pedantic(lambda: durations.map(parse_iso_duration), rounds=3, iterations=1)
+    assert len(result) == len(durations)
+
+
+@pytest.mark.benchmark(group="parse_iso_duration_series")
+def test_parse_iso_duration_series(benchmark, durations):
+    result = benchmark(parse_iso_duration_series, durations)
+    assert len(result) == len(durations)
+
+
+@pytest.mark.benchmark(group="make_simple_summary_for_channel")
+def test_make_simple_summary_for_channel(benchmark, video_df):
+    assert benchmark(make_simple_summary_for_channel, video_df)
@@ -0,0 +1,46 @@
+"""채널 등급 / 히스토리 저장·로드 벤치마크 (채널당 영상 50개 → 영상 수 / 50 채널)"""
+import pytest
+
+from yttrend import history
+from yttrend.analytics import assign_channel_grade, get_channel_summary_row
+
+
+@pytest.fixture(scope="session")
+def history_rows(channel_frames):
+    return {info["channel_id"]: get_channel_summary_row(info, df) for info, df in channel_frames}
+
+
+@pytest.mark.benchmark(group="assign_channel_grade (전체 채널)")
+def test_assign_channel_grade(benchmark, channel_frames):
+    grades = benchmark(lambda: [assign_channel_grade(info, df) for info, df in channel_frames])
+    assert len(grades) == len(channel_frames)
+
+
+@pytest.mark.benchmark(group="get_channel_summary_row (전체 채널)")
+def test_get_channel_summary_row(benchmark, channel_frames):
+    rows = benchmark(lambda: [get_channel_summary_row(info, df) for info, df in channel_frames])
+    assert len(rows) == len(channel_frames)
+
+
+@pytest.mark.benchmark(group="save_channel_history")
+def test_save_channel_history(benchmark, history_rows):
+    benchmark(history.save_channel_history, history_rows)
+    assert len(history.load_channel_history_options()) == len({r["title"] for r in history_rows.values()})
+
+
+@pytest.mark.benchmark(group="load_channel_history")
+def test_load_channel_history(benchmark, history_rows):
+    history.save_channel_history(history_rows)
+    assert len(benchmark(history.load_channel_history)) == len(history_rows)
+
+
+@pytest.mark.benchmark(group="load_channel_history_options")
+def test_load_channel_history_options(benchmark, history_rows):
+    history.save_channel_history(history_rows)
+    assert benchmark(history.load_channel_history_options)
+
+
+@pytest.mark.benchmark(group="upsert_channel_history (채널 100개)")
+def test_upsert_channel_history(benchmark, history_rows):
+    rows = list(history_rows.values())[:100]
+    benchmark(lambda: [history.upsert_channel_history(row) for row in rows])
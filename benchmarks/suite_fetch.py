@@ -0,0 +1,60 @@
+"""fetch_* 함수들의 행 구성 + 파생 지표 계산(build_video_dataframe) 벤치마크"""
+import os
+
+import pytest
+
+from yttrend.cache import API_CACHE
+from yttrend.fetch import build_video_dataframe, fetch_video_items
+from yttrend.offline import SyntheticYouTubeClient
+from yttrend.videostore import VideoMetadataStore
+
+
+@pytest.mark.benchmark(group="build_video_dataframe")
+def test_build_video_dataframe(benchmark, video_items):
+    df = benchmark.pedantic(
+        build_video_dataframe, args=(video_items, True, "views"), rounds=3, iterations=1,
+    )
+    assert len(df) == len(video_items)
+
+
+@pytest.mark.benchmark(group="build_video_dataframe (description 유지)")
+def test_build_video_dataframe_with_description(benchmark, video_items):
+    df = benchmark.pedantic(
+        build_video_dataframe, args=(video_items, False, "views_per_day"),
+        kwargs={"include_description": True}, rounds=3, iterations=1,
+    )
+    assert "description" in df.columns
+
+
+@pytest.mark.benchmark(group="fetch_video_items (합성 클라이언트)")
+def test_fetch_video_items(benchmark, video_items, n_videos):
+    # 디스크 캐시 쓰기까지 포함되므로 10만 개까지만 측정
+    if n_videos > 100_000:
+        pytest.skip("API 호출 경로는 10만 개까지만 측정")
+    n_channels = max(n_videos // 50, 1)
+    client = SyntheticYouTubeClient(n_channels, -(-n_videos // n_channels))
+    ids = [item["id"] for item in video_items]
+    result = benchmark.pedantic(fetch_video_items, args=(client, ids), rounds=1, iterations=1)
+    assert len(result) == len(ids)
+
+
+@pytest.mark.parametrize("known", [False, True], ids=["full", "stats-only"])
+@pytest.mark.benchmark(group="fetch_video_items 재조회 (메타데이터 저장소)")
+def test_fetch_video_items_refresh(benchmark, video_items, n_videos, known, tmp_path):
+    # 디스크 캐시를 비운 상태에서, 저장소가 비어 있을 때(전체 part)와 모든 영상을 알 때(statistics 만)를 비교
+    if n_videos > 100_000:
+        pytest.skip("API 호출 경로는 10만 개까지만 측정")
+    n_channels = max(n_videos // 50, 1)
+    client = SyntheticYouTubeClient(n_channels, -(-n_videos // n_channels))
+    ids = [item["id"] for item in video_items]
+
+    def setup():
+        store = VideoMetadataStore(os.path.join(tmp_path, f"videos-{known}.sqlite3"))
+        store.clear()
+        if known:
+            store.put_many(video_items)
+        API_CACHE._conn().execute("DELETE FROM api_cache")
+        return (client, ids), {"store": store}
+
+    result = benchmark.pedantic(fetch_video_items, setup=setup, rounds=1, iterations=1)
+    assert len(result) == len(ids)
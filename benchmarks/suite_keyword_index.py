@@ -0,0 +1,57 @@
+"""누적 키워드 색인: 배치 갱신(update_items)과 상위 키워드 조회(top_keywords) 벤치마크"""
+import copy
+import os
+import time
+
+import pytest
+
+from yttrend.keyword_index import KeywordIndex
+
+UPDATE_BATCH = 5_000
+
+
+@pytest.fixture(scope="session")
+def filled_index(video_items, n_videos, tmp_path_factory):
+    """전체 영상을 색인한 KeywordIndex (세션 동안 재사용)"""
+    if n_videos > 100_000:
+        pytest.skip("SQLite 색인은 10만 개까지만 측정")
+    index = KeywordIndex(os.path.join(tmp_path_factory.mktemp("kwindex"), "keyword_index.sqlite3"))
+    for i in range(0, len(video_items), UPDATE_BATCH):
+        index.update_items(video_items[i:i + UPDATE_BATCH])
+    return index
+
+
+@pytest.mark.benchmark(group="keyword_index.update_items (새 영상)")
+def test_update_new_videos(benchmark, video_items, n_videos, tmp_path):
+    if n_videos > 100_000:
+        pytest.skip("SQLite 색인은 10만 개까지만 측정")
+    batch = video_items[:UPDATE_BATCH]
+
+    index = KeywordIndex(os.path.join(tmp_path, "keyword_index.sqlite3"))
+
+    def setup():
+        index.clear()
+        return (batch,), {}
+
+    benchmark.pedantic(index.update_items, setup=setup, rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group="keyword_index.update_items (조회수 갱신)")
+def test_update_view_refresh(benchmark, filled_index, video_items):
+    batch = copy.deepcopy(video_items[:UPDATE_BATCH])
+    for item in batch:
+        item["statistics"]["viewCount"] = str(int(item["statistics"]["viewCount"]) + 1000)
+    benchmark.pedantic(filled_index.update_items, args=(batch,), rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("condition", ["all", "channel", "window", "window_all"])
+@pytest.mark.benchmark(group="keyword_index.top_keywords")
+def test_top_keywords(benchmark, filled_index, video_items, condition):
+    kwargs = {
+        "all": {},
+        "channel": {"channel_ids": [video_items[0]["snippet"]["channelId"]]},
+        "window": {"since": time.time() - 365 * 86400},
+        "window_all": {"since": 0},
+    }[condition]
+    result = benchmark(filled_index.top_keywords, 30, **kwargs)
+    assert len(result) <= 30
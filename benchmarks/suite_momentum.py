@@ -0,0 +1,35 @@
+"""조회수 관측 이력 → 조회 속도/가속도/급상승 계산(compute_view_momentum) 벤치마크"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from yttrend.momentum import compute_view_momentum
+
+OBSERVATIONS_PER_VIDEO = 8
+
+
+@pytest.fixture(scope="session")
+def view_observations(video_df):
+    """영상마다 하루 간격 관측 8개 (조회수는 일정 속도 + 잡음으로 증가, 1% 는 마지막 관측에서 급증)"""
+    rng = np.random.default_rng(0)
+    n = len(video_df)
+    k = OBSERVATIONS_PER_VIDEO
+    base_velocity = np.repeat(video_df["views_per_day"].to_numpy(dtype=np.float64), k)
+    daily = base_velocity * rng.uniform(0.8, 1.2, n * k)
+    step = np.tile(np.arange(k), n)
+    burst = np.repeat(rng.random(n) < 0.01, k) & (step == k - 1)
+    daily[burst] *= 20
+    growth = (daily * (step > 0)).reshape(n, k).cumsum(axis=1).ravel()
+    views = np.repeat(video_df["views"].to_numpy(dtype=np.float64), k) + growth
+    return pd.DataFrame({
+        "video_id": np.repeat(video_df["video_id"].to_numpy(dtype=object), k),
+        "channel_id": np.repeat(video_df["channel_id"].astype(str).to_numpy(dtype=object), k),
+        "observed_at": 1.7e9 + step * 86400.0,
+        "views": views.astype(np.int64),
+    })
+
+
+@pytest.mark.benchmark(group="compute_view_momentum")
+def test_compute_view_momentum(benchmark, view_observations, n_videos):
+    result = benchmark.pedantic(compute_view_momentum, args=(view_observations,), rounds=3, iterations=1)
+    assert len(result) == n_videos
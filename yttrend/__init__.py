@@ -0,0 +1,40 @@
+"""
+YouTube 트렌드·채널 분석 핵심 로직 (Streamlit 없이 동작)
+
+- app.py: Streamlit 화면 (이 패키지 함수를 st.cache_data 로 감싸서 사용)
+- python -m yttrend: 배치 CLI (채널 일괄 수집 → 히스토리에 저장)
+
+자주 쓰는 함수는 yttrend.<이름> 으로도 쓸 수 있고, 해당 하위 모듈은 처음 접근할 때 불러옴
+- 분석 코어(utils / text / analytics / history)는 streamlit, googleapiclient 없이 import 됨
+- API 클라이언트(googleapiclient.discovery, httplib2)는 실제 클라이언트를 만들 때 로드
+"""
+import importlib
+
+_LAZY_EXPORTS = {
+    "parse_iso_duration": "utils",
+    "parse_iso_duration_series": "utils",
+    "extract_channel_id": "utils",
+    "tokenize": "text",
+    "extract_keywords_with_weight": "text",
+    "extract_phrases": "text",
+    "assign_channel_grade": "analytics",
+    "get_channel_summary_row": "analytics",
+    "make_simple_summary_for_channel": "analytics",
+    "build_video_dataframe": "fetch",
+    "fetch_channels_concurrently": "concurrency",
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,90 @@
+"""채널 등급, 히스토리 요약 행, 룰 기반 요약 메시지"""
+from datetime import datetime, timezone, timedelta
+from typing import Dict
+
+import pandas as pd
+
+from .perf import timed
+
+
+def assign_channel_grade(info: Dict, recent_df: pd.DataFrame) -> str:
+    """채널 등급 (A1~C3)을 부여하는 간단한 로직"""
+    if recent_df.empty or info['subscriber_count'] == 0:
+        return "등급 외"
+
+    # 1. 규모 점수 (구독자 수) - 40%
+    sub_count = info['subscriber_count']
+    if sub_count >= 100000: rank_sub = 3
+    elif sub_count >= 10000: rank_sub = 2
+    else: rank_sub = 1
+    
+    # 2. 활동 점수 (일 평균 조회수) - 60%
+    avg_daily_views = recent_df['views_per_day'].mean()
+    if sub_count > 0:
+        daily_ratio = avg_daily_views / sub_count * 1000
+    else:
+        daily_ratio = 0
+        
+    if daily_ratio >= 10: rank_activity = 3
+    elif daily_ratio >= 3: rank_activity = 2
+    else: rank_activity = 1
+    
+    final_score = (rank_sub * 0.4 + rank_activity * 0.6)
+    
+    if final_score >= 2.6: grade_char = 'A'
+    elif final_score >= 1.8: grade_char = 'B'
+    else: grade_char = 'C'
+        
+    grade_num = 1
+    if sub_count < 10000: grade_num = 3
+    elif sub_count < 50000 and daily_ratio < 5: grade_num = 2 
+    elif sub_count >= 100000 and daily_ratio >= 10: grade_num = 1
+        
+    return f"{grade_char}{grade_num}"
+
+
+@timed()
+def get_channel_summary_row(info: Dict, df: pd.DataFrame) -> Dict:
+    """채널 히스토리에 저장할 핵심 데이터 요약"""
+    if df.empty:
+        return {}
+        
+    now = datetime.now(timezone.utc)
+    recent_30d = df[df["published_at"] > (now - timedelta(days=30))]
+
+    row = {
+        "channel_id": info["channel_id"],
+        "title": info["title"],
+        "subscriber_count": info["subscriber_count"],
+        "total_views": info["view_count"],
+        "video_count": info["video_count"],
+        "analysis_date": now.strftime('%Y-%m-%d %H:%M'),
+        "recent_video_count": len(df),
+        "recent_avg_views": int(df["views"].mean()),
+        "recent_avg_daily_views": int(df["views_per_day"].mean()),
+        "videos_last_30d": len(recent_30d),
+        "grade": assign_channel_grade(info, df)
+    }
+    return row
+
+
+@timed()
+def make_simple_summary_for_channel(df: pd.DataFrame) -> str:
+    # (기존 코드와 동일하게 유지)
+    if df.empty: return "최근 영상 데이터가 없어 패턴을 분석할 수 없습니다."
+    n = len(df); avg_views = int(df["views"].mean()); median_views = int(df["views"].median())
+    max_views = int(df["views"].max()); short = df[df["duration_min"] <= 8]; long = df[df["duration_min"] >= 20]
+    parts = []
+    parts.append(f"최근 {n}개 영상 기준으로 평균 조회수는 약 {avg_views:,}회, 중앙값은 {median_views:,}회입니다.")
+    parts.append(f"가장 많이 본 영상은 약 {max_views:,}회까지 기록했습니다.")
+    if not short.empty and not long.empty:
+        short_avg = int(short["views"].mean()); long_avg = int(long["views"].mean())
+        if short_avg > long_avg * 1.3:
+            parts.append(f"8분 이하 짧은 영상의 평균 조회수가 {short_avg:,}회로, 20분 이상 긴 영상({long_avg:,}회)보다 꽤 잘 나오는 편입니다. " "짧은 길이의 콘텐츠 비중을 조금 더 늘려보는 것도 좋겠습니다.")
+        elif long_avg > short_avg * 1.3:
+            parts.append(f"20분 이상 긴 영상의 평균 조회수가 {long_avg:,}회로, 8분 이하 영상({short_avg:,}회)보다 유리합니다. " "깊이 있는 장편 콘텐츠가 채널에 잘 맞는 편으로 보입니다.")
+    weekday_mean = df.groupby("weekday", observed=True)["views"].mean().sort_values(ascending=False)
+    if len(weekday_mean) >= 3:
+        best_day = weekday_mean.index[0]
+        parts.append(f"요일별 평균 조회수는 **{best_day}요일 업로드분**이 가장 높게 나타납니다. " "해당 요일 전후로 중요한 영상을 배치하는 전략을 고려해볼 만합니다.")
+    return "\n\n".join(parts)
@@ -0,0 +1,185 @@
+"""디스크 API 응답 캐시 (SQLite) 와 캐시/쿼터를 거치는 API 호출 함수"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from .perf import perf_count, perf_span
+from .quota import QUOTA_COST, QUOTA_LEDGER, QuotaBudgetExceeded, _cache_only
+from .utils import open_sqlite
+
+
+# 여러 Streamlit 프로세스/재배포 간에 공유되는 API 응답 캐시
+API_CACHE_FILE = os.environ.get("YT_API_CACHE_FILE", "api_cache.sqlite3")
+API_CACHE_MAX_BYTES = int(os.environ.get("YT_API_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# 엔드포인트별 캐시 유지 시간(초)
+API_CACHE_TTL = {
+    "search": 3600,
+    "videos": 3600,
+    "channels": 6 * 3600,
+    "playlistItems": 3600,
+}
+
+
+class ApiResponseCache:
+    """
+    (endpoint, params) 를 키로 하는 SQLite 기반 응답 캐시
+    - 응답은 zlib 압축 JSON 으로 저장, 엔드포인트별 TTL 적용
+    - 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU)
+    - WAL 모드 + busy timeout 으로 여러 프로세스가 동시에 읽고 써도 안전
+    """
+
+    EVICT_EVERY = 50  # 이 횟수만큼 저장할 때마다 크기 검사
+
+    def __init__(self, path: str, max_bytes: int, ttl: Dict[str, int], default_ttl: int = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        self._writes = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_api_cache_accessed ON api_cache (accessed_at)")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        raw = json.dumps([endpoint, params], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint: str, params: Dict, allow_stale: bool = False):
+        """캐시된 응답(dict) 또는 None. allow_stale=True 면 TTL 이 지난 항목도 반환"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT payload, created_at FROM api_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if not allow_stale and now - created_at > self.ttl.get(endpoint, self.default_ttl):
+                return None
+            conn.execute("UPDATE api_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(zlib.decompress(payload))
+        except (sqlite3.Error, zlib.error, ValueError):
+            return None
+
+    def set(self, endpoint: str, params: Dict, response: Dict):
+        key = self.make_key(endpoint, params)
+        payload = zlib.compress(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO api_cache (key, endpoint, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, payload, len(payload), now, now),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error:
+            pass
+
+    def evict(self):
+        """전체 크기가 상한을 넘으면 상한의 90% 까지 LRU 순서로 삭제"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM api_cache").fetchone()[0]
+            if total > self.max_bytes:
+                target = total - int(self.max_bytes * 0.9)
+                freed = 0
+                stale_keys = []
+                for key, size in conn.execute("SELECT key, size FROM api_cache ORDER BY accessed_at"):
+                    stale_keys.append((key,))
+                    freed += size
+                    if freed >= target:
+                        break
+                conn.executemany("DELETE FROM api_cache WHERE key = ?", stale_keys)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+
+API_CACHE = ApiResponseCache(API_CACHE_FILE, API_CACHE_MAX_BYTES, API_CACHE_TTL)
+
+
+def api_list(youtube, endpoint: str, **params) -> Dict:
+    """
+    YouTube API list 호출. 디스크 캐시에 있으면 API 를 부르지 않음
+    쿼터 예산을 넘거나 캐시 전용 모드이면 만료된 캐시라도 대신 사용하고, 그마저 없으면 QuotaBudgetExceeded
+    record 모드 클라이언트(records_fixtures)는 모든 요청이 fixture 로 남도록 디스크 캐시를 읽지 않음 (저장은 함)
+    """
+    if not getattr(youtube, "records_fixtures", False):
+        cached = API_CACHE.get(endpoint, params)
+        if cached is not None:
+            perf_count("disk_hits")
+            return cached
+    try:
+        if _cache_only.get():
+            raise QuotaBudgetExceeded("캐시 전용 모드라 새 API 호출을 하지 않습니다.")
+        QUOTA_LEDGER.charge(endpoint)
+    except QuotaBudgetExceeded:
+        stale = API_CACHE.get(endpoint, params, allow_stale=True)
+        if stale is not None:
+            perf_count("disk_hits")
+            return stale
+        raise
+    perf_count("api_calls")
+    perf_count("quota_units", QUOTA_COST.get(endpoint, 1))
+    with perf_span(f"api.{endpoint}"):
+        resp = getattr(youtube, endpoint)().list(**params).execute()
+    API_CACHE.set(endpoint, params, resp)
+    return resp
+
+
+def api_list_conditional(youtube, endpoint: str, etag: str = None, **params) -> Optional[Dict]:
+    """
+    ETag 조건부 API list 호출 (주기적 새로고침용, 디스크 캐시는 읽지 않음)
+    - etag 가 있으면 If-None-Match 로 보내고, 바뀐 게 없어 304 가 오면 None
+    - 쿼터는 api_list 와 똑같이 호출 전에 차감하고, 새 응답은 디스크 캐시에도 저장
+    """
+    if _cache_only.get():
+        raise QuotaBudgetExceeded("캐시 전용 모드라 새 API 호출을 하지 않습니다.")
+    QUOTA_LEDGER.charge(endpoint)
+    perf_count("api_calls")
+    perf_count("quota_units", QUOTA_COST.get(endpoint, 1))
+
+    request = getattr(youtube, endpoint)().list(**params)
+    if etag:
+        request.headers["If-None-Match"] = etag
+    try:
+        with perf_span(f"api.{endpoint}", conditional=bool(etag)):
+            resp = request.execute()
+    except HttpError as e:
+        if e.resp.status == 304:
+            return None
+        raise
+    API_CACHE.set(endpoint, params, resp)
+    return resp
@@ -0,0 +1,361 @@
+"""
+배치 CLI: 추적 중인 채널들을 한 번에 수집해서 히스토리에 저장 (Streamlit 없이 실행)
+
+    python -m yttrend crawl UCxxxx https://www.youtube.com/channel/UCyyyy
+    python -m yttrend crawl --file channels.txt --video-limit 15
+    python -m yttrend crawl --from-history --budget 3000
+    python -m yttrend watch add --interval 3600 UCxxxx / watch poll / watch run --daily-units 2000
+    python -m yttrend trending --channel UCxxxx --top 20
+    python -m yttrend keywords --query "캠핑" --days 30
+
+API KEY 는 --api-key 또는 환경 변수 YOUTUBE_API_KEY 로 지정
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+# pandas 등 무거운 모듈은 명령을 실제로 실행할 때 불러옴 (--help 는 바로 응답)
+
+# 한 번에 동시 수집하고 히스토리에 저장할 채널 수 (중간에 멈춰도 앞 묶음은 저장됨)
+CRAWL_CHUNK_SIZE = 50
+
+
+def read_channel_file(path: str) -> List[str]:
+    """
+    채널 목록 파일 읽기
+    - .json: 예전 히스토리 파일(channel_history.json) 형식 {channel_id: 요약} 또는 채널 ID 배열
+    - 그 외: 한 줄에 채널 ID/URL 하나 ('#' 뒤는 주석)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+            return [str(cid) for cid in (data.keys() if isinstance(data, dict) else data)]
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+def collect_channel_ids(args) -> List[str]:
+    """인자/파일/히스토리에서 채널 ID 를 모아 중복 없이 순서대로 반환"""
+    from .history import load_tracked_channel_ids
+    from .utils import extract_channel_id
+
+    raw = list(args.channels)
+    for path in args.file or []:
+        raw.extend(read_channel_file(path))
+    if args.from_history:
+        raw.extend(load_tracked_channel_ids())
+    return list(dict.fromkeys(cid for cid in (extract_channel_id(r) for r in raw) if cid))
+
+
+def plan_crawl(channel_ids: List[str], video_limit: int, budget: int) -> Tuple[List[str], List[str]]:
+    """예산 안에서 수집할 채널과 다음 실행으로 미룰 채널 (캐시 적중분은 고려하지 않은 최대 비용 기준)"""
+    from .quota import estimate_comparison_run
+
+    per_channel = estimate_comparison_run(1, video_limit)
+    n_fit = budget // per_channel if per_channel else len(channel_ids)
+    return channel_ids[:n_fit], channel_ids[n_fit:]
+
+
+class CrawlResult(NamedTuple):
+    """crawl_channels 결과 (quota_exhausted 면 중간에 멈춘 것이고 rows 는 그때까지 저장한 행)"""
+    rows: List[Dict]
+    errors: Dict[str, str]
+    quota_exhausted: bool = False
+    quota_message: str = ""
+
+
+def crawl_channels(
+    api_key: str, channel_ids: List[str], video_limit: int, max_workers: int, dry_run: bool = False,
+) -> CrawlResult:
+    """
+    채널들을 CRAWL_CHUNK_SIZE 개씩 동시 수집 → 요약 행(등급 포함) 계산 → 묶음 단위로 히스토리에 일괄 저장
+    쿼터가 바닥나면(QuotaBudgetExceeded / quotaExceeded) 남은 묶음은 건너뛰고,
+    그때까지 저장한 행/오류를 quota_exhausted=True 로 돌려줌 (그 밖의 API 오류는 그대로 올림)
+    """
+    from googleapiclient.errors import HttpError
+
+    from .analytics import get_channel_summary_row
+    from .concurrency import MAX_CONCURRENT_REQUESTS, fetch_channels_concurrently
+    from .history import upsert_channel_history_rows
+    from .quota import QuotaBudgetExceeded
+
+    max_workers = max_workers or MAX_CONCURRENT_REQUESTS
+    rows, errors = [], {}
+    for i in range(0, len(channel_ids), CRAWL_CHUNK_SIZE):
+        chunk = channel_ids[i:i + CRAWL_CHUNK_SIZE]
+        try:
+            results, chunk_errors = fetch_channels_concurrently(api_key, chunk, video_limit, max_workers)
+        except (QuotaBudgetExceeded, HttpError) as e:
+            if isinstance(e, HttpError) and "quotaExceeded" not in str(e):
+                raise
+            return CrawlResult(rows, errors, quota_exhausted=True, quota_message=str(e))
+        errors.update(chunk_errors)
+
+        chunk_rows = []
+        for cid in chunk:
+            if cid not in results:
+                continue
+            info, df = results[cid]
+            if not info:
+                errors[cid] = "채널을 찾을 수 없습니다."
+                continue
+            row = get_channel_summary_row(info, df)
+            if not row:
+                errors[cid] = "최근 영상 데이터가 없습니다."
+                continue
+            chunk_rows.append(row)
+
+        if chunk_rows and not dry_run:
+            upsert_channel_history_rows(chunk_rows)
+        rows.extend(chunk_rows)
+    return CrawlResult(rows, errors)
+
+
+def cmd_crawl(args) -> int:
+    from .client import resolve_api_key
+    from .quota import QUOTA_LEDGER, estimate_comparison_run
+
+    api_key = resolve_api_key(args.api_key)
+    if not api_key:
+        print("❌ YOUTUBE_API_KEY 가 설정되지 않았습니다. --api-key 또는 환경 변수로 지정해 주세요.", file=sys.stderr)
+        return 2
+
+    channel_ids = collect_channel_ids(args)
+    if not channel_ids:
+        print("수집할 채널이 없습니다. 채널 ID, --file, --from-history 중 하나를 지정해 주세요.", file=sys.stderr)
+        return 2
+
+    remaining = QUOTA_LEDGER.remaining()
+    budget = remaining if args.budget is None else min(args.budget, remaining)
+    targets, deferred = plan_crawl(channel_ids, args.video_limit, budget)
+    print(
+        f"채널 {len(channel_ids):,}개 중 {len(targets):,}개 수집 "
+        f"(예상 최대 {estimate_comparison_run(len(targets), args.video_limit):,} units, "
+        f"이번 실행 예산 {budget:,} / 오늘 남은 예산 {remaining:,} units)",
+        file=sys.stderr,
+    )
+    if deferred:
+        print(f"예산이 부족해 {len(deferred):,}개 채널은 다음 실행으로 미룹니다.", file=sys.stderr)
+    if not targets:
+        return 1
+
+    rows, errors, quota_exhausted, quota_message = crawl_channels(
+        api_key, targets, args.video_limit, args.workers, args.dry_run,
+    )
+    exit_code = 0
+    if quota_exhausted:
+        print(f"⛔ 쿼터가 소진되어 수집을 중단했습니다: {quota_message}", file=sys.stderr)
+        exit_code = 3
+
+    for row in rows:
+        if args.json:
+            print(json.dumps(row, ensure_ascii=False))
+        else:
+            print(f"{row['channel_id']}\t{row['grade']}\t{row['subscriber_count']:,}\t{row['title']}")
+    for cid, message in errors.items():
+        print(f"⚠ {cid}: {message}", file=sys.stderr)
+
+    saved = "저장하지 않음 (--dry-run)" if args.dry_run else "히스토리에 저장"
+    print(f"완료: {len(rows):,}개 {saved}, 실패 {len(errors):,}개", file=sys.stderr)
+    if exit_code == 0 and errors:
+        exit_code = 1
+    return exit_code
+
+
+def cmd_watch(args) -> int:
+    from .utils import extract_channel_id
+    from .watchlist import WATCHLIST, WATCHLIST_DEFAULT_INTERVAL
+
+    if args.action == "list":
+        for kind in ("channel", "video"):
+            df = WATCHLIST.load(kind)
+            for row in df.itertuples(index=False):
+                title = (row.data or {}).get("snippet", {}).get("title", "")
+                print(f"{kind}\t{row.resource_id}\t{row.interval_sec}\t{row.next_poll_at:%Y-%m-%d %H:%M}\t{title}")
+        return 0
+
+    ids = list(args.ids)
+    for path in args.file or []:
+        ids.extend(read_channel_file(path))
+    if args.kind == "channel":
+        ids = [extract_channel_id(i) for i in ids]
+    ids = [i for i in ids if i]
+    if not ids:
+        print("추가/삭제할 ID 를 지정해 주세요.", file=sys.stderr)
+        return 2
+    if args.action == "add":
+        interval = WATCHLIST_DEFAULT_INTERVAL if args.interval is None else args.interval
+        added = WATCHLIST.add(args.kind, ids, interval)
+        print(f"{added:,}개 추가 (이미 있던 {len(set(ids)) - added:,}개 제외)", file=sys.stderr)
+    else:
+        removed = WATCHLIST.remove(args.kind, ids)
+        print(f"{removed:,}개 삭제", file=sys.stderr)
+    return 0
+
+
+def _print_poll_report(report, as_json: bool):
+    for kind, items in report.changed.items():
+        for item in items:
+            if as_json:
+                print(json.dumps({"kind": kind, **item}, ensure_ascii=False))
+            else:
+                stats = item.get("statistics", {})
+                count = stats.get("subscriberCount" if kind == "channel" else "viewCount", "")
+                print(f"{kind}\t{item['id']}\t{count}\t{item.get('snippet', {}).get('title', '')}")
+    print(
+        f"배치 {report.batches:,}개 폴링 ({report.units:,} units): 304 {report.not_modified:,}개, "
+        f"변경 {sum(len(v) for v in report.changed.values()):,}개, 그대로 {report.unchanged:,}개, "
+        f"응답 없음 {report.missing:,}개",
+        file=sys.stderr,
+    )
+
+
+def cmd_watch_poll(args) -> int:
+    from googleapiclient.errors import HttpError
+
+    from .client import resolve_api_key
+    from .ingest import INGEST_QUEUE
+    from .quota import QuotaBudgetExceeded
+    from .watchlist import WATCHLIST, WATCHLIST_DAILY_UNITS, WatchlistPoller
+
+    api_key = resolve_api_key(args.api_key)
+    if not api_key:
+        print("❌ YOUTUBE_API_KEY 가 설정되지 않았습니다. --api-key 또는 환경 변수로 지정해 주세요.", file=sys.stderr)
+        return 2
+
+    if args.action == "run":
+        daily_units = WATCHLIST_DAILY_UNITS if args.daily_units is None else args.daily_units
+        poller = WatchlistPoller(api_key, daily_units=daily_units, tick_sec=args.tick)
+        try:
+            while True:
+                try:
+                    report = poller.tick()
+                except (QuotaBudgetExceeded, HttpError) as e:
+                    print(f"⚠ 폴링 실패: {e}", file=sys.stderr)
+                else:
+                    if report.batches:
+                        _print_poll_report(report, args.json)
+                INGEST_QUEUE.flush()  # 바뀐 영상의 관측/색인 쓰기를 다음 tick 전에 마침
+                sys.stdout.flush()
+                time.sleep(args.tick)
+        except KeyboardInterrupt:
+            return 0
+
+    try:
+        report = WATCHLIST.poll_due(api_key, max_units=args.budget)
+    except (QuotaBudgetExceeded, HttpError) as e:
+        if isinstance(e, HttpError) and "quotaExceeded" not in str(e):
+            raise
+        print(f"⛔ 쿼터가 소진되어 폴링을 중단했습니다: {e}", file=sys.stderr)
+        return 3
+    finally:
+        INGEST_QUEUE.flush()
+    _print_poll_report(report, args.json)
+    return 0
+
+
+def cmd_trending(args) -> int:
+    from .momentum import load_view_momentum
+    from .utils import extract_channel_id
+
+    channel_ids = [extract_channel_id(c) for c in args.channel] if args.channel else None
+    momentum = load_view_momentum(channel_ids=channel_ids, window_days=args.window, z_threshold=args.z)
+    momentum = momentum[momentum["velocity"].notna()]
+    if not args.all:
+        momentum = momentum[momentum["breakout"]]
+    momentum = momentum.head(args.top)
+    for row in momentum.itertuples(index=False):
+        if args.json:
+            print(json.dumps({
+                "video_id": row.video_id, "channel_id": row.channel_id, "views": int(row.views),
+                "velocity": row.velocity, "acceleration": row.acceleration, "zscore": row.zscore,
+                "breakout": bool(row.breakout),
+            }, ensure_ascii=False))
+        else:
+            print(f"{row.video_id}\t{row.channel_id}\t{row.velocity:,.0f}/일\t{row.acceleration:+,.1f}\tz={row.zscore:.2f}")
+    print(f"{len(momentum):,}개 영상", file=sys.stderr)
+    return 0
+
+
+def cmd_keywords(args) -> int:
+    from .keyword_index import KEYWORD_INDEX
+    from .utils import extract_channel_id
+
+    if args.rebuild:
+        KEYWORD_INDEX.rebuild_scores()
+    channel_ids = [extract_channel_id(c) for c in args.channel] if args.channel else None
+    since = time.time() - args.days * 86400 if args.days else None
+    keywords = KEYWORD_INDEX.top_keywords(args.top, channel_ids=channel_ids, query=args.query, since=since)
+    for row in keywords.itertuples(index=False):
+        if args.json:
+            print(json.dumps({"keyword": row.keyword, "score": int(row.score), "videos": int(row.videos)}, ensure_ascii=False))
+        else:
+            print(f"{row.keyword}\t{row.score:,}\t{row.videos:,}")
+    stats = KEYWORD_INDEX.stats()
+    print(f"색인된 영상 {stats['videos']:,}개 · 키워드 {stats['keywords']:,}개", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m yttrend", description="YouTube 채널 분석 배치 작업")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    crawl = sub.add_parser("crawl", help="채널 정보/최근 영상을 수집해서 등급을 매기고 히스토리에 저장")
+    crawl.add_argument("channels", nargs="*", help="채널 ID 또는 채널 URL")
+    crawl.add_argument("--file", action="append", help="채널 목록 파일 (한 줄에 하나, 또는 channel_history.json)")
+    crawl.add_argument("--from-history", action="store_true", help="히스토리에 저장된 채널 전체 (오래된 순)")
+    crawl.add_argument("--video-limit", type=int, default=10, help="채널당 최근 영상 수 (기본 10)")
+    crawl.add_argument("--workers", type=int, help="동시 요청 수 (기본 MAX_CONCURRENT_REQUESTS)")
+    crawl.add_argument("--budget", type=int, help="이번 실행에 쓸 최대 쿼터 units (기본: 오늘 남은 예산 전체)")
+    crawl.add_argument("--dry-run", action="store_true", help="수집만 하고 히스토리에는 저장하지 않음")
+    crawl.add_argument("--json", action="store_true", help="결과를 JSON lines 로 출력")
+    crawl.add_argument("--api-key", help="YouTube API KEY (기본: 환경 변수 YOUTUBE_API_KEY)")
+    crawl.set_defaults(func=cmd_crawl)
+
+    watch = sub.add_parser("watch", help="워치리스트 관리와 ETag 조건부 새로고침")
+    watch_sub = watch.add_subparsers(dest="action", required=True)
+    for action, help_text in [("add", "워치리스트에 추가"), ("remove", "워치리스트에서 삭제")]:
+        p = watch_sub.add_parser(action, help=help_text)
+        p.add_argument("ids", nargs="*", help="채널 ID/URL 또는 영상 ID")
+        p.add_argument("--kind", choices=["channel", "video"], default="channel", help="리소스 종류 (기본 channel)")
+        p.add_argument("--file", action="append", help="ID 목록 파일 (한 줄에 하나)")
+        p.set_defaults(func=cmd_watch)
+    watch_sub.choices["add"].add_argument(
+        "--interval", type=int, help="새로고침 주기(초, 기본 YT_WATCHLIST_INTERVAL 또는 6시간)",
+    )
+    watch_sub.add_parser("list", help="워치리스트 목록").set_defaults(func=cmd_watch)
+    poll = watch_sub.add_parser("poll", help="새로고침 시각이 지난 배치를 한 번 폴링")
+    poll.add_argument("--budget", type=int, help="이번 폴링에 쓸 최대 쿼터 units")
+    run = watch_sub.add_parser("run", help="하루 쿼터를 나눠 쓰며 계속 폴링 (Ctrl+C 로 종료)")
+    run.add_argument("--daily-units", type=int, help="하루 폴링 쿼터 (기본 YT_WATCHLIST_DAILY_UNITS 또는 1000 units)")
+    run.add_argument("--tick", type=float, default=60.0, help="폴링 간격(초, 기본 60)")
+    for p in (poll, run):
+        p.add_argument("--json", action="store_true", help="바뀐 item 을 JSON lines 로 출력")
+        p.add_argument("--api-key", help="YouTube API KEY (기본: 환경 변수 YOUTUBE_API_KEY)")
+        p.set_defaults(func=cmd_watch_poll)
+
+    trending = sub.add_parser("trending", help="쌓인 조회수 관측으로 조회 속도 급상승 영상 찾기 (API 호출 없음)")
+    trending.add_argument("--channel", action="append", help="채널 ID/URL (여러 번 지정 가능, 기본: 전체)")
+    trending.add_argument("--window", type=float, default=30, help="채널 기준선 기간(일, 기본 30)")
+    trending.add_argument("--z", type=float, default=3.0, help="급상승 판정 z 점수 (기본 3.0)")
+    trending.add_argument("--top", type=int, default=20, help="출력할 영상 수 (기본 20)")
+    trending.add_argument("--all", action="store_true", help="급상승이 아닌 영상도 z 점수 순으로 출력")
+    trending.add_argument("--json", action="store_true", help="결과를 JSON lines 로 출력")
+    trending.set_defaults(func=cmd_trending)
+
+    keywords = sub.add_parser("keywords", help="누적 키워드 색인에서 상위 키워드 조회 (API 호출 없음)")
+    keywords.add_argument("--channel", action="append", help="채널 ID/URL (여러 번 지정 가능)")
+    keywords.add_argument("--query", help="이 키워드 검색으로 찾은 영상만")
+    keywords.add_argument("--days", type=float, help="최근 N일 안에 게시된 영상만")
+    keywords.add_argument("--top", type=int, default=30, help="출력할 키워드 수 (기본 30)")
+    keywords.add_argument("--rebuild", action="store_true", help="조회 전에 누적 점수를 postings 에서 다시 계산")
+    keywords.add_argument("--json", action="store_true", help="결과를 JSON lines 로 출력")
+    keywords.set_defaults(func=cmd_keywords)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,85 @@
+"""
+YouTube API 클라이언트 생성과 (api_key, 스레드) 단위 재사용
+
+googleapiclient.discovery / httplib2 는 import 만으로 수백 ms 가 걸리므로, 실제 API 클라이언트를
+처음 만들 때 불러옴 (분석 함수만 쓰는 도구나 replay/synthetic 모드에서는 로드하지 않음)
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from .offline import (
+    API_MODE, FIXTURE_DIR, OFFLINE_API_MODES, OFFLINE_LATENCY_SEC, SYNTHETIC_CHANNELS,
+    SYNTHETIC_VIDEOS_PER_CHANNEL, RecordingYouTubeClient, ReplayYouTubeClient, SyntheticYouTubeClient,
+)
+
+
+# API HTTP 요청 타임아웃(초)
+API_HTTP_TIMEOUT = 30
+
+# 스레드별 클라이언트를 몇 개까지 보관할지 (넘으면 오래된 것부터 버림)
+MAX_POOLED_CLIENTS = 64
+
+_client_pool: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+_client_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _youtube_discovery_doc() -> Dict:
+    """패키지에 포함된 youtube v3 discovery 문서를 프로세스당 한 번만 읽고 파싱"""
+    from googleapiclient.discovery_cache import get_static_doc
+
+    return json.loads(get_static_doc("youtube", "v3"))
+
+
+def _create_youtube_client(api_key: str):
+    """YT_API_MODE 에 맞는 클라이언트 생성 (live / record / replay / synthetic)"""
+    if API_MODE == "replay":
+        return ReplayYouTubeClient(FIXTURE_DIR, OFFLINE_LATENCY_SEC)
+    if API_MODE == "synthetic":
+        return SyntheticYouTubeClient(SYNTHETIC_CHANNELS, SYNTHETIC_VIDEOS_PER_CHANNEL, OFFLINE_LATENCY_SEC)
+
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+
+    client = build_from_document(
+        _youtube_discovery_doc(), developerKey=api_key, http=httplib2.Http(timeout=API_HTTP_TIMEOUT),
+    )
+    if API_MODE == "record":
+        return RecordingYouTubeClient(client, FIXTURE_DIR)
+    return client
+
+
+def build_youtube(api_key: str):
+    """
+    YouTube 클라이언트를 (api_key, 스레드) 단위로 한 번만 만들어 재사용
+    - discovery 문서는 캐시된 것을 사용 (매번 다시 파싱하지 않음)
+    - httplib2.Http 는 스레드 안전하지 않으므로 스레드마다 따로 두고, 그 안의 keep-alive 연결을 계속 재사용
+    """
+    key = (api_key, threading.get_ident())
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is not None:
+            _client_pool.move_to_end(key)
+            return client
+
+    client = _create_youtube_client(api_key)
+    with _client_pool_lock:
+        _client_pool[key] = client
+        while len(_client_pool) > MAX_POOLED_CLIENTS:
+            _client_pool.popitem(last=False)
+    return client
+
+
+def resolve_api_key(api_key: str = None) -> str:
+    """
+    Streamlit 밖(배치 CLI 등)에서 쓸 API KEY: 인자 → 환경 변수 YOUTUBE_API_KEY 순서
+    replay/synthetic 모드에서는 키 없이 동작
+    """
+    key = api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not key and API_MODE in OFFLINE_API_MODES:
+        return "offline"
+    return key
@@ -0,0 +1,169 @@
+"""동시 요청 엔진 (CONCURRENT FETCH): 여러 채널/키워드의 영상을 병렬로 수집하고 videos.list 는 한데 모아 조회"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import pandas as pd
+from googleapiclient.errors import HttpError
+
+from .fetch import (
+    KeywordCrawler, VideoListCoalescer, build_video_dataframe, fetch_channel_basic, fetch_channel_video_ids,
+    fetch_keyword_search_page, fetch_video_batch,
+)
+from .perf import timed
+
+
+# 경쟁 채널 비교 시 동시에 보낼 API 요청 수 상한
+MAX_CONCURRENT_REQUESTS = 8
+
+
+class ChannelFetchers(NamedTuple):
+    """동시 요청 엔진이 쓰는 조회 함수 묶음 (앱에서는 st.cache_data 로 감싼 버전을 넘김)"""
+    channel_basic: Callable
+    channel_video_ids: Callable
+    video_batch: Callable
+
+
+DIRECT_FETCHERS = ChannelFetchers(fetch_channel_basic, fetch_channel_video_ids, fetch_video_batch)
+
+
+class KeywordFetchers(NamedTuple):
+    """여러 키워드 동시 수집에 쓰는 조회 함수 묶음"""
+    search_page: Callable
+    video_batch: Callable
+
+
+DIRECT_KEYWORD_FETCHERS = KeywordFetchers(fetch_keyword_search_page, fetch_video_batch)
+
+
+def _run_in_worker(worker_init, fn, *args):
+    if worker_init is not None:
+        worker_init()
+    return fn(*args)
+
+
+def _submit(executor: ThreadPoolExecutor, worker_init, fn, *args):
+    """호출한 스레드의 contextvars(캐시 전용 모드, 성능 측정 등)를 워커로 복사해서 제출"""
+    return executor.submit(contextvars.copy_context().run, _run_in_worker, worker_init, fn, *args)
+
+
+def _fetch_coalesced(
+    executor: ThreadPoolExecutor, worker_init, video_batch: Callable, api_key: str,
+    coalescer: VideoListCoalescer, errors: Dict[str, str],
+) -> Dict[str, Dict]:
+    """병합된 50개 배치를 병렬로 조회해 {video_id: item} 반환 (실패한 배치는 그 ID 를 요청한 호출자 오류로 기록)"""
+    batch_futures = {
+        _submit(executor, worker_init, video_batch, api_key, batch): batch for batch in coalescer.batches()
+    }
+    items_by_id = {}
+    for fut in as_completed(batch_futures):
+        try:
+            batch_items = fut.result()
+        except HttpError as e:
+            if "quotaExceeded" in str(e):
+                raise
+            for caller in coalescer.callers_of(batch_futures[fut]):
+                errors.setdefault(caller, str(e))
+            continue
+        items_by_id.update((item.get("id"), item) for item in batch_items)
+    return items_by_id
+
+
+@timed()
+def fetch_channels_concurrently(
+    api_key: str, channel_ids: List[str], video_limit: int, max_workers: int = MAX_CONCURRENT_REQUESTS,
+    fetchers: ChannelFetchers = DIRECT_FETCHERS, worker_init: Callable = None,
+) -> Tuple[Dict[str, Tuple[Dict, pd.DataFrame]], Dict[str, str]]:
+    """
+    여러 채널의 기본 정보와 최근 영상을 한꺼번에 병렬로 수집
+    - 채널 정보/영상 검색은 병렬로, 영상 상세(videos.list)는 모든 채널 ID를 모아 50개 배치로 조회
+    - worker_init 은 각 워커 스레드에서 작업 전에 호출됨 (Streamlit ScriptRunContext 연결 등)
+    - 반환값: ({channel_id: (info, df)}, {channel_id: 오류 메시지})
+    - quotaExceeded 가 발생하면 남은 요청을 취소하고 HttpError 를 그대로 올림
+    """
+    infos, video_ids, errors = {}, {}, {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {}
+        for cid in channel_ids:
+            futures[_submit(executor, worker_init, fetchers.channel_basic, api_key, cid)] = (cid, "info")
+            futures[_submit(executor, worker_init, fetchers.channel_video_ids, api_key, cid, video_limit)] = (cid, "ids")
+
+        for fut in as_completed(futures):
+            cid, kind = futures[fut]
+            try:
+                result = fut.result()
+            except HttpError as e:
+                if "quotaExceeded" in str(e):
+                    raise
+                errors.setdefault(cid, str(e))
+                continue
+            if kind == "info":
+                infos[cid] = result
+            else:
+                video_ids[cid] = result
+
+        coalescer = VideoListCoalescer()
+        for cid in channel_ids:
+            if cid not in errors and cid in video_ids:
+                coalescer.add(cid, video_ids[cid])
+        items_by_id = _fetch_coalesced(executor, worker_init, fetchers.video_batch, api_key, coalescer, errors)
+    finally:
+        # quotaExceeded 등으로 빠져나갈 때 아직 시작하지 않은 요청은 버림
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    routed = coalescer.route(items_by_id)
+    results = {}
+    for cid in channel_ids:
+        if cid in errors or cid not in infos or cid not in routed:
+            continue
+        results[cid] = (infos[cid], build_video_dataframe(routed[cid], include_channel=False, sort_by="published_at"))
+    return results, errors
+
+
+@timed()
+def fetch_keywords_concurrently(
+    api_key: str, keywords: List[str], max_results: int, max_workers: int = MAX_CONCURRENT_REQUESTS,
+    fetchers: KeywordFetchers = DIRECT_KEYWORD_FETCHERS, worker_init: Callable = None, **crawler_options,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    여러 키워드의 검색 결과를 한꺼번에 수집
+    - 키워드별 검색(페이지 넘기기)은 병렬로, 영상 상세(videos.list)는 모든 키워드의 ID 를 모아 중복 없이 50개 배치로 조회
+      → 키워드마다 남던 자투리 배치와 키워드 사이에 겹친 영상만큼 호출 수/쿼터가 줄어듦
+    - crawler_options 는 키워드마다 KeywordCrawler 에 그대로 전달 (max_pages, budget_units 등)
+    - 반환값: ({keyword: 조회수 순 영상 DataFrame}, {keyword: 오류 메시지})
+    """
+    video_ids, errors = {}, {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {
+            _submit(
+                executor, worker_init,
+                KeywordCrawler(api_key, kw, max_results, search_page=fetchers.search_page, **crawler_options).collect_ids,
+            ): kw
+            for kw in keywords
+        }
+        for fut in as_completed(futures):
+            kw = futures[fut]
+            try:
+                video_ids[kw] = fut.result()
+            except HttpError as e:
+                if "quotaExceeded" in str(e):
+                    raise
+                errors.setdefault(kw, str(e))
+
+        coalescer = VideoListCoalescer()
+        for kw in keywords:
+            if kw in video_ids:
+                coalescer.add(kw, video_ids[kw])
+        items_by_id = _fetch_coalesced(executor, worker_init, fetchers.video_batch, api_key, coalescer, errors)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    routed = coalescer.route(items_by_id)
+    return {
+        kw: build_video_dataframe(routed[kw], include_channel=True, sort_by="views")
+        for kw in keywords if kw not in errors and kw in routed
+    }, errors
@@ -0,0 +1,414 @@
+"""
+데이터 가져오기
+
+API 응답 → 파생 지표가 붙은 영상 DataFrame. Streamlit 캐시 없이 호출되는 원본 함수들로,
+앱에서는 st.cache_data 로 감싸서 쓰고 배치 CLI 에서는 그대로 씀
+"""
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import api_list
+from .client import build_youtube
+from .ingest import INGEST_QUEUE
+from .keyword_index import KEYWORD_INDEX
+from .momentum import VIEW_OBSERVATIONS
+from .perf import timed
+from .quota import QUOTA_COST, VIDEOS_LIST_BATCH
+from .text import tokenize
+from .utils import parse_iso_duration_series, safe_int
+from .videostore import VIDEO_STORE, VideoMetadataStore
+
+
+def _chunks(ids: List[str]) -> List[List[str]]:
+    return [ids[i:i + VIDEOS_LIST_BATCH] for i in range(0, len(ids), VIDEOS_LIST_BATCH)]
+
+
+def plan_video_requests(video_ids: List[str], known: Set[str]) -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    ID 목록을 (전체 part 배치, statistics 전용 배치) 로 나눔
+    - 이미 아는 영상은 statistics 만, 새 영상은 전체 part 로 조회
+    - 나눠서 호출 수(=쿼터)가 늘어나면 아는 영상 중 남는 자투리를 전체 part 배치에 합쳐서 호출 수를 그대로 유지
+    """
+    stats_ids = [v for v in video_ids if v in known]
+    full_ids = [v for v in video_ids if v not in known]
+    n_calls = -(-len(video_ids) // VIDEOS_LIST_BATCH)
+    if -(-len(stats_ids) // VIDEOS_LIST_BATCH) + -(-len(full_ids) // VIDEOS_LIST_BATCH) > n_calls:
+        remainder = len(stats_ids) % VIDEOS_LIST_BATCH
+        full_ids += stats_ids[len(stats_ids) - remainder:]
+        stats_ids = stats_ids[:len(stats_ids) - remainder]
+    return _chunks(full_ids), _chunks(stats_ids)
+
+
+def fetch_video_items(youtube, video_ids: List[str], store: VideoMetadataStore = VIDEO_STORE) -> Dict[str, Dict]:
+    """
+    videos.list 를 50개 단위로 호출해 {video_id: item} 으로 반환
+    - 메타데이터 저장소에 있는 영상은 part=statistics 로만 받아 저장된 고정 필드와 합침 (item 모양은 같음)
+    - 새 영상은 전체 part 로 받아 고정 필드를 저장소에 저장
+    - 받은 조회수는 관측 이력(VIEW_OBSERVATIONS)과 누적 키워드 색인(KEYWORD_INDEX)에도 반영
+      (INGEST_QUEUE 백그라운드 스레드에서 씀 — 요청 경로에서 토큰화/쓰기 잠금을 기다리지 않음, 관측 시각은 받은 시각)
+    - store=None 이면 저장소/관측/색인 기록 없이 전체 part 로 조회만 함
+    - record 모드 클라이언트는 저장소를 읽지 않고 항상 전체 part 로 조회 (fixture 가 저장소 상태에 좌우되지 않도록)
+    """
+    use_static = store is not None and not getattr(youtube, "records_fixtures", False)
+    static = store.get_many(list(dict.fromkeys(video_ids))) if use_static else {}
+    full_batches, stats_batches = plan_video_requests(video_ids, static.keys())
+
+    items = {}
+    for batch in full_batches:
+        resp = api_list(
+            youtube, "videos",
+            part="snippet,contentDetails,statistics", id=",".join(batch), maxResults=len(batch),
+        )
+        fetched = resp.get("items", [])
+        if store is not None:
+            store.put_many(fetched)
+        for item in fetched:
+            items[item.get("id")] = item
+    for batch in stats_batches:
+        resp = api_list(youtube, "videos", part="statistics", id=",".join(batch), maxResults=len(batch))
+        for item in resp.get("items", []):
+            video_id = item.get("id")
+            items[video_id] = {**static[video_id], "statistics": item.get("statistics", {})}
+    if store is not None:
+        INGEST_QUEUE.submit(VIEW_OBSERVATIONS.record, items.values())
+        INGEST_QUEUE.submit(KEYWORD_INDEX.update_items, items.values())
+    return items
+
+
+# datetime.weekday() 순서의 요일 이름 (마지막 칸은 게시일이 없는 경우)
+WEEKDAY_KR = np.array(["월", "화", "수", "목", "금", "토", "일", ""], dtype=object)
+
+# 영상 DataFrame 컬럼 타입 선언 (캐시에 올라가는 프레임 크기를 줄이기 위함)
+# - 개수 컬럼: 값 범위에 맞는 가장 작은 부호 없는 정수형으로 축소
+# - 값 범위가 작은 파생 컬럼: float32 (조회수 합계/평균에 쓰이는 컬럼은 정밀도 때문에 float64 유지)
+# - 반복되는 문자열: Categorical
+VIDEO_COUNT_COLUMNS = ["views", "likes", "comments", "duration_sec"]
+VIDEO_FLOAT32_COLUMNS = ["days_since_publish", "duration_min"]
+VIDEO_CATEGORY_DTYPES = {
+    "weekday": pd.CategoricalDtype(list(WEEKDAY_KR)),
+    "channel_title": "category",
+    "channel_id": "category",
+}
+
+
+def compact_video_frame(df: pd.DataFrame, keep_description: bool = False) -> pd.DataFrame:
+    """영상 DataFrame 을 선언된 컴팩트 타입으로 변환 (description 은 요청할 때만 유지)"""
+    if not keep_description:
+        df = df.drop(columns=["description"], errors="ignore")
+    for col in VIDEO_COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="unsigned")
+    for col in VIDEO_FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    if "publish_hour" in df.columns and not df["publish_hour"].isna().any():
+        df["publish_hour"] = df["publish_hour"].astype(np.int8)
+    for col, dtype in VIDEO_CATEGORY_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+@timed()
+def build_video_dataframe(
+    items: List[Dict], include_channel: bool, sort_by: str, include_description: bool = False
+) -> pd.DataFrame:
+    """
+    videos.list 응답 item 목록 → 파생 지표가 붙은 영상 DataFrame
+    - item 을 한 번 훑으면서 컬럼별 배열을 채우고, 날짜 파싱과 파생 지표는 컬럼 단위로 한 번에 계산
+    - 결과는 compact_video_frame 으로 타입을 줄여서 반환
+    """
+    n = len(items)
+    if n == 0: return pd.DataFrame()
+
+    video_id = np.empty(n, dtype=object); title = np.empty(n, dtype=object); description = np.empty(n, dtype=object)
+    channel_title = np.empty(n, dtype=object); channel_id = np.empty(n, dtype=object)
+    published = np.empty(n, dtype=object); duration = np.empty(n, dtype=object); thumbnail = np.empty(n, dtype=object)
+    views = np.zeros(n, dtype=np.int64); likes = np.zeros(n, dtype=np.int64); comments = np.zeros(n, dtype=np.int64)
+
+    for i, item in enumerate(items):
+        snippet = item.get("snippet", {}); stats = item.get("statistics", {}); content = item.get("contentDetails", {})
+        video_id[i] = item.get("id"); title[i] = snippet.get("title"); description[i] = snippet.get("description", "")
+        channel_title[i] = snippet.get("channelTitle"); channel_id[i] = snippet.get("channelId")
+        published[i] = snippet.get("publishedAt"); duration[i] = content.get("duration", "")
+        thumbnail[i] = snippet.get("thumbnails", {}).get("medium", {}).get("url", "")
+        views[i] = safe_int(stats.get("viewCount")); likes[i] = safe_int(stats.get("likeCount"))
+        comments[i] = safe_int(stats.get("commentCount"))
+
+    published_at = pd.to_datetime(pd.Series(published), utc=True, errors="coerce", format="ISO8601")
+    duration_sec = parse_iso_duration_series(pd.Series(duration)).to_numpy()
+
+    columns = {"video_id": video_id, "title": title, "description": description}
+    if include_channel:
+        columns.update({"channel_title": channel_title, "channel_id": channel_id})
+    columns.update(
+        {
+            "published_at": published_at, "views": views, "likes": likes, "comments": comments,
+            "duration_sec": duration_sec, "thumbnail_url": thumbnail,
+        }
+    )
+    df = pd.DataFrame(columns)
+
+    now = datetime.now(timezone.utc)
+    days_since_publish = ((now - published_at).dt.total_seconds() / (3600 * 24)).to_numpy()
+    days_since_publish = np.where(days_since_publish == 0, 0.1, days_since_publish)
+    duration_min = duration_sec / 60
+    weekday_idx = published_at.dt.weekday.fillna(7).to_numpy(dtype=np.int64)
+
+    df["days_since_publish"] = days_since_publish
+    df["views_per_day"] = views / days_since_publish
+    df["duration_min"] = duration_min
+    df["weekday"] = WEEKDAY_KR[weekday_idx]
+    df["publish_hour"] = published_at.dt.hour
+    df["max_watch_time_min"] = duration_min * views
+    df["title_tokens"] = tokenize(df["title"])
+    df = compact_video_frame(df, keep_description=include_description)
+    return df.sort_values(sort_by, ascending=False).reset_index(drop=True)
+
+
+def concat_video_frames(frames: List[pd.DataFrame], sort_by: str) -> pd.DataFrame:
+    """페이지별 영상 DataFrame 을 하나로 합침 (페이지마다 다른 Categorical 범주를 다시 맞추고 정렬)"""
+    frames = [f for f in frames if not f.empty]
+    if not frames: return pd.DataFrame()
+    if len(frames) == 1: return frames[0]
+    df = compact_video_frame(pd.concat(frames, ignore_index=True), keep_description=True)
+    return df.sort_values(sort_by, ascending=False).reset_index(drop=True)
+
+
+def fetch_channel_basic(api_key: str, channel_id: str) -> Dict:
+    # (기존 코드와 동일하게 유지)
+    youtube = build_youtube(api_key)
+    resp = api_list(
+        youtube, "channels",
+        part="snippet,statistics,contentDetails", id=channel_id, maxResults=1,
+    )
+
+    items = resp.get("items", [])
+    if not items: return {}
+
+    item = items[0]
+    stats = item.get("statistics", {}); snippet = item.get("snippet", {})
+
+    return {
+        "channel_id": item.get("id"), "title": snippet.get("title"), "description": snippet.get("description", ""),
+        "published_at": pd.to_datetime(snippet.get("publishedAt")).replace(tzinfo=timezone.utc),
+        "subscriber_count": safe_int(stats.get("subscriberCount")), "video_count": safe_int(stats.get("videoCount")),
+        "view_count": safe_int(stats.get("viewCount")), "thumbnail_url": snippet.get("thumbnails", {}).get("medium", {}).get("url", ""),
+        "uploads_playlist_id": item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads", ""),
+    }
+
+
+def fetch_channel_video_ids(api_key: str, channel_id: str, max_results: int) -> List[str]:
+    """채널의 최신 업로드 영상 ID 목록 (search.list)"""
+    youtube = build_youtube(api_key)
+    max_results = max(1, min(max_results, 50))
+    search_resp = api_list(
+        youtube, "search",
+        part="snippet", channelId=channel_id, type="video", order="date", maxResults=max_results,
+    )
+    return [item["id"]["videoId"] for item in search_resp.get("items", [])]
+
+
+def fetch_video_batch(api_key: str, video_ids: Tuple[str, ...]) -> List[Dict]:
+    """병합된 videos.list 배치 1개를 조회 (같은 ID 묶음이면 캐시 재사용)"""
+    return list(fetch_video_items(build_youtube(api_key), list(video_ids)).values())
+
+
+def fetch_channel_recent_videos(
+    api_key: str, channel_id: str, max_results: int, include_description: bool = False
+) -> pd.DataFrame:
+    video_ids = fetch_channel_video_ids(api_key, channel_id, max_results)
+    if not video_ids: return pd.DataFrame()
+
+    items = fetch_video_items(build_youtube(api_key), video_ids)
+    return build_video_dataframe(
+        [items[v] for v in video_ids if v in items], include_channel=False, sort_by="published_at",
+        include_description=include_description,
+    )
+
+
+# 키워드 검색을 몇 페이지(페이지당 50개, search.list 100 units)까지 넘길지
+KEYWORD_MAX_PAGES = int(os.environ.get("YT_KEYWORD_MAX_PAGES", "10"))
+
+
+def fetch_keyword_search_page(api_key: str, keyword: str, page_token: str = "") -> Tuple[List[str], str]:
+    """키워드 검색 결과 한 페이지(search.list 50개)의 영상 ID 목록과 다음 페이지 토큰"""
+    params = {"part": "id", "q": keyword, "type": "video", "order": "relevance", "maxResults": VIDEOS_LIST_BATCH}
+    if page_token:
+        params["pageToken"] = page_token
+    search_resp = api_list(build_youtube(api_key), "search", **params)
+    video_ids = [item["id"]["videoId"] for item in search_resp.get("items", [])]
+    KEYWORD_INDEX.record_search(keyword, video_ids)
+    return video_ids, search_resp.get("nextPageToken", "")
+
+
+class KeywordCrawler:
+    """
+    키워드 검색을 nextPageToken 으로 여러 페이지 넘기며 영상을 모으는 크롤러
+    - 페이지 사이에 겹치는 영상 ID 는 한 번만 조회
+    - 새 ID 를 모아 꽉 채운 50개 배치로 videos.list 를 호출하고, 배치마다 파생 지표가 붙은 DataFrame 을 yield
+    - max_results / max_pages / budget_units(예상 쿼터 비용) 중 하나에 닿거나 검색 결과가 끝나면 멈춤
+    - 멈춘 이유는 stop_reason 에 남음 ("limit", "depth", "budget", "exhausted")
+    - search_page / video_batch 로 조회 함수를 바꿀 수 있음 (앱에서는 st.cache_data 로 감싼 버전)
+    """
+
+    def __init__(
+        self, api_key: str, keyword: str, max_results: int, include_description: bool = False,
+        max_pages: int = KEYWORD_MAX_PAGES, budget_units: int = None,
+        search_page: Callable = fetch_keyword_search_page, video_batch: Callable = fetch_video_batch,
+    ):
+        self.api_key = api_key
+        self.keyword = keyword
+        self.max_results = max_results
+        self.include_description = include_description
+        self.max_pages = max_pages
+        self.budget_units = budget_units
+        self.search_page = search_page
+        self.video_batch = video_batch
+        self.pages = 0
+        self.units = 0
+        self.duplicates = 0
+        self.stop_reason = None
+
+    def _can_afford(self, units: int) -> bool:
+        return self.budget_units is None or self.units + units <= self.budget_units
+
+    def _enrich(self, video_ids: List[str]) -> pd.DataFrame:
+        self.units += QUOTA_COST["videos"]
+        items = {item.get("id"): item for item in self.video_batch(self.api_key, tuple(video_ids))}
+        return build_video_dataframe(
+            [items[v] for v in video_ids if v in items], include_channel=True, sort_by="views",
+            include_description=self.include_description,
+        )
+
+    def _new_id_pages(self) -> Iterator[List[str]]:
+        """검색 페이지를 넘기며 페이지마다 처음 나온 영상 ID 목록을 yield (멈추면 stop_reason 을 남김)"""
+        seen = set()
+        page_token = ""
+        while True:
+            if len(seen) >= self.max_results:
+                self.stop_reason = "limit"
+            elif self.pages >= self.max_pages:
+                self.stop_reason = "depth"
+            elif not self._can_afford(QUOTA_COST["search"] + QUOTA_COST["videos"]):
+                self.stop_reason = "budget"
+            if self.stop_reason:
+                return
+
+            video_ids, page_token = self.search_page(self.api_key, self.keyword, page_token)
+            self.pages += 1
+            self.units += QUOTA_COST["search"]
+            new_ids = [v for v in dict.fromkeys(video_ids) if v not in seen][:self.max_results - len(seen)]
+            self.duplicates += len(video_ids) - len(new_ids)
+            seen.update(new_ids)
+            yield new_ids
+            if not page_token or not video_ids:
+                self.stop_reason = "exhausted"
+                return
+
+    def collect_ids(self) -> List[str]:
+        """검색만 끝까지 넘겨 영상 ID 전체를 반환 (videos.list 는 호출하지 않음 — 여러 키워드를 모아 병합 조회할 때)"""
+        return [v for new_ids in self._new_id_pages() for v in new_ids]
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        pending: List[str] = []
+        for new_ids in self._new_id_pages():
+            pending.extend(new_ids)
+            while len(pending) >= VIDEOS_LIST_BATCH:
+                batch, pending = pending[:VIDEOS_LIST_BATCH], pending[VIDEOS_LIST_BATCH:]
+                yield self._enrich(batch)
+        if pending:
+            yield self._enrich(pending)
+
+
+def iter_keyword_video_pages(
+    api_key: str, keyword: str, max_results: int, include_description: bool = False, **options
+) -> Iterator[pd.DataFrame]:
+    """키워드 검색 결과를 배치(최대 50개)마다 파생 지표가 붙은 DataFrame 으로 흘려보냄 (KeywordCrawler 옵션 그대로 전달)"""
+    return iter(KeywordCrawler(api_key, keyword, max_results, include_description, **options))
+
+
+def fetch_videos_by_keyword(
+    api_key: str, keyword: str, max_results: int, include_description: bool = False
+) -> pd.DataFrame:
+    """키워드 검색 결과 전체를 한 번에 반환 (iter_keyword_video_pages 를 끝까지 모아 조회수 순 정렬)"""
+    return concat_video_frames(
+        list(iter_keyword_video_pages(api_key, keyword, max_results, include_description)), sort_by="views",
+    )
+
+
+# 심층 크롤링 시 가져올 최대 영상 수 (playlistItems 50개 = 1 unit)
+DEEP_CRAWL_MAX_VIDEOS = 5000
+
+
+def iter_channel_upload_pages(
+    api_key: str, uploads_playlist_id: str, max_videos: int = DEEP_CRAWL_MAX_VIDEOS
+) -> Iterator[pd.DataFrame]:
+    """
+    채널 업로드 재생목록을 pageToken 으로 끝까지 넘기며 50개씩 영상 DataFrame 을 흘려보냄
+    - search.list(100 units/50개) 대신 playlistItems.list(1 unit) + videos.list(1 unit) 사용
+    - 페이지가 도착할 때마다 바로 yield 하므로 화면에서 진행 상황을 보여줄 수 있음
+    """
+    youtube = build_youtube(api_key)
+    page_token = None
+    fetched = 0
+    while fetched < max_videos:
+        params = {
+            "part": "contentDetails", "playlistId": uploads_playlist_id,
+            "maxResults": min(VIDEOS_LIST_BATCH, max_videos - fetched),
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        page = api_list(youtube, "playlistItems", **params)
+
+        video_ids = [item["contentDetails"]["videoId"] for item in page.get("items", [])]
+        if video_ids:
+            items = fetch_video_items(youtube, video_ids)
+            fetched += len(video_ids)
+            yield build_video_dataframe(
+                [items[v] for v in video_ids if v in items], include_channel=False, sort_by="published_at"
+            )
+
+        page_token = page.get("nextPageToken")
+        if not page_token or not video_ids:
+            break
+
+
+class VideoListCoalescer:
+    """
+    여러 호출자(채널/키워드)가 요청한 영상 ID를 모아 중복을 없애고
+    꽉 채운 50개 단위 videos.list 배치로 묶은 뒤, 결과를 호출자별로 다시 나눠주는 요청 병합기
+    """
+
+    def __init__(self, batch_size: int = VIDEOS_LIST_BATCH):
+        self.batch_size = batch_size
+        self._pending: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, caller: str, video_ids: List[str]):
+        with self._lock:
+            self._pending.setdefault(caller, []).extend(video_ids)
+
+    def batches(self) -> List[Tuple[str, ...]]:
+        with self._lock:
+            unique = list(dict.fromkeys(v for ids in self._pending.values() for v in ids))
+        return [tuple(unique[i:i + self.batch_size]) for i in range(0, len(unique), self.batch_size)]
+
+    def _snapshot(self) -> List[Tuple[str, List[str]]]:
+        """다른 스레드가 add 하는 중에도 안전하게 훑을 수 있도록 잠금 안에서 복사한 (호출자, ID 목록)"""
+        with self._lock:
+            return [(caller, list(ids)) for caller, ids in self._pending.items()]
+
+    def callers_of(self, batch: Tuple[str, ...]) -> List[str]:
+        """해당 배치에 포함된 ID를 요청한 호출자 목록"""
+        batch_set = set(batch)
+        return [caller for caller, ids in self._snapshot() if batch_set.intersection(ids)]
+
+    def route(self, items_by_id: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """배치 결과를 각 호출자가 요청한 순서대로 돌려줌"""
+        return {caller: [items_by_id[v] for v in ids if v in items_by_id] for caller, ids in self._snapshot()}
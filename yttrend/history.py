@@ -0,0 +1,226 @@
+"""
+채널 히스토리 저장소 (SQLite)
+
+- channel_history: 채널별 최신 요약 1건
+- channel_snapshots: 분석할 때마다 쌓이는 요약 이력
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from .utils import open_sqlite
+
+
+# 예전 버전의 JSON 히스토리 (DB가 비어 있으면 최초 1회 자동 이관)
+HISTORY_FILE = "channel_history.json"
+HISTORY_DB = os.environ.get("YT_HISTORY_DB", "channel_history.sqlite3")
+
+_history_local = threading.local()
+
+
+def _history_conn() -> sqlite3.Connection:
+    """스레드별 히스토리 DB 연결 (channel_id 기본키로 한 채널 단위 upsert)"""
+    conn = getattr(_history_local, "conn", None)
+    if conn is None:
+        conn = open_sqlite(HISTORY_DB)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS channel_history (
+                channel_id TEXT PRIMARY KEY,
+                title TEXT,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        _create_snapshot_table(conn)
+        _migrate_history(conn)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snapshots_channel_date ON channel_snapshots (channel_id, analysis_date)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_date ON channel_snapshots (analysis_date)")
+        _history_local.conn = conn
+    return conn
+
+
+def _create_snapshot_table(conn: sqlite3.Connection):
+    """스냅샷은 덧붙이기만 하는 이력이라 rowid 키 (같은 분에 두 번 분석해도 둘 다 남음)"""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS channel_snapshots (
+            channel_id TEXT NOT NULL,
+            analysis_date TEXT NOT NULL,
+            title TEXT,
+            subscriber_count INTEGER,
+            total_views INTEGER,
+            video_count INTEGER,
+            recent_video_count INTEGER,
+            recent_avg_views INTEGER,
+            recent_avg_daily_views INTEGER,
+            videos_last_30d INTEGER,
+            grade TEXT
+        )
+        """
+    )
+
+
+HISTORY_SCHEMA_VERSION = 3
+
+
+def _migrate_history(conn: sqlite3.Connection):
+    """
+    DB 스키마 버전(user_version)에 맞춰 한 번만 실행되는 이관 작업
+    - 1: channel_history.json 이 남아 있으면 옮겨 담기
+    - 2: 기존 히스토리 요약을 첫 스냅샷으로 채워 넣기
+    - 3: (channel_id, analysis_date) 기본키였던 스냅샷 테이블을 rowid 테이블로 옮기기
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= HISTORY_SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1 and os.path.exists(HISTORY_FILE):
+            try:
+                with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except Exception:
+                legacy = {}
+            _insert_history_rows(conn, legacy.values())
+        if version < 3:
+            conn.execute("ALTER TABLE channel_snapshots RENAME TO channel_snapshots_v2")
+            _create_snapshot_table(conn)
+            columns = ", ".join(SNAPSHOT_COLUMNS)
+            conn.execute(
+                f"INSERT INTO channel_snapshots ({columns}) SELECT {columns} FROM channel_snapshots_v2 "
+                "ORDER BY channel_id, analysis_date"
+            )
+            conn.execute("DROP TABLE channel_snapshots_v2")
+        if version < 2:
+            rows = conn.execute("SELECT data FROM channel_history").fetchall()
+            _insert_snapshot_rows(conn, [json.loads(data) for (data,) in rows])
+        conn.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _insert_history_rows(conn: sqlite3.Connection, rows):
+    now = time.time()
+    conn.executemany(
+        """
+        INSERT INTO channel_history (channel_id, title, data, updated_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            title = excluded.title, data = excluded.data, updated_at = excluded.updated_at
+        """,
+        [(row["channel_id"], row.get("title"), json.dumps(row, ensure_ascii=False), now) for row in rows],
+    )
+
+
+SNAPSHOT_COLUMNS = [
+    "channel_id", "analysis_date", "title", "subscriber_count", "total_views", "video_count",
+    "recent_video_count", "recent_avg_views", "recent_avg_daily_views", "videos_last_30d", "grade",
+]
+
+
+def _insert_snapshot_rows(conn: sqlite3.Connection, rows):
+    placeholders = ", ".join("?" for _ in SNAPSHOT_COLUMNS)
+    conn.executemany(
+        f"INSERT INTO channel_snapshots ({', '.join(SNAPSHOT_COLUMNS)}) VALUES ({placeholders})",
+        [tuple(row.get(c) for c in SNAPSHOT_COLUMNS) for row in rows],
+    )
+
+
+def upsert_channel_history_rows(rows: List[Dict]):
+    """여러 채널의 요약 데이터를 한 트랜잭션으로 추가/갱신하고, 같은 내용을 스냅샷으로 누적"""
+    conn = _history_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _insert_history_rows(conn, rows)
+        _insert_snapshot_rows(conn, rows)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def upsert_channel_history(row: Dict):
+    """채널 한 개의 요약 데이터를 히스토리에 추가/갱신하고, 같은 내용을 스냅샷으로 누적"""
+    upsert_channel_history_rows([row])
+
+
+def save_channel_history(history_data: Dict):
+    """채널 히스토리 전체를 주어진 데이터로 교체 (빈 dict 를 넘기면 전체 삭제)"""
+    conn = _history_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM channel_history")
+        _insert_history_rows(conn, history_data.values())
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def clear_channel_history():
+    """저장된 채널 요약과 스냅샷을 모두 삭제"""
+    conn = _history_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM channel_history")
+        conn.execute("DELETE FROM channel_snapshots")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def load_channel_snapshots(channel_id: str, start: str = None, end: str = None) -> pd.DataFrame:
+    """
+    채널의 스냅샷 이력을 분석일 순으로 반환 (start/end 는 'YYYY-MM-DD' 형식, 포함)
+    (channel_id, analysis_date) 인덱스로 한 채널의 구간만 읽음, 같은 시각의 스냅샷은 저장 순서대로
+    """
+    query = f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM channel_snapshots WHERE channel_id = ?"
+    params = [channel_id]
+    if start:
+        query += " AND analysis_date >= ?"; params.append(start)
+    if end:
+        query += " AND analysis_date < ?"; params.append(end + "~")  # 해당 날짜의 모든 시각 포함
+    query += " ORDER BY analysis_date, rowid"
+    try:
+        rows = _history_conn().execute(query, params).fetchall()
+    except Exception:
+        rows = []
+    return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+
+def load_channel_history() -> Dict:
+    """히스토리 DB에서 {channel_id: 요약 데이터} 불러오기"""
+    try:
+        rows = _history_conn().execute("SELECT channel_id, data FROM channel_history").fetchall()
+    except Exception:
+        return {}
+    return {cid: json.loads(data) for cid, data in rows}
+
+
+def load_tracked_channel_ids() -> List[str]:
+    """히스토리에 저장된 채널 ID 목록 (가장 오래전에 갱신된 채널부터)"""
+    try:
+        rows = _history_conn().execute("SELECT channel_id FROM channel_history ORDER BY updated_at").fetchall()
+    except Exception:
+        return []
+    return [cid for (cid,) in rows]
+
+
+def load_channel_history_options() -> Dict[str, str]:
+    """채널 선택 목록용 {채널명: channel_id} (요약 JSON 은 읽지 않음)"""
+    try:
+        rows = _history_conn().execute("SELECT title, channel_id FROM channel_history").fetchall()
+    except Exception:
+        return {}
+    return {title: cid for title, cid in rows}
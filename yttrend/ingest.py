@@ -0,0 +1,71 @@
+"""
+조회 결과 후처리 쓰기 큐 (누적 키워드 색인 / 조회수 관측 이력)
+
+videos.list 를 받을 때마다 하던 SQLite 쓰기(토큰화 + BEGIN IMMEDIATE)를 요청 경로에서 빼서
+백그라운드 스레드 하나가 순서대로 처리 → 동시 수집 워커들이 쓰기 잠금을 두고 다투지 않음
+- 읽기 직전(색인/급상승 화면)이나 배치 CLI 종료 시 flush() 로 밀린 작업을 마저 씀
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# 화면에서 색인/관측을 읽기 전에 밀린 쓰기를 기다리는 최대 시간(초) — 넘으면 반영된 만큼만 보여줌
+INGEST_FLUSH_TIMEOUT = 10
+
+
+class IngestQueue:
+    """(함수, item 목록, 관측 시각) 작업을 백그라운드 스레드 하나가 차례로 실행하는 큐"""
+
+    def __init__(self, name: str = "yttrend-ingest"):
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            fn, items, now = self._queue.get()
+            try:
+                fn(items, now)
+            except Exception:
+                # 작업 하나가 실패해도 나머지는 계속 씀 (색인/관측이 한 묶음 빠질 뿐)
+                logger.exception("ingest task %s failed", getattr(fn, "__qualname__", fn))
+            finally:
+                self._queue.task_done()
+
+    def submit(self, fn: Callable, items: Iterable[Dict], now: float = None):
+        """fn(items, now) 를 나중에 실행하도록 넣음 (now 를 주지 않으면 넣은 시각으로 고정)"""
+        items = list(items)
+        if not items:
+            return
+        self._ensure_worker()
+        self._queue.put((fn, items, time.time() if now is None else now))
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: float = None) -> bool:
+        """밀린 작업이 끝날 때까지 기다림 (timeout 초 안에 못 끝내면 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+
+INGEST_QUEUE = IngestQueue()
+atexit.register(INGEST_QUEUE.flush, 3 * INGEST_FLUSH_TIMEOUT)
@@ -0,0 +1,344 @@
+"""
+누적 키워드 색인 (SQLite 역색인)
+
+지금까지 조회한 모든 영상의 제목 토큰을 쌓아 두고, 화면에 없는 영상까지 포함한 키워드 점수를 바로 조회
+- postings: (video_id, token, tf) — 제목에 토큰이 나온 횟수
+- keyword_scores: 토큰별 누적 점수 Σ tf·√조회수 와 영상 수 (extract_keywords_with_weight 와 같은 점수)
+- 영상이 새로 들어오거나 조회수만 바뀌면 해당 토큰의 점수에 변화량만 더함 (제목이 바뀐 영상만 postings 를 다시 씀)
+- keyword_daily: 게시일(UTC 날짜)별 토큰 점수 — 게시일 조건만 있는 조회는 날짜 단위 합계로 바로 계산
+- 채널/검색 키워드 조건이 붙으면 조건에 맞는 영상의 postings 만 모아서 합산
+"""
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .perf import timed
+from .text import TOKENIZER_VERSION, tokenize
+from .utils import open_sqlite, safe_int
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_INDEX_DB = os.environ.get("YT_KEYWORD_INDEX_DB", "keyword_index.sqlite3")
+
+KEYWORD_COLUMNS = ["keyword", "score", "videos"]
+
+# 게시일을 모르는 영상의 날짜 버킷
+UNKNOWN_DAY = -1
+
+
+def _is_lock_timeout(error: sqlite3.OperationalError) -> bool:
+    """busy timeout 안에 쓰기 잠금을 못 얻은 경우"""
+    return "locked" in str(error) or "busy" in str(error)
+
+
+def _json_list(values) -> str:
+    return json.dumps([str(v) for v in values], ensure_ascii=False)
+
+
+class KeywordIndex:
+    """제목 토큰 역색인과 토큰별 누적 점수 (스레드별 연결, 갱신은 배치 단위 트랜잭션)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS indexed_videos (
+                    video_id TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    published_at REAL,
+                    views INTEGER NOT NULL,
+                    weight REAL NOT NULL,
+                    title_hash INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_indexed_videos_channel ON indexed_videos (channel_id);
+                CREATE INDEX IF NOT EXISTS idx_indexed_videos_published ON indexed_videos (published_at);
+                CREATE TABLE IF NOT EXISTS postings (
+                    video_id TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (video_id, token)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS keyword_scores (
+                    token TEXT PRIMARY KEY,
+                    score REAL NOT NULL,
+                    videos INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_keyword_scores_score ON keyword_scores (score DESC);
+                CREATE TABLE IF NOT EXISTS keyword_daily (
+                    day INTEGER NOT NULL,
+                    token TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    videos INTEGER NOT NULL,
+                    PRIMARY KEY (day, token)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS search_hits (
+                    query TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    PRIMARY KEY (query, video_id)
+                ) WITHOUT ROWID;
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(str(query).lower().split())
+
+    def record_search(self, query: str, video_ids: List[str]):
+        """키워드 검색으로 찾은 영상 ID 기록 (검색 키워드 조건 조회용)"""
+        if not video_ids:
+            return
+        query = self.normalize_query(query)
+        try:
+            self._conn().executemany(
+                "INSERT OR IGNORE INTO search_hits (query, video_id) VALUES (?, ?)", [(query, v) for v in video_ids],
+            )
+        except sqlite3.Error:
+            pass
+
+    @timed("keyword_index.update")
+    def update_items(self, items: Iterable[Dict], now: float = None) -> int:
+        """
+        videos.list item 들로 색인 갱신하고 갱신한 영상 수를 반환
+        - 새 영상: postings 추가, 토큰 점수에 tf·√조회수 더함
+        - 제목이 같은 기존 영상: 토큰 점수에 tf·(√새 조회수 − √이전 조회수) 만 더함
+        - 제목이 바뀐 기존 영상: 이전 postings 의 점수를 빼고 새 postings 로 교체
+        - 같은 video_id 가 여러 번 들어오면 마지막 item 만 반영
+        쓰기 잠금을 못 얻으면(다른 프로세스가 오래 쓰는 중) 경고만 남기고 0 을 반환 (다음 조회 때 다시 반영됨),
+        그 밖의 DB 오류는 롤백 후 그대로 올림
+        """
+        items = list({
+            item["id"]: item for item in items if item.get("id") and "viewCount" in item.get("statistics", {})
+        }.values())
+        if not items:
+            return 0
+        now = time.time() if now is None else now
+        video_ids = np.array([item["id"] for item in items], dtype=object)
+        titles = pd.Series([item.get("snippet", {}).get("title") or "" for item in items], dtype=object)
+        channel_ids = [item.get("snippet", {}).get("channelId") for item in items]
+        published = pd.to_datetime(
+            pd.Series([item.get("snippet", {}).get("publishedAt") for item in items]),
+            utc=True, errors="coerce", format="ISO8601",
+        )
+        seconds = (published - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+        published_at = [None if np.isnan(s) else s for s in seconds.to_numpy(dtype=np.float64)]
+        days = (seconds // 86400).fillna(UNKNOWN_DAY).to_numpy(dtype=np.int64)
+        views = np.array([safe_int(item["statistics"].get("viewCount")) for item in items], dtype=np.int64)
+        weights = np.sqrt(views.astype(np.float64))
+        # 토크나이저 버전이 바뀌면 해시도 바뀌어 기존 영상의 포스팅을 다시 만듦
+        title_hashes = np.array(
+            [zlib.crc32(f"{TOKENIZER_VERSION}\x00{t}".encode("utf-8")) for t in titles], dtype=np.int64,
+        )
+
+        # 영상별 (토큰, tf)
+        token_lists = tokenize(titles)
+        tokens = token_lists.list.flatten()
+        rows = np.repeat(np.arange(len(items)), token_lists.list.len().fillna(0).to_numpy(dtype=np.int64))
+        postings = pd.DataFrame({"row": rows, "token": tokens.to_numpy(dtype=object)})
+        postings = postings.groupby(["row", "token"], sort=False).size().rename("tf").reset_index()
+
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = {
+                vid: (weight, title_hash) for vid, weight, title_hash in conn.execute(
+                    """
+                    SELECT video_id, weight, title_hash FROM indexed_videos
+                    WHERE video_id IN (SELECT value FROM json_each(?))
+                    """,
+                    (_json_list(video_ids),),
+                )
+            }
+            old_weight = np.array([existing.get(v, (0.0, None))[0] for v in video_ids], dtype=np.float64)
+            is_known = np.array([v in existing for v in video_ids], dtype=bool)
+            same_title = np.array([existing.get(v, (None, None))[1] == h for v, h in zip(video_ids, title_hashes)])
+            rewrite = ~same_title  # 새 영상 + 제목이 바뀐 영상
+
+            # 조회수만 바뀐 영상은 (새 가중치 − 이전 가중치), postings 를 다시 쓰는 영상은 새 가중치 전체를 더함
+            row_delta = np.where(rewrite, weights, weights - old_weight)
+            row_videos = rewrite.astype(np.int64)
+            deltas = pd.DataFrame({
+                "day": days[postings["row"].to_numpy()],
+                "token": postings["token"],
+                "score": postings["tf"].to_numpy() * row_delta[postings["row"].to_numpy()],
+                "videos": row_videos[postings["row"].to_numpy()],
+            })
+
+            # 제목이 바뀐 기존 영상은 이전 postings 의 점수/영상 수를 빼고 지움
+            changed = video_ids[is_known & rewrite]
+            if len(changed):
+                old = pd.DataFrame(
+                    conn.execute(
+                        """
+                        SELECT COALESCE(CAST(v.published_at / 86400 AS INTEGER), ?), p.token, p.tf * v.weight, 1
+                        FROM postings p JOIN indexed_videos v ON v.video_id = p.video_id
+                        WHERE p.video_id IN (SELECT value FROM json_each(?))
+                        """,
+                        (UNKNOWN_DAY, _json_list(changed)),
+                    ).fetchall(),
+                    columns=["day", "token", "score", "videos"],
+                )
+                deltas = pd.concat([deltas, old.assign(score=-old["score"], videos=-old["videos"])], ignore_index=True)
+                conn.execute(
+                    "DELETE FROM postings WHERE video_id IN (SELECT value FROM json_each(?))", (_json_list(changed),),
+                )
+
+            new_postings = postings[rewrite[postings["row"].to_numpy()]]
+            conn.executemany(
+                "INSERT INTO postings (video_id, token, tf) VALUES (?, ?, ?)",
+                zip(video_ids[new_postings["row"].to_numpy()].tolist(), new_postings["token"].tolist(),
+                    new_postings["tf"].tolist()),
+            )
+            per_token = deltas.drop(columns="day").groupby("token", sort=False).sum()
+            conn.executemany(
+                """
+                INSERT INTO keyword_scores (token, score, videos) VALUES (?, ?, ?)
+                ON CONFLICT(token) DO UPDATE SET score = score + excluded.score, videos = videos + excluded.videos
+                """,
+                zip(per_token.index.tolist(), per_token["score"].tolist(), per_token["videos"].tolist()),
+            )
+            conn.execute("DELETE FROM keyword_scores WHERE videos <= 0")
+            per_day = deltas.groupby(["day", "token"], sort=False).sum().reset_index()
+            conn.executemany(
+                """
+                INSERT INTO keyword_daily (day, token, score, videos) VALUES (?, ?, ?, ?)
+                ON CONFLICT(day, token) DO UPDATE SET score = score + excluded.score, videos = videos + excluded.videos
+                """,
+                zip(per_day["day"].tolist(), per_day["token"].tolist(), per_day["score"].tolist(),
+                    per_day["videos"].tolist()),
+            )
+            conn.execute("DELETE FROM keyword_daily WHERE videos <= 0")
+            conn.executemany(
+                """
+                INSERT INTO indexed_videos (video_id, channel_id, published_at, views, weight, title_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    channel_id = excluded.channel_id, published_at = excluded.published_at, views = excluded.views,
+                    weight = excluded.weight, title_hash = excluded.title_hash, updated_at = excluded.updated_at
+                """,
+                zip(video_ids.tolist(), channel_ids, published_at, views.tolist(), weights.tolist(),
+                    title_hashes.tolist(), [now] * len(items)),
+            )
+            conn.execute("COMMIT")
+        except BaseException as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if isinstance(e, sqlite3.OperationalError) and _is_lock_timeout(e):
+                logger.warning("keyword index update skipped (%d videos): %s", len(items), e)
+                return 0
+            raise
+        return len(items)
+
+    @timed("keyword_index.top")
+    def top_keywords(
+        self, top_n: int = 30, channel_ids: List[str] = None, query: str = None, since: float = None,
+        until: float = None,
+    ) -> pd.DataFrame:
+        """
+        누적 점수 상위 키워드 (keyword, score, videos)
+        - 조건이 없으면 keyword_scores 에서 바로 읽음
+        - since~until(게시 시각, epoch 초) 조건만 있으면 keyword_daily 의 날짜(UTC) 단위 합계 — 양 끝 날짜는 통째로 포함
+        - channel_ids / query(검색 키워드) 조건이 있으면 해당 영상의 postings 만 합산 (게시 시각은 초 단위로 적용)
+        """
+        conn = self._conn()
+        if channel_ids is None and query is None and since is None and until is None:
+            rows = conn.execute(
+                "SELECT token, score, videos FROM keyword_scores ORDER BY score DESC LIMIT ?", (top_n,),
+            ).fetchall()
+        elif channel_ids is None and query is None:
+            first_day = 0 if since is None else math.floor(since / 86400)
+            end_day = 2 ** 62 if until is None else math.ceil(until / 86400)
+            rows = conn.execute(
+                """
+                SELECT token, SUM(score) AS total, SUM(videos) FROM keyword_daily
+                WHERE day >= ? AND day < ? GROUP BY token ORDER BY total DESC LIMIT ?
+                """,
+                (first_day, end_day, top_n),
+            ).fetchall()
+        else:
+            clauses, params = [], []
+            if channel_ids is not None:
+                clauses.append("v.channel_id IN (SELECT value FROM json_each(?))")
+                params.append(_json_list(channel_ids))
+            if query is not None:
+                clauses.append("v.video_id IN (SELECT video_id FROM search_hits WHERE query = ?)")
+                params.append(self.normalize_query(query))
+            if since is not None:
+                clauses.append("v.published_at >= ?")
+                params.append(since)
+            if until is not None:
+                clauses.append("v.published_at < ?")
+                params.append(until)
+            rows = conn.execute(
+                f"""
+                SELECT p.token, SUM(p.tf * v.weight) AS score, COUNT(*) FROM indexed_videos v
+                JOIN postings p ON p.video_id = v.video_id
+                WHERE {' AND '.join(clauses)}
+                GROUP BY p.token ORDER BY score DESC LIMIT ?
+                """,
+                [*params, top_n],
+            ).fetchall()
+        data = pd.DataFrame(rows, columns=KEYWORD_COLUMNS)
+        data["score"] = data["score"].round(0).astype(int)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """색인된 영상 수 / 토큰 수"""
+        conn = self._conn()
+        return {
+            "videos": conn.execute("SELECT COUNT(*) FROM indexed_videos").fetchone()[0],
+            "keywords": conn.execute("SELECT COUNT(*) FROM keyword_scores").fetchone()[0],
+        }
+
+    def rebuild_scores(self):
+        """keyword_scores / keyword_daily 를 postings 에서 다시 계산 (누적 덧셈 오차 정리, 불용어 변경 후에는 재수집 필요)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM keyword_scores")
+            conn.execute("DELETE FROM keyword_daily")
+            conn.execute(
+                """
+                INSERT INTO keyword_scores (token, score, videos)
+                SELECT p.token, SUM(p.tf * v.weight), COUNT(*) FROM postings p
+                JOIN indexed_videos v ON v.video_id = p.video_id GROUP BY p.token
+                """
+            )
+            conn.execute(
+                """
+                INSERT INTO keyword_daily (day, token, score, videos)
+                SELECT COALESCE(CAST(v.published_at / 86400 AS INTEGER), ?), p.token, SUM(p.tf * v.weight), COUNT(*)
+                FROM postings p JOIN indexed_videos v ON v.video_id = p.video_id GROUP BY 1, 2
+                """,
+                (UNKNOWN_DAY,),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        self._conn().executescript(
+            "DELETE FROM indexed_videos; DELETE FROM postings; DELETE FROM keyword_scores; DELETE FROM keyword_daily; "
+            "DELETE FROM search_hits;"
+        )
+
+
+KEYWORD_INDEX = KeywordIndex(KEYWORD_INDEX_DB)
@@ -0,0 +1,209 @@
+"""
+조회수 관측 이력과 조회 속도/가속도 기반 급상승 감지
+
+- view_observations: 영상을 조회할 때마다 (video_id, 관측 시각, 조회수) 를 쌓음 (메타데이터 저장소와 같은 DB)
+- compute_view_momentum: 모든 영상의 관측값을 한 번에 numpy 로 계산
+  · 속도 = 연속한 두 관측 사이의 조회수 증가 / 경과 일수 (views/day)
+  · 가속도 = 연속한 두 속도 사이의 변화 / 경과 일수 (views/day²)
+  · 급상승 = 최신 속도의 log 값이 같은 채널의 최근 window_days 동안 속도 표본(자기 이전 관측)에 비해 z 점수 이상
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .cache import API_CACHE_TTL
+from .utils import open_sqlite, safe_int
+from .videostore import VIDEO_STORE_DB
+
+# 같은 영상의 관측은 이 간격(초) 안에 한 번만 기록 (디스크 캐시로 다시 받은 같은 응답이 0 속도로 잡히지 않도록)
+OBSERVATION_MIN_GAP = int(os.environ.get("YT_OBSERVATION_MIN_GAP", str(API_CACHE_TTL["videos"])))
+
+# 채널 기준선(rolling) 기간 / 급상승 판정 z 점수 / 기준선에 필요한 최소 표본 수
+MOMENTUM_WINDOW_DAYS = 30
+BREAKOUT_ZSCORE = 3.0
+BASELINE_MIN_SAMPLES = 5
+
+MOMENTUM_COLUMNS = [
+    "video_id", "channel_id", "observations", "first_observed_at", "last_observed_at", "views",
+    "velocity", "acceleration", "baseline_velocity", "zscore", "breakout",
+]
+
+
+class ViewObservationStore:
+    """영상 조회수 관측 이력 저장소 (SQLite), 스레드별 연결"""
+
+    def __init__(self, path: str, min_gap: int = OBSERVATION_MIN_GAP):
+        self.path = path
+        self.min_gap = min_gap
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS view_observations (
+                    video_id TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    channel_id TEXT,
+                    views INTEGER NOT NULL,
+                    likes INTEGER,
+                    comments INTEGER,
+                    PRIMARY KEY (video_id, observed_at)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_view_observations_channel ON view_observations (channel_id)")
+            self._local.conn = conn
+        return conn
+
+    def record(self, items: Iterable[Dict], now: float = None):
+        """
+        videos.list item 들의 통계를 관측값으로 저장
+        같은 영상의 마지막 관측이 min_gap 안이면 건너뜀 (DB 오류는 무시: 관측 하나가 빠질 뿐)
+        """
+        now = time.time() if now is None else now
+        rows = []
+        for item in items:
+            stats = item.get("statistics")
+            if not stats or "viewCount" not in stats:
+                continue
+            rows.append((
+                item.get("id"), now, item.get("snippet", {}).get("channelId"), safe_int(stats.get("viewCount")),
+                safe_int(stats.get("likeCount")), safe_int(stats.get("commentCount")), item.get("id"), now - self.min_gap,
+            ))
+        if not rows:
+            return
+        try:
+            self._conn().executemany(
+                """
+                INSERT OR IGNORE INTO view_observations (video_id, observed_at, channel_id, views, likes, comments)
+                SELECT ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM view_observations WHERE video_id = ? AND observed_at > ?)
+                """,
+                rows,
+            )
+        except sqlite3.Error:
+            pass
+
+    def load(self, video_ids: List[str] = None, channel_ids: List[str] = None, since: float = None) -> pd.DataFrame:
+        """관측 이력 (video_id, channel_id, observed_at(epoch 초), views) — 조건을 주면 해당 영상/채널만"""
+        clauses, params = [], []
+        for column, values in (("video_id", video_ids), ("channel_id", channel_ids)):
+            if values is not None:
+                clauses.append(f"{column} IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps(list(values)))
+        if since is not None:
+            clauses.append("observed_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT video_id, channel_id, observed_at, views FROM view_observations {where}", params,
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["video_id", "channel_id", "observed_at", "views"])
+
+    def clear(self):
+        self._conn().execute("DELETE FROM view_observations")
+
+
+VIEW_OBSERVATIONS = ViewObservationStore(VIDEO_STORE_DB)
+
+
+def compute_view_momentum(
+    observations: pd.DataFrame, window_days: float = MOMENTUM_WINDOW_DAYS, z_threshold: float = BREAKOUT_ZSCORE,
+    min_baseline: int = BASELINE_MIN_SAMPLES,
+) -> pd.DataFrame:
+    """
+    관측 이력 → 영상별 최신 속도/가속도/채널 기준 z 점수 (z 점수 내림차순)
+    - 관측이 1개뿐인 영상은 속도가 NaN
+    - 기준선은 같은 채널의 속도 표본 중 해당 표본보다 앞선 window_days 이내의 것 (누적합 + searchsorted 로 한 번에 계산)
+    """
+    if observations.empty:
+        return pd.DataFrame(columns=MOMENTUM_COLUMNS)
+
+    obs = observations.sort_values(["video_id", "observed_at"], kind="stable").reset_index(drop=True)
+    video_codes, video_ids = pd.factorize(obs["video_id"], sort=False)
+    channel_codes, _ = pd.factorize(obs["channel_id"].fillna(""), sort=False)
+    t = obs["observed_at"].to_numpy(dtype=np.float64)
+    views = obs["views"].to_numpy(dtype=np.float64)
+    n_obs = len(obs)
+
+    # 같은 영상 안에서 연속한 관측 쌍 → 속도 표본 (관측 i-1 → i, 시각 t[i])
+    pair = np.zeros(n_obs, dtype=bool)
+    pair[1:] = video_codes[1:] == video_codes[:-1]
+    dt_days = np.full(n_obs, np.nan)
+    dt_days[1:] = (t[1:] - t[:-1]) / 86400
+    velocity = np.full(n_obs, np.nan)
+    velocity[pair] = (views[1:] - views[:-1])[pair[1:]] / dt_days[pair]
+
+    # 연속한 두 속도 표본 → 가속도
+    accel_pair = np.zeros(n_obs, dtype=bool)
+    accel_pair[1:] = pair[1:] & pair[:-1]
+    acceleration = np.full(n_obs, np.nan)
+    acceleration[accel_pair] = (velocity[1:] - velocity[:-1])[accel_pair[1:]] / dt_days[accel_pair]
+
+    # 채널별 rolling 기준선: (채널, 시각) 순으로 정렬한 속도 표본의 log 값 누적합으로 창 안의 평균/표준편차
+    sample_idx = np.flatnonzero(pair)
+    x = np.log1p(np.clip(velocity[sample_idx], 0, None))
+    t_sample = t[sample_idx].astype(np.int64)
+    key = (channel_codes[sample_idx].astype(np.int64) << 34) | t_sample
+    order = np.argsort(key, kind="stable")
+    key_sorted, x_sorted = key[order], x[order]
+    start = np.searchsorted(key_sorted, key_sorted - int(window_days * 86400), side="left")
+    end = np.searchsorted(key_sorted, key_sorted, side="left")  # 같은 시각의 표본은 기준선에서 제외
+    csum = np.concatenate(([0.0], np.cumsum(x_sorted)))
+    csum2 = np.concatenate(([0.0], np.cumsum(x_sorted * x_sorted)))
+    count = end - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (csum[end] - csum[start]) / count
+        std = np.sqrt(np.maximum((csum2[end] - csum2[start]) / count - mean * mean, 0.0))
+        z_sorted = np.where((count >= min_baseline) & (std > 1e-9), (x_sorted - mean) / std, np.nan)
+    zscore = np.full(n_obs, np.nan)
+    baseline = np.full(n_obs, np.nan)
+    zscore[sample_idx[order]] = z_sorted
+    baseline[sample_idx[order]] = np.where(count >= min_baseline, np.expm1(mean), np.nan)
+
+    # 영상별 마지막 관측 행에 최신 값이 모여 있음
+    last = np.flatnonzero(np.append(video_codes[1:] != video_codes[:-1], True))
+    first = np.concatenate(([0], last[:-1] + 1))
+    result = pd.DataFrame({
+        "video_id": np.asarray(video_ids)[video_codes[last]],
+        "channel_id": obs["channel_id"].to_numpy()[last],
+        "observations": last - first + 1,
+        "first_observed_at": pd.to_datetime(t[first], unit="s", utc=True),
+        "last_observed_at": pd.to_datetime(t[last], unit="s", utc=True),
+        "views": views[last].astype(np.int64),
+        "velocity": velocity[last],
+        "acceleration": acceleration[last],
+        "baseline_velocity": baseline[last],
+        "zscore": zscore[last],
+    })
+    result["breakout"] = (result["zscore"] >= z_threshold) & (result["velocity"] > 0)
+    return result.sort_values("zscore", ascending=False, na_position="last").reset_index(drop=True)
+
+
+def load_view_momentum(
+    video_ids: List[str] = None, channel_ids: List[str] = None, window_days: float = MOMENTUM_WINDOW_DAYS,
+    store: ViewObservationStore = VIEW_OBSERVATIONS, **options,
+) -> pd.DataFrame:
+    """
+    저장된 관측 이력으로 compute_view_momentum 실행
+    video_ids 만 주면 해당 영상의 채널 전체 관측을 불러와 기준선을 만듦
+    """
+    since = time.time() - 2 * window_days * 86400
+    if video_ids is not None and channel_ids is None:
+        own = store.load(video_ids=video_ids, since=since)
+        channel_ids = own["channel_id"].dropna().unique().tolist()
+        if not channel_ids:
+            return compute_view_momentum(own, window_days, **options)
+    result = compute_view_momentum(store.load(channel_ids=channel_ids, since=since), window_days, **options)
+    if video_ids is not None:
+        result = result[result["video_id"].isin(video_ids)].reset_index(drop=True)
+    return result
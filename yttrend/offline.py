@@ -0,0 +1,315 @@
+"""
+오프라인 녹화/재생 (RECORD / REPLAY)
+
+YT_API_MODE 로 API 전송 방식을 고름
+- live: 실제 API / record: 실제 API 응답을 fixture 로 저장 / replay: 저장된 fixture 로 응답
+  (record 모드에서는 디스크 캐시와 영상 메타데이터 저장소를 읽지 않고 모든 요청을 실제로 보냄
+   → 캐시 적중으로 fixture 가 빠지거나, videos.list 의 part 가 그 PC 의 저장소 상태에 따라 달라지지 않음)
+- synthetic: 네트워크 없이 가짜 채널·영상 코퍼스를 만들어 응답 (부하·성능 테스트용)
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List
+
+from googleapiclient.errors import HttpError
+
+from .cache import ApiResponseCache
+
+
+API_MODE = os.environ.get("YT_API_MODE", "live")
+OFFLINE_API_MODES = ("replay", "synthetic")
+FIXTURE_DIR = os.environ.get("YT_FIXTURE_DIR", "fixtures")
+
+# replay/synthetic 응답마다 넣을 인위적 지연 (실제 API 왕복 시간 흉내)
+OFFLINE_LATENCY_SEC = float(os.environ.get("YT_OFFLINE_LATENCY_MS", "0")) / 1000
+
+SYNTHETIC_CHANNELS = int(os.environ.get("YT_SYNTHETIC_CHANNELS", "200"))
+SYNTHETIC_VIDEOS_PER_CHANNEL = int(os.environ.get("YT_SYNTHETIC_VIDEOS_PER_CHANNEL", "500"))
+# 합성 조회수가 바뀌는 간격(초): 이 간격 안에서는 같은 응답(같은 ETag)을 돌려줌
+SYNTHETIC_TICK_SEC = int(os.environ.get("YT_SYNTHETIC_TICK_SEC", "3600"))
+
+
+def fixture_path(fixture_dir: str, endpoint: str, params: Dict) -> str:
+    """(endpoint, params) 에 해당하는 fixture 파일 경로 (디스크 캐시와 같은 키 사용)"""
+    return os.path.join(fixture_dir, endpoint, ApiResponseCache.make_key(endpoint, params) + ".json")
+
+
+def _not_found_error(message: str) -> HttpError:
+    """실제 API 의 404 응답과 같은 형태의 HttpError"""
+    import httplib2
+
+    body = json.dumps({"error": {"code": 404, "message": message}}).encode("utf-8")
+    return HttpError(httplib2.Response({"status": "404"}), body)
+
+
+def _not_modified_error() -> HttpError:
+    """If-None-Match 의 ETag 가 그대로일 때 실제 API 가 돌려주는 304 응답"""
+    import httplib2
+
+    return HttpError(httplib2.Response({"status": "304"}), b"")
+
+
+def _content_etag(payload) -> str:
+    return '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+
+
+class _OfflineRequest:
+    """
+    googleapiclient HttpRequest 처럼 execute() 로 응답을 돌려주는 요청 객체
+    응답/item 에 ETag 가 없으면 내용으로 만들어 붙이고, If-None-Match 가 같으면 304 HttpError
+    """
+
+    def __init__(self, respond, latency: float):
+        self._respond = respond
+        self._latency = latency
+        self.headers = {}
+
+    def execute(self) -> Dict:
+        if self._latency:
+            time.sleep(self._latency)
+        resp = self._respond()
+        for item in resp.get("items", []):
+            item.setdefault("etag", _content_etag(item))
+        resp.setdefault("etag", _content_etag(resp))
+        if self.headers.get("If-None-Match") == resp["etag"]:
+            raise _not_modified_error()
+        return resp
+
+
+class _OfflineResource:
+    def __init__(self, client: "OfflineYouTubeClient", endpoint: str):
+        self._client = client
+        self._endpoint = endpoint
+
+    def list(self, **params) -> _OfflineRequest:
+        return _OfflineRequest(lambda: self._client.respond(self._endpoint, params), self._client.latency)
+
+
+class OfflineYouTubeClient(ABC):
+    """
+    실제 클라이언트와 같은 인터페이스(youtube.search().list(...).execute())를 가진 오프라인 클라이언트
+    하위 클래스는 respond(endpoint, params) 로 응답 dict 를 만들어야 함
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def search(self): return _OfflineResource(self, "search")
+    def videos(self): return _OfflineResource(self, "videos")
+    def channels(self): return _OfflineResource(self, "channels")
+    def playlistItems(self): return _OfflineResource(self, "playlistItems")
+
+    @abstractmethod
+    def respond(self, endpoint: str, params: Dict) -> Dict:
+        """endpoint.list(**params) 의 응답 (오류는 실제 API 와 같은 HttpError 로)"""
+
+
+class ReplayYouTubeClient(OfflineYouTubeClient):
+    """record 모드로 저장해 둔 fixture 를 그대로 돌려줌 (없으면 404 HttpError)"""
+
+    def __init__(self, fixture_dir: str, latency: float = 0.0):
+        super().__init__(latency)
+        self.fixture_dir = fixture_dir
+
+    def respond(self, endpoint: str, params: Dict) -> Dict:
+        path = fixture_path(self.fixture_dir, endpoint, params)
+        if not os.path.exists(path):
+            raise _not_found_error(f"녹화된 응답이 없습니다: {endpoint} {params}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class _RecordingRequest:
+    def __init__(self, request, fixture_dir: str, endpoint: str, params: Dict):
+        self._request = request
+        self._fixture_dir = fixture_dir
+        self._endpoint = endpoint
+        self._params = params
+        self.headers = request.headers
+
+    def execute(self) -> Dict:
+        resp = self._request.execute()
+        path = fixture_path(self._fixture_dir, self._endpoint, self._params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(resp, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return resp
+
+
+class _RecordingResource:
+    def __init__(self, resource, fixture_dir: str, endpoint: str):
+        self._resource = resource
+        self._fixture_dir = fixture_dir
+        self._endpoint = endpoint
+
+    def list(self, **params) -> _RecordingRequest:
+        return _RecordingRequest(self._resource.list(**params), self._fixture_dir, self._endpoint, params)
+
+
+class RecordingYouTubeClient:
+    """실제 클라이언트를 감싸서 search/videos/channels/playlistItems 응답을 fixture 로 저장"""
+
+    # api_list / fetch_video_items 가 보고 디스크 캐시·메타데이터 저장소 조회를 건너뜀
+    records_fixtures = True
+
+    def __init__(self, client, fixture_dir: str):
+        self._client = client
+        self.fixture_dir = fixture_dir
+
+    def search(self): return _RecordingResource(self._client.search(), self.fixture_dir, "search")
+    def videos(self): return _RecordingResource(self._client.videos(), self.fixture_dir, "videos")
+    def channels(self): return _RecordingResource(self._client.channels(), self.fixture_dir, "channels")
+    def playlistItems(self): return _RecordingResource(self._client.playlistItems(), self.fixture_dir, "playlistItems")
+
+
+class SyntheticYouTubeClient(OfflineYouTubeClient):
+    """
+    네트워크 없이 큰 가짜 채널/영상 코퍼스를 흉내 내는 클라이언트
+    - 채널 ID: UCsynth00000 ~, 영상 ID: vs{채널번호 5자리}{영상번호 5자리}
+    - 같은 ID 는 항상 같은 제목/길이를 돌려줌 (ID 기반 시드)
+    - 조회수는 시간(tick_sec 단위로 끊은 clock())에 따라 게시 직후 빠르게, 이후 천천히 늘어남
+      일부(약 2%) 영상은 정해진 시점부터 2주 동안 급상승 (추세 감지 테스트용)
+    """
+
+    WORDS = [
+        "요리", "레시피", "김치찌개", "다이어트", "운동", "홈트", "브이로그", "여행", "제주도", "캠핑",
+        "먹방", "리뷰", "아이폰", "갤럭시", "언박싱", "주식", "부동산", "시니어", "건강", "쇼핑",
+        "cooking", "recipe", "travel", "review", "vlog", "korea", "seoul", "best", "top10", "shorts",
+    ]
+    ANCHOR = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    BREAKOUT_RATE = 0.02
+    BREAKOUT_DAYS = 14
+
+    def __init__(
+        self, n_channels: int, videos_per_channel: int, latency: float = 0.0,
+        tick_sec: int = SYNTHETIC_TICK_SEC, clock=time.time,
+    ):
+        super().__init__(latency)
+        self.n_channels = n_channels
+        self.videos_per_channel = videos_per_channel
+        self.tick_sec = tick_sec
+        self.clock = clock
+
+    def _now(self) -> datetime:
+        now = self.clock()
+        return datetime.fromtimestamp(now - now % self.tick_sec if self.tick_sec else now, timezone.utc)
+
+    @staticmethod
+    def channel_id(ch: int) -> str:
+        return f"UCsynth{ch:05d}"
+
+    @staticmethod
+    def video_id(ch: int, idx: int) -> str:
+        return f"vs{ch:05d}{idx:05d}"
+
+    def _parse_channel(self, channel_id: str):
+        if channel_id.startswith(("UCsynth", "UUsynth")) and channel_id[7:].isdigit():
+            ch = int(channel_id[7:])
+            if ch < self.n_channels:
+                return ch
+        return None
+
+    def _page(self, ids: List, params: Dict) -> Dict:
+        """pageToken(=시작 위치) / maxResults 로 자르고 nextPageToken 을 붙임"""
+        start = int(params.get("pageToken") or 0)
+        size = int(params.get("maxResults", 5))
+        resp = {"items": ids[start:start + size], "pageInfo": {"totalResults": len(ids)}}
+        if start + size < len(ids):
+            resp["nextPageToken"] = str(start + size)
+        return resp
+
+    def _channel_item(self, ch: int) -> Dict:
+        rng = random.Random(ch)
+        subscribers = int(rng.lognormvariate(10, 2))
+        return {
+            "id": self.channel_id(ch),
+            "snippet": {
+                "title": f"합성 채널 {ch}", "description": "synthetic channel",
+                "publishedAt": (self.ANCHOR - timedelta(days=365 * 3 + ch)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "thumbnails": {"medium": {"url": ""}},
+            },
+            "statistics": {
+                "subscriberCount": str(subscribers), "videoCount": str(self.videos_per_channel),
+                "viewCount": str(subscribers * rng.randint(50, 500)),
+            },
+            "contentDetails": {"relatedPlaylists": {"uploads": "UU" + self.channel_id(ch)[2:]}},
+        }
+
+    def _video_item(self, video_id: str):
+        if not (video_id.startswith("vs") and len(video_id) == 12 and video_id[2:].isdigit()):
+            return None
+        ch, idx = int(video_id[2:7]), int(video_id[7:])
+        if ch >= self.n_channels or idx >= self.videos_per_channel:
+            return None
+        rng = random.Random(zlib.crc32(video_id.encode()))
+        seconds = rng.choice([rng.randint(15, 59), rng.randint(60, 1800), rng.randint(1800, 10800)])
+        base_views = rng.lognormvariate(9, 2)
+        published = self.ANCHOR - timedelta(hours=idx * 37)
+        now = self._now()
+        age_days = max((now - published).total_seconds() / 86400, 0.0)
+        views = base_views * age_days / (age_days + 30)
+        if rng.random() < self.BREAKOUT_RATE:
+            breakout_at = published + timedelta(days=rng.uniform(0, 400))
+            boost_days = min(max((now - breakout_at).total_seconds() / 86400, 0.0), self.BREAKOUT_DAYS)
+            views += base_views * rng.uniform(2, 10) * boost_days / self.BREAKOUT_DAYS
+        views = int(views)
+        return {
+            "id": video_id,
+            "snippet": {
+                "title": " ".join(rng.choices(self.WORDS, k=rng.randint(3, 8))) + f" #{idx}",
+                "description": "synthetic video", "channelTitle": f"합성 채널 {ch}", "channelId": self.channel_id(ch),
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "thumbnails": {"medium": {"url": ""}},
+            },
+            "contentDetails": {"duration": f"PT{seconds // 3600}H{seconds % 3600 // 60}M{seconds % 60}S"},
+            "statistics": {
+                "viewCount": str(views), "likeCount": str(views // 50), "commentCount": str(views // 500),
+            },
+        }
+
+    @staticmethod
+    def _select_parts(item: Dict, params: Dict) -> Dict:
+        """실제 API 처럼 요청한 part 만 남김"""
+        parts = set(str(params.get("part", "")).split(","))
+        return {k: v for k, v in item.items() if k == "id" or k in parts}
+
+    def respond(self, endpoint: str, params: Dict) -> Dict:
+        if endpoint == "channels":
+            chs = [self._parse_channel(c) for c in str(params.get("id", "")).split(",")]
+            return {"items": [self._select_parts(self._channel_item(ch), params) for ch in chs if ch is not None]}
+
+        if endpoint == "videos":
+            items = [self._video_item(v) for v in str(params.get("id", "")).split(",")]
+            return {"items": [self._select_parts(item, params) for item in items if item is not None]}
+
+        if endpoint == "playlistItems":
+            ch = self._parse_channel(params.get("playlistId", ""))
+            if ch is None:
+                raise _not_found_error("playlistNotFound")
+            ids = [{"contentDetails": {"videoId": self.video_id(ch, i)}} for i in range(self.videos_per_channel)]
+            return self._page(ids, params)
+
+        if endpoint == "search":
+            if params.get("channelId"):
+                ch = self._parse_channel(params["channelId"])
+                ids = [] if ch is None else [self.video_id(ch, i) for i in range(self.videos_per_channel)]
+            else:
+                # 키워드마다 고정된 영상 500개를 코퍼스 전체에서 골라 줌
+                rng = random.Random(zlib.crc32(str(params.get("q", "")).encode()))
+                ids = [
+                    self.video_id(rng.randrange(self.n_channels), rng.randrange(self.videos_per_channel))
+                    for _ in range(500)
+                ]
+            return self._page([{"id": {"kind": "youtube#video", "videoId": v}} for v in ids], params)
+
+        raise _not_found_error(f"지원하지 않는 엔드포인트: {endpoint}")
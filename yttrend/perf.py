@@ -0,0 +1,166 @@
+"""
+구간별 실행 시간 측정 (PERF SPANS)
+
+rerun/배치 실행마다 with recording(PerfRecorder(...)) 블록 안에서 timed / perf_span 으로 감싼 구간이 기록됨
+"""
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List
+
+import pandas as pd
+
+
+# 구간별 측정 결과를 JSON-lines 로 남길 파일 (비워 두면 기록하지 않음)
+PERF_LOG_FILE = os.environ.get("YT_PERF_LOG", "")
+
+
+class PerfSpan:
+    """측정 구간 하나 (하위 구간에서 일어난 API 호출/캐시 적중/쿼터 사용량도 함께 누적)"""
+
+    __slots__ = ("name", "parent", "depth", "thread", "start", "duration", "cached", "counters", "attrs")
+
+    def __init__(self, name: str, parent: "PerfSpan", cached: bool, attrs: Dict):
+        self.name = name
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.cached = cached
+        self.counters = {"api_calls": 0, "disk_hits": 0, "quota_units": 0}
+        self.attrs = attrs
+
+    @property
+    def cache(self):
+        """st.cache_data 구간만: API 호출이 있었으면 miss, 디스크 캐시만 썼으면 disk, 메모리 캐시에서 바로 나왔으면 memory"""
+        if not self.cached:
+            return None
+        if self.counters["api_calls"]:
+            return "miss"
+        if self.counters["disk_hits"]:
+            return "disk"
+        return "memory"
+
+
+class PerfRecorder:
+    """한 번의 rerun 동안 기록된 구간 목록 (워커 스레드에서도 함께 기록)"""
+
+    def __init__(self, page: str):
+        self.run_id = hashlib.sha1(f"{time.time()}-{os.getpid()}-{id(self)}".encode()).hexdigest()[:12]
+        self.page = page
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans: List[PerfSpan] = []
+        self.totals = {"api_calls": 0, "disk_hits": 0, "quota_units": 0}
+        self._lock = threading.Lock()
+
+    def add(self, span: PerfSpan):
+        with self._lock:
+            self.spans.append(span)
+
+    def count(self, span: PerfSpan, key: str, n: int):
+        with self._lock:
+            self.totals[key] += n
+            while span is not None:
+                span.counters[key] += n
+                span = span.parent
+
+    def to_records(self) -> List[Dict]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [
+            {
+                "run_id": self.run_id, "page": self.page, "ts": self.started_at,
+                "name": s.name, "depth": s.depth, "thread": s.thread,
+                "start_ms": round((s.start - self.started) * 1000, 3), "duration_ms": round(s.duration * 1000, 3),
+                "cache": s.cache, **s.counters, **s.attrs,
+            }
+            for s in spans
+        ]
+
+    def summary(self) -> pd.DataFrame:
+        """구간 이름별 호출 수/시간/캐시 적중 합계"""
+        records = self.to_records()
+        if not records:
+            return pd.DataFrame()
+        df = pd.DataFrame(records)
+        df["cache"] = df["cache"].fillna("-")
+        summary = df.groupby("name", sort=False).agg(
+            calls=("name", "size"), total_ms=("duration_ms", "sum"), max_ms=("duration_ms", "max"),
+            api_calls=("api_calls", "sum"), disk_hits=("disk_hits", "sum"), quota_units=("quota_units", "sum"),
+        )
+        cache = pd.crosstab(df["name"], df["cache"]).drop(columns="-", errors="ignore")
+        summary["cache"] = [
+            " / ".join(f"{k} {v}" for k, v in cache.loc[name].items() if v) if name in cache.index else ""
+            for name in summary.index
+        ]
+        return summary.sort_values("total_ms", ascending=False).reset_index()
+
+    def export_jsonl(self, path: str):
+        with open(path, "a", encoding="utf-8") as f:
+            for record in self.to_records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+_perf_recorder: contextvars.ContextVar = contextvars.ContextVar("perf_recorder", default=None)
+_perf_span: contextvars.ContextVar = contextvars.ContextVar("perf_span", default=None)
+
+
+@contextmanager
+def recording(recorder: PerfRecorder):
+    """with 블록 동안 recorder 를 현재 측정 대상으로 올림 (블록에서 제출한 워커 스레드도 contextvars 로 같은 recorder 에 기록)"""
+    token = _perf_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _perf_recorder.reset(token)
+
+
+@contextmanager
+def perf_span(name: str, cached: bool = False, **attrs):
+    """측정 중인 rerun 이 있으면 with 블록의 실행 시간을 구간으로 기록 (없으면 아무것도 하지 않음)"""
+    recorder = _perf_recorder.get()
+    if recorder is None:
+        yield None
+        return
+    span = PerfSpan(name, _perf_span.get(), cached, attrs)
+    token = _perf_span.set(span)
+    try:
+        yield span
+    finally:
+        span.duration = time.perf_counter() - span.start
+        _perf_span.reset(token)
+        recorder.add(span)
+
+
+def perf_count(key: str, n: int = 1):
+    """현재 구간과 상위 구간들에 api_calls / disk_hits / quota_units 를 더함"""
+    recorder = _perf_recorder.get()
+    if recorder is not None:
+        recorder.count(_perf_span.get(), key, n)
+
+
+def timed(name: str = None, cached: bool = False):
+    """
+    함수 호출 전체를 구간으로 기록하는 데코레이터
+    st.cache_data 함수에는 cached=True 로 바깥에 씌워서, 하위 API/디스크 캐시 기록이 없으면 메모리 캐시 적중으로 표시
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with perf_span(span_name, cached=cached):
+                return fn(*args, **kwargs)
+
+        if hasattr(fn, "clear"):
+            wrapper.clear = fn.clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,156 @@
+"""쿼터 관리 (QUOTA LEDGER): 실제 API 호출 비용 기록, 하루 예산 확인, 실행 전 비용 추정"""
+import contextvars
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+from zoneinfo import ZoneInfo
+
+from .utils import open_sqlite
+
+
+# 엔드포인트별 호출 1회당 쿼터 비용 (YouTube Data API v3 기준)
+QUOTA_COST = {"search": 100, "videos": 1, "channels": 1, "playlistItems": 1}
+
+# videos.list 한 번에 조회할 수 있는 최대 ID 수
+VIDEOS_LIST_BATCH = 50
+
+# 하루 사용 예산 (기본값은 프로젝트 기본 할당량 10,000 units)
+QUOTA_DAILY_BUDGET = int(os.environ.get("YT_QUOTA_BUDGET", "10000"))
+QUOTA_DB = os.environ.get("YT_QUOTA_DB", "quota_ledger.sqlite3")
+
+# YouTube 쿼터는 태평양 시간 자정에 초기화됨
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaBudgetExceeded(Exception):
+    """하루 예산을 넘는 API 호출을 거부할 때 발생"""
+
+
+class QuotaLedger:
+    """
+    실제로 나간 API 호출의 쿼터 비용을 날짜/엔드포인트별로 기록하는 장부
+    - 호출 직전에 charge() 로 예산을 확인하고 차감 (여러 프로세스가 함께 써도 합계가 맞도록 트랜잭션 처리)
+    - 캐시로 처리된 요청은 기록하지 않음
+    """
+
+    def __init__(self, path: str, budget: int):
+        self.path = path
+        self.budget = budget
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    day TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    units INTEGER NOT NULL,
+                    PRIMARY KEY (day, endpoint)
+                )
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(QUOTA_TZ).strftime("%Y-%m-%d")
+
+    def charge(self, endpoint: str, calls: int = 1):
+        """예산 안이면 비용을 기록, 넘으면 QuotaBudgetExceeded"""
+        units = QUOTA_COST.get(endpoint, 1) * calls
+        day = self.today()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            used = conn.execute("SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (day,)).fetchone()[0]
+            if used + units > self.budget:
+                raise QuotaBudgetExceeded(
+                    f"오늘 쿼터 예산({self.budget:,} units) 중 {used:,} units 사용, {endpoint} 호출({units} units) 불가"
+                )
+            conn.execute(
+                """
+                INSERT INTO quota_usage (day, endpoint, calls, units) VALUES (?, ?, ?, ?)
+                ON CONFLICT(day, endpoint) DO UPDATE SET
+                    calls = calls + excluded.calls, units = units + excluded.units
+                """,
+                (day, endpoint, calls, units),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def usage_today(self) -> Dict[str, int]:
+        """{endpoint: 오늘 사용 units}"""
+        try:
+            rows = self._conn().execute(
+                "SELECT endpoint, units FROM quota_usage WHERE day = ?", (self.today(),)
+            ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return dict(rows)
+
+    def used_today(self) -> int:
+        return sum(self.usage_today().values())
+
+    def remaining(self) -> int:
+        return max(self.budget - self.used_today(), 0)
+
+
+QUOTA_LEDGER = QuotaLedger(QUOTA_DB, QUOTA_DAILY_BUDGET)
+
+# True 인 동안에는 API 를 호출하지 않고 (만료된 것 포함) 캐시만 사용
+_cache_only = contextvars.ContextVar("cache_only", default=False)
+
+
+@contextmanager
+def cache_only_mode():
+    """with 블록 안에서는 새 API 호출 없이 (만료된 것 포함) 캐시된 응답만 사용"""
+    token = _cache_only.set(True)
+    try:
+        yield
+    finally:
+        _cache_only.reset(token)
+
+
+def estimate_quota_cost(search_calls: int = 0, video_ids: int = 0, channel_calls: int = 0, playlist_pages: int = 0) -> int:
+    """계획된 호출 수로 예상 쿼터 비용 계산 (캐시 적중은 고려하지 않은 최대치)"""
+    return (
+        search_calls * QUOTA_COST["search"]
+        + math.ceil(video_ids / VIDEOS_LIST_BATCH) * QUOTA_COST["videos"]
+        + channel_calls * QUOTA_COST["channels"]
+        + playlist_pages * QUOTA_COST["playlistItems"]
+    )
+
+
+def estimate_keyword_run(max_results: int) -> int:
+    return estimate_quota_cost(search_calls=math.ceil(max_results / VIDEOS_LIST_BATCH), video_ids=max_results)
+
+
+def estimate_multi_keyword_run(n_keywords: int, max_results: int) -> int:
+    """여러 키워드를 한 번에 수집할 때 (videos.list 는 모든 키워드의 ID 를 모아 50개 배치로 조회)"""
+    return estimate_quota_cost(
+        search_calls=n_keywords * math.ceil(max_results / VIDEOS_LIST_BATCH), video_ids=n_keywords * max_results,
+    )
+
+
+def estimate_channel_run(video_limit: int) -> int:
+    return estimate_quota_cost(search_calls=1, video_ids=video_limit, channel_calls=1)
+
+
+def estimate_comparison_run(n_channels: int, video_limit: int) -> int:
+    return estimate_quota_cost(search_calls=n_channels, video_ids=n_channels * video_limit, channel_calls=n_channels)
+
+
+def estimate_deep_crawl(max_videos: int) -> int:
+    pages = math.ceil(max_videos / VIDEOS_LIST_BATCH)
+    return estimate_quota_cost(channel_calls=1, playlist_pages=pages) + pages * QUOTA_COST["videos"]
@@ -0,0 +1,353 @@
+"""제목 토큰화와 가중치 기반 키워드 추출"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .perf import timed
+
+
+# 한글, 영어, 숫자가 아닌 문자 = 토큰 구분자
+TOKEN_SEPARATOR_PATTERN = r"[^가-힣a-zA-Z0-9]+"
+
+DEFAULT_STOPWORDS = frozenset({
+    "영상", "official", "video", "the", "and", "for", "with", "full", "ver",
+    "episode", "ep", "live", "tv", "show", "channel", "shorts", "공식", 
+    "하이라이트", "클립", "무대", "최신", "today", "day", "in", "of", "a", 
+    "이번주", "다시보기", "모음", "총정리", "최고", "오늘", "지금", "바로",
+    "story", "log", "vlog", "asmr", "tip", "꿀팁", "방법", "하는법",
+    "저장", "구독", "좋아요", "댓글", "알림", "설정", "하나", "두개"
+})
+
+# 사용자 불용어 파일 (한 줄에 하나, '#' 뒤는 주석)
+STOPWORDS_FILE = os.environ.get("YT_STOPWORDS_FILE", "stopwords.txt")
+
+
+def load_stopwords(path: str = STOPWORDS_FILE) -> frozenset:
+    """기본 불용어 + 사용자 불용어 파일"""
+    words = set(DEFAULT_STOPWORDS)
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                word = line.split("#", 1)[0].strip().lower()
+                if word:
+                    words.add(word)
+    return frozenset(words)
+
+
+STOPWORDS = load_stopwords()
+
+
+# ----------------------------
+# 한국어 조사/어미 떼기
+# ----------------------------
+
+# 받침 유무에 상관없이 붙는 조사/어미 (긴 것부터 맞춰지도록 정규식에서 가장 짧은 어간을 고름)
+PARTICLES_ANY = [
+    "에서는", "에서도", "에서의", "에서", "에게서", "에게는", "에게", "한테서", "한테", "께서", "까지", "부터",
+    "처럼", "보다", "마다", "조차", "밖에", "에는", "에도", "에의", "의", "에", "도", "만",
+    "들은", "들이", "들을", "들의", "들과", "들도", "들",
+    "하는법", "하는방법", "하기", "하는", "하고", "하며", "해서", "했던", "했다", "하다", "합니다", "해요",
+    "했어요", "하세요", "되는", "되기", "입니다", "이에요", "예요",
+]
+# 받침 없는 말 뒤에만 붙는 조사
+PARTICLES_AFTER_VOWEL = ["를", "는", "가", "와", "와의", "와는", "로", "로는", "로도", "로의", "랑", "라는", "란", "야"]
+# 받침 있는 말 뒤에만 붙는 조사 ('로' 계열은 ㄹ 받침 뒤에도 붙음)
+PARTICLES_AFTER_CONSONANT = ["을", "은", "이", "과", "과의", "과는", "으로", "으로는", "으로도", "으로의", "이랑", "이라는", "이란", "이나"]
+PARTICLES_AFTER_RIEUL = ["로", "로는", "로도", "로의"]
+
+# 조사처럼 보이는 글자로 끝나지만 떼면 안 되는 단어 (토큰이 이 단어로 끝나면 그대로 둠, "여름물놀이" 도 포함)
+# 한 글자 조사(이/가/로/도/의/과/만)는 앞 어간이 두 글자 이상이면 떼므로, 그 글자로 끝나는 흔한 명사/동사를 모아 둠
+PARTICLE_PROTECTED_ENDINGS = [
+    # 이
+    "고양이", "어린이", "원숭이", "호랑이", "놀이", "떡볶이", "손잡이", "걸이", "길이", "높이", "깊이", "넓이", "먹이",
+    "해돋이", "벌이", "털이",
+    # 가
+    "지나가", "들어가", "올라가", "내려가", "돌아가", "다가가", "따라가", "건너가",
+    # 로
+    "스스로", "마이크로", "히어로", "레트로", "매크로", "메트로", "제로", "유로", "도로",
+    # 도
+    "제주도", "한반도", "울릉도", "거제도", "강화도", "경기도", "강원도", "충청도", "전라도", "경상도",
+    "아보카도", "토네이도", "콜로라도", "포도",
+    # 의 / 과 / 만
+    "주의", "강의", "회의", "정의", "논의", "합의", "예의", "동의", "효과", "결과", "성과", "사과", "치과",
+    "백만", "천만",
+]
+# 끝부분만 같으면 흔히 조사가 붙은 말이라 단어 전체가 같을 때만 지키는 것 ("하나가" 는 "하나" 로)
+PARTICLE_PROTECTED_WORDS = ["나가", "가가", "서로", "새로"]
+
+# 동사/형용사 어간 끝 글자 — 이 글자 뒤의 는/은/로 등은 조사가 아니라 어미라서 떼지 않음 ("잘하는" 은 그대로)
+# ('으' 는 '으로' 의 일부라 어간으로 남기지 않음: "부산으로" → "부산")
+PARTICLE_VERB_STEM_ENDINGS = "하되해돼했됐한된할될으"
+
+_HANGUL_NO_BATCHIM = "".join(
+    chr(0xAC00 + 28 * i) for i in range(399) if chr(0xAC00 + 28 * i) not in PARTICLE_VERB_STEM_ENDINGS
+)
+_HANGUL_BATCHIM = "".join(
+    chr(c) for c in range(0xAC00, 0xD7A4) if (c - 0xAC00) % 28 and chr(c) not in PARTICLE_VERB_STEM_ENDINGS
+)
+_HANGUL_RIEUL = "".join(
+    chr(c) for c in range(0xAC00, 0xD7A4) if (c - 0xAC00) % 28 == 8 and chr(c) not in PARTICLE_VERB_STEM_ENDINGS
+)
+
+
+def _particle_alternative(stem_last: str, particles) -> str:
+    # 어간은 두 글자 이상, 마지막 글자는 stem_last 중 하나
+    return f"^([가-힣a-z0-9]+?{stem_last})(?:{'|'.join(sorted(particles, key=len, reverse=True))})$"
+
+
+PARTICLE_PATTERN = "|".join([
+    _particle_alternative("[가-힣a-z0-9]", PARTICLES_ANY),
+    _particle_alternative(f"[{_HANGUL_NO_BATCHIM}]", PARTICLES_AFTER_VOWEL),
+    _particle_alternative(f"[{_HANGUL_BATCHIM}]", PARTICLES_AFTER_CONSONANT),
+    _particle_alternative(f"[{_HANGUL_RIEUL}]", PARTICLES_AFTER_RIEUL),
+])
+PARTICLE_PROTECTED_PATTERN = (
+    f"(?:{'|'.join(PARTICLE_PROTECTED_ENDINGS)})$|^(?:{'|'.join(PARTICLE_PROTECTED_WORDS)})$"
+)
+
+
+def strip_particles(tokens: pd.Series) -> pd.Series:
+    """
+    토큰 끝의 조사/어미를 한 번 떼어냄 ("요리를", "요리의", "요리하는" → "요리")
+    - 남는 어간이 두 글자 이상일 때만
+    - 을/를, 은/는, 이/가, 과/와, 으로/로 는 앞 글자의 받침 유무가 맞을 때만 ("전문가" 는 그대로)
+    - 동사 어간(PARTICLE_VERB_STEM_ENDINGS) 뒤의 어미는 그대로 ("잘하는", "안되는")
+    - PARTICLE_PROTECTED_ENDINGS 로 끝나는 단어, PARTICLE_PROTECTED_WORDS 와 같은 단어는 그대로 ("물놀이", "스스로")
+    """
+    stripped = tokens.str.replace(PARTICLE_PATTERN, r"\1\2\3\4", regex=True)
+    protected = tokens.str.contains(PARTICLE_PROTECTED_PATTERN, regex=True).to_numpy(dtype=bool, na_value=False)
+    return stripped.where(~protected, tokens)
+
+
+def drop_short_and_stopwords(stopwords: frozenset = STOPWORDS, min_len: int = 2):
+    """2글자 미만 토큰과 불용어를 빈 문자열로 바꾸는 단계 (빈 문자열은 파이프라인이 버림)"""
+    def stage(tokens: pd.Series) -> pd.Series:
+        keep = ((tokens.str.len() >= min_len) & ~tokens.isin(stopwords)).to_numpy(dtype=bool, na_value=False)
+        return tokens.where(keep, "")
+    return stage
+
+
+# ----------------------------
+# 토큰화 파이프라인
+# ----------------------------
+
+# 토큰화 규칙이 바뀔 때 올려서, 저장된 토큰(키워드 색인 등)을 다시 만들게 함
+TOKENIZER_VERSION = 4
+
+
+class TokenizerPipeline:
+    """
+    제목 Series → 제목별 토큰 배열 Series (list<string>) 파이프라인
+    1) 소문자 변환 후 구분자(한글/영어/숫자 외 문자)로 분리 — 전체 제목을 pyarrow 로 한 번에
+    2) token_stages 를 순서대로 적용 — 각 단계는 토큰 Series → 같은 길이 Series (빈 문자열은 버림),
+       출현 순서가 아니라 고유 토큰 단위로 한 번씩만 계산
+    3) 제목별 결과는 memo 에 저장해 두고 같은 제목은 다시 토큰화하지 않음 (max_memo 개를 넘으면 비움)
+    """
+
+    def __init__(self, token_stages, max_memo: int = 100_000):
+        self.token_stages = list(token_stages)
+        self.max_memo = max_memo
+        self._memo = {}
+
+    def _tokenize_titles(self, titles: pd.Series) -> pa.LargeListArray:
+        # 소문자 변환은 파이썬 str.lower 로 (pyarrow 와 일부 유니코드 처리 차이가 있음)
+        lowered = titles.str.lower().astype("large_string[pyarrow]")
+        parts = lowered.str.split(TOKEN_SEPARATOR_PATTERN, regex=True)
+        tokens = parts.list.flatten()
+        rows = np.repeat(np.arange(len(parts)), parts.list.len().fillna(0).to_numpy(dtype=np.int64))
+
+        codes, vocab = pd.factorize(tokens, sort=False)
+        vocab = pd.Series(vocab, dtype="large_string[pyarrow]")
+        for stage in self.token_stages:
+            vocab = stage(vocab)
+        vocab = vocab.fillna("")
+        mask = (vocab.str.len() > 0).to_numpy(dtype=bool)[codes] & (codes >= 0)
+
+        # 남은 토큰으로 제목별 리스트를 다시 구성
+        counts = np.bincount(rows[mask], minlength=len(parts))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        values = pa.array(vocab.to_numpy(dtype=object)[codes[mask]], type=pa.large_string())
+        return pa.LargeListArray.from_arrays(pa.array(offsets), values)
+
+    def __call__(self, titles: pd.Series) -> pd.Series:
+        codes, unique_titles = pd.factorize(titles.astype(object).fillna(""), sort=False)
+        memo = self._memo
+        cached = [memo.get(t) for t in unique_titles]
+        hit_idx = [i for i, c in enumerate(cached) if c is not None]
+        miss_idx = [i for i, c in enumerate(cached) if c is None]
+
+        list_type = pa.large_list(pa.large_string())
+        hits = pa.array([cached[i] for i in hit_idx], type=list_type)
+        if miss_idx:
+            misses = self._tokenize_titles(pd.Series(np.asarray(unique_titles, dtype=object)[miss_idx], dtype=object))
+            if len(memo) + len(miss_idx) > self.max_memo:
+                memo.clear()
+            memo.update(zip(np.asarray(unique_titles, dtype=object)[miss_idx], map(tuple, misses.to_pylist())))
+        else:
+            misses = pa.array([], type=list_type)
+
+        # [적중분, 새로 토큰화한 것] 순서로 이어 붙인 뒤 원래 제목 순서로 다시 뽑음
+        position = np.empty(len(unique_titles), dtype=np.int64)
+        position[hit_idx] = np.arange(len(hit_idx))
+        position[miss_idx] = len(hit_idx) + np.arange(len(miss_idx))
+        combined = pa.concat_arrays([hits, misses]) if len(hits) else misses
+        token_lists = combined.take(pa.array(position[codes]))
+        return pd.Series(pd.arrays.ArrowExtensionArray(token_lists), index=titles.index, name="title_tokens")
+
+    def clear_memo(self):
+        self._memo.clear()
+
+
+def korean_pipeline(stopwords: frozenset = STOPWORDS) -> TokenizerPipeline:
+    """기본 파이프라인: 조사/어미 떼기 → 짧은 토큰/불용어 제거"""
+    return TokenizerPipeline([strip_particles, drop_short_and_stopwords(stopwords)])
+
+
+DEFAULT_PIPELINE = korean_pipeline()
+
+
+def tokenize(titles: pd.Series, stopwords: frozenset = STOPWORDS, pipeline: TokenizerPipeline = None) -> pd.Series:
+    """
+    제목 Series → 제목별 토큰 배열 Series (소문자, 조사/어미 제거, 2글자 이상, 불용어 제외)
+    - 결과는 list<string> 타입이라 .list.flatten() / .list.len() 으로 바로 펼칠 수 있음
+    - pipeline 을 주면 그 파이프라인으로, 불용어만 바꾸면 같은 단계로 새 파이프라인을 만들어 토큰화
+    """
+    if pipeline is None:
+        pipeline = DEFAULT_PIPELINE if stopwords is STOPWORDS else korean_pipeline(stopwords)
+    return pipeline(titles)
+
+
+# --- UPGRADE: 4단계 - 성과 가중치 기반 키워드 추출 함수 ---
+
+@timed()
+def extract_keywords_with_weight(df: pd.DataFrame, top_n: int = 30) -> pd.DataFrame:
+    """
+    UPGRADE: 조회수(views)를 가중치로 사용하여 키워드 점수를 매기고 추출
+    - 영상 수집 시 만들어 둔 title_tokens 컬럼이 있으면 재사용, 없으면 여기서 토큰화
+    """
+    if df.empty:
+        return pd.DataFrame(columns=["keyword", "score"])
+
+    token_lists = df["title_tokens"] if "title_tokens" in df.columns else tokenize(df["title"])
+    tokens = token_lists.list.flatten()
+    if tokens.empty:
+        return pd.DataFrame(columns=["keyword", "score"])
+    rows = np.repeat(np.arange(len(token_lists)), token_lists.list.len().fillna(0).to_numpy(dtype=np.int64))
+
+    # 조회수의 제곱근을 가중치로 사용
+    weights = df["views"].to_numpy(dtype=float) ** 0.5
+
+    # 점수 합산: 등장 순서대로 번호를 매기고 bincount 로 합산 (Counter 와 같은 순서로 더해짐)
+    codes, keywords = pd.factorize(tokens, sort=False)
+    scores = np.bincount(codes, weights=weights[rows], minlength=len(keywords))
+
+    # 점수 내림차순, 동점이면 먼저 등장한 키워드 우선 (Counter.most_common 과 동일)
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    data = pd.DataFrame({"keyword": np.asarray(keywords)[order], "score": scores[order]})
+    data["score"] = data["score"].round(0).astype(int)
+    
+    return data
+
+
+# ----------------------------
+# n-gram 구문 추출
+# ----------------------------
+
+PHRASE_COLUMNS = ["phrase", "n", "count", "pmi", "score"]
+
+
+def _ngram_codes(codes: np.ndarray, rows: np.ndarray, n: int, vocab_size: int):
+    """같은 제목 안에서 연속한 n 개 토큰 → (n-gram 키, 시작 위치); 키는 토큰 번호를 vocab_size 진법으로 합친 정수"""
+    if len(codes) < n:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    start = np.flatnonzero(rows[:len(rows) - n + 1] == rows[n - 1:])
+    keys = codes[start].astype(np.int64)
+    for k in range(1, n):
+        keys = keys * vocab_size + codes[start + k]
+    return keys, start
+
+
+@timed()
+def extract_phrases(
+    df: pd.DataFrame, top_n: int = 30, max_n: int = 3, min_count: int = 3, min_pmi: float = 2.0,
+) -> pd.DataFrame:
+    """
+    제목에서 자주 붙어 나오는 2~3단어 구문 추출 (PMI 기준)
+    - PMI = 구문을 앞/뒤로 나누는 경우마다 log2( p(구문) / (p(앞) · p(뒤)) ) 중 최솟값 (확률은 같은 길이 n-gram 기준)
+    - count >= min_count 이고 PMI >= min_pmi 인 구문만, 점수(조회수 제곱근 가중 합) 내림차순
+    - 항상 더 긴 구문의 일부로만 나오는 구문은 긴 구문만 남김
+    - 토큰 번호를 정수 키로 합쳐 np.unique 한 번으로 세므로 제목 수만큼 파이썬 루프를 돌지 않음
+    """
+    if df.empty:
+        return pd.DataFrame(columns=PHRASE_COLUMNS)
+
+    token_lists = df["title_tokens"] if "title_tokens" in df.columns else tokenize(df["title"])
+    tokens = token_lists.list.flatten()
+    if tokens.empty:
+        return pd.DataFrame(columns=PHRASE_COLUMNS)
+    rows = np.repeat(np.arange(len(token_lists)), token_lists.list.len().fillna(0).to_numpy(dtype=np.int64))
+    codes, vocab = pd.factorize(tokens, sort=False)
+    vocab = np.asarray(vocab, dtype=object)
+    vocab_size = len(vocab)
+    if vocab_size ** max_n >= 2 ** 62:
+        max_n = 2
+    weights = df["views"].to_numpy(dtype=float) ** 0.5
+
+    # 길이별 n-gram 키/등장 수/확률 (n=1 은 단어)
+    grams = {1: (np.arange(vocab_size, dtype=np.int64), np.bincount(codes, minlength=vocab_size), None, None)}
+    for n in range(2, max_n + 1):
+        keys, start = _ngram_codes(codes, rows, n, vocab_size)
+        if len(keys) == 0:
+            break
+        unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        grams[n] = (unique_keys, counts, inverse, start)
+
+    def log_p(n: int, keys: np.ndarray) -> np.ndarray:
+        unique_keys, counts = grams[n][0], grams[n][1]
+        return np.log2(counts[np.searchsorted(unique_keys, keys)] / counts.sum())
+
+    frames = []
+    for n in range(2, max(grams) + 1):
+        unique_keys, counts, inverse, start = grams[n]
+        keep = counts >= min_count
+        if not keep.any():
+            continue
+        scores = np.bincount(inverse, weights=weights[rows[start]], minlength=len(unique_keys))
+        kept = unique_keys[keep]
+
+        # PMI 는 앞/뒤로 나누는 모든 경우 중 가장 작은 값 (강한 2단어 구문에 아무 단어나 붙은 3단어는 걸러짐)
+        pmi = np.full(len(kept), np.inf)
+        for k in range(1, n):
+            left, right = kept // vocab_size ** (n - k), kept % vocab_size ** (n - k)
+            pmi = np.minimum(pmi, log_p(n, kept) - log_p(k, left) - log_p(n - k, right))
+
+        # 키 → 단어 번호 (뒤에서부터 vocab_size 로 나눠 복원)
+        parts, rest = [], kept
+        for _ in range(n):
+            parts.append(rest % vocab_size)
+            rest = rest // vocab_size
+        parts.reverse()
+        frames.append(pd.DataFrame({
+            "phrase": [" ".join(words) for words in zip(*(vocab[p] for p in parts))],
+            "n": n, "count": counts[keep], "pmi": pmi, "score": scores[keep],
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=PHRASE_COLUMNS)
+    data = pd.concat(frames, ignore_index=True)
+    data = data[data["pmi"] >= min_pmi]
+
+    # 항상 더 긴 구문 안에서만 나오는 짧은 구문은 뺌 ("김치찌개 황금" ⊂ "김치찌개 황금 레시피")
+    longer = data[data["n"] > 2]
+    covered = {}
+    for phrase, count in zip(longer["phrase"], longer["count"]):
+        words = phrase.split(" ")
+        for sub in (" ".join(words[:-1]), " ".join(words[1:])):
+            covered[sub] = max(covered.get(sub, 0), count)
+    data = data[data["count"].to_numpy() > data["phrase"].map(covered).fillna(0).to_numpy()]
+    data = data.sort_values("score", ascending=False, kind="stable").head(top_n)
+    data["score"] = data["score"].round(0).astype(int)
+    data["pmi"] = data["pmi"].round(2)
+    return data.reset_index(drop=True)
@@ -0,0 +1,79 @@
+"""공용 유틸 함수 (ISO8601 길이 파싱, 채널 ID 추출, 숫자 포맷, SQLite 연결)"""
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+
+# 일(D) 단위가 붙는 라이브 스트림 길이(예: 'P1DT2H')까지 처리
+DURATION_PATTERN = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+DURATION_UNIT_SECONDS = np.array([86400, 3600, 60, 1], dtype=np.int64)
+
+
+def parse_iso_duration(duration: str) -> int:
+    """ISO8601 duration(예: 'PT15M33S', 'P1DT2H') → 초 단위 정수로 변환"""
+    if not duration:
+        return 0
+    match = DURATION_PATTERN.match(duration)
+    if not match:
+        return 0
+    days, hours, mins, secs = (int(g) if g else 0 for g in match.groups())
+    return days * 86400 + hours * 3600 + mins * 60 + secs
+
+
+def parse_iso_duration_series(durations: pd.Series) -> pd.Series:
+    """
+    duration 컬럼 전체 → 초 단위 정수 Series (parse_iso_duration 의 컬럼 버전)
+    영상 길이는 겹치는 값이 많으므로 고유값만 str.extract 로 한 번에 파싱한 뒤 원래 위치로 펼침
+    """
+    codes, uniques = pd.factorize(durations)
+    parts = pd.Series(np.asarray(uniques, dtype=object)).str.extract(DURATION_PATTERN)
+    unique_seconds = (
+        parts.fillna("0").replace("", "0").astype(np.int64).to_numpy().reshape(-1, 4) @ DURATION_UNIT_SECONDS
+    )
+    seconds = np.zeros(len(codes), dtype=np.int64)
+    found = codes >= 0  # 결측값(None)은 0초
+    seconds[found] = unique_seconds[codes[found]]
+    return pd.Series(seconds, index=durations.index, name="duration_sec")
+
+
+def weekday_kr_from_ts(ts: pd.Timestamp) -> str:
+    """요일을 한국어 한 글자로 반환"""
+    mapping = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
+    return mapping.get(ts.weekday(), "")
+
+
+def extract_channel_id(raw: str) -> str:
+    """사용자가 입력한 값에서 channelId 추출"""
+    raw = raw.strip()
+    if "youtube.com/channel/" in raw:
+        return raw.split("youtube.com/channel/")[-1].split("/")[0].split("?")[0]
+    if "youtube.com/" in raw:
+        path = raw.split("youtube.com/")[-1]
+        return path.split("/")[-1].split("?")[0]
+    return raw
+
+
+def safe_int(x):
+    try:
+        return int(x)
+    except Exception:
+        return 0
+
+
+def format_korean_unit(number):
+    """숫자를 한국어 단위(만, 억)로 포맷팅"""
+    if number >= 100000000:
+        return f"{number / 100000000:.1f}억"
+    elif number >= 10000:
+        return f"{number / 10000:.1f}만"
+    else:
+        return f"{number:,}"
+
+def open_sqlite(path: str) -> sqlite3.Connection:
+    """여러 프로세스/스레드가 함께 쓰는 SQLite 연결 (WAL + busy timeout, autocommit)"""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
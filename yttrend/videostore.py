@@ -0,0 +1,116 @@
+"""
+영상 메타데이터 저장소 (SQLite)
+
+제목/설명/썸네일/길이처럼 거의 바뀌지 않는 필드를 video_id 별로 저장해 두고,
+이미 아는 영상은 videos.list 를 part=statistics 로만 불러서 저장된 필드와 합침
+→ 같은 item 모양이라 build_video_dataframe 결과도 그대로, 응답 크기와 파싱 시간만 줄어듦
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List
+
+from .utils import open_sqlite
+
+VIDEO_STORE_DB = os.environ.get("YT_VIDEO_DB", "video_metadata.sqlite3")
+
+# 저장된 고정 필드를 이 시간(초)이 지나면 다시 전체 part 로 받아 갱신 (제목/썸네일 수정 반영)
+VIDEO_STATIC_TTL = int(os.environ.get("YT_VIDEO_STATIC_TTL", str(7 * 24 * 3600)))
+
+# 저장하는 snippet 필드 (build_video_dataframe 이 쓰는 것만)
+STATIC_SNIPPET_FIELDS = ["title", "description", "channelTitle", "channelId", "publishedAt"]
+
+
+def static_part(item: Dict) -> Dict:
+    """videos.list item 에서 통계를 뺀 고정 필드만 추림"""
+    snippet = item.get("snippet", {})
+    static = {"id": item.get("id"), "snippet": {k: snippet[k] for k in STATIC_SNIPPET_FIELDS if k in snippet}}
+    thumbnail = snippet.get("thumbnails", {}).get("medium")
+    if thumbnail:
+        static["snippet"]["thumbnails"] = {"medium": {"url": thumbnail.get("url", "")}}
+    static["contentDetails"] = {"duration": item.get("contentDetails", {}).get("duration", "")}
+    return static
+
+
+class VideoMetadataStore:
+    """video_id → 고정 필드(zlib 압축 JSON) 저장소, 스레드별 연결"""
+
+    def __init__(self, path: str, static_ttl: int = VIDEO_STATIC_TTL):
+        self.path = path
+        self.static_ttl = static_ttl
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS video_metadata (
+                    video_id TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    published_at TEXT,
+                    data BLOB NOT NULL,
+                    fetched_at REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_video_metadata_channel ON video_metadata (channel_id)")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """TTL 안에 저장된 영상의 고정 필드 {video_id: item} (없거나 오래된 ID 는 빠짐, DB 오류 시 빈 dict)"""
+        found = {}
+        if not video_ids:
+            return found
+        cutoff = time.time() - self.static_ttl
+        try:
+            conn = self._conn()
+            for i in range(0, len(video_ids), 500):
+                chunk = video_ids[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT video_id, data FROM video_metadata WHERE fetched_at >= ? "
+                    f"AND video_id IN ({', '.join('?' for _ in chunk)})",
+                    [cutoff, *chunk],
+                ).fetchall()
+                for video_id, data in rows:
+                    found[video_id] = json.loads(zlib.decompress(data))
+        except sqlite3.Error:
+            return {}
+        return found
+
+    def put_many(self, items: List[Dict]):
+        """전체 part 로 받은 item 들의 고정 필드를 저장 (DB 오류는 무시: 다음에 다시 전체 조회할 뿐)"""
+        now = time.time()
+        rows = []
+        for item in items:
+            static = static_part(item)
+            rows.append((
+                static["id"], static["snippet"].get("channelId"), static["snippet"].get("publishedAt"),
+                zlib.compress(json.dumps(static, ensure_ascii=False).encode("utf-8")), now,
+            ))
+        if not rows:
+            return
+        try:
+            self._conn().executemany(
+                """
+                INSERT INTO video_metadata (video_id, channel_id, published_at, data, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    channel_id = excluded.channel_id, published_at = excluded.published_at,
+                    data = excluded.data, fetched_at = excluded.fetched_at
+                """,
+                rows,
+            )
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        self._conn().execute("DELETE FROM video_metadata")
+
+
+VIDEO_STORE = VideoMetadataStore(VIDEO_STORE_DB)
@@ -0,0 +1,357 @@
+"""
+워치리스트 폴링 엔진 (ETag 조건부 요청)
+
+추적 중인 채널/영상을 주기적으로 새로고침
+- 리소스는 종류별로 최대 50개씩 고정된 배치에 묶임 → 배치마다 list 호출 1회 (1 unit)
+- 배치 응답의 ETag 를 저장해 두고 다음 새로고침 때 If-None-Match 로 보냄 → 304 면 배치 전체를 건너뜀
+- 200 이어도 item 별 ETag 가 그대로인 리소스는 바뀌지 않은 것으로 처리
+- 배치마다 다음 폴링 시각을 주기 안에서 고르게 흩어 두고, 폴링 1회에 쓸 쿼터 상한을 둬서 한꺼번에 몰리지 않게 함
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, NamedTuple
+
+import pandas as pd
+
+from .cache import api_list_conditional
+from .client import build_youtube
+from .ingest import INGEST_QUEUE
+from .keyword_index import KEYWORD_INDEX
+from .momentum import VIEW_OBSERVATIONS
+from .quota import QUOTA_COST, VIDEOS_LIST_BATCH
+from .utils import open_sqlite
+
+WATCHLIST_DB = os.environ.get("YT_WATCHLIST_DB", "watchlist.sqlite3")
+
+# 기본 새로고침 주기(초)
+WATCHLIST_DEFAULT_INTERVAL = int(os.environ.get("YT_WATCHLIST_INTERVAL", str(6 * 3600)))
+
+# 백그라운드 폴링이 하루에 쓸 수 있는 쿼터 (틱마다 나눠서 적립)
+WATCHLIST_DAILY_UNITS = int(os.environ.get("YT_WATCHLIST_DAILY_UNITS", "1000"))
+
+# 종류별 API 호출 방식
+WATCH_KINDS = {
+    "channel": {"endpoint": "channels", "part": "snippet,statistics,contentDetails"},
+    "video": {"endpoint": "videos", "part": "snippet,contentDetails,statistics"},
+}
+
+# 배치별 첫 폴링 시각을 주기 안에 흩어 놓을 때 쓰는 황금비 (배치 번호가 늘어도 간격이 고르게 유지됨)
+_SPREAD_RATIO = 0.6180339887498949
+
+
+class PollReport(NamedTuple):
+    """poll_due 한 번의 결과"""
+    batches: int
+    not_modified: int
+    changed: Dict[str, List[Dict]]
+    unchanged: int
+    missing: int
+    units: int
+
+
+class Watchlist:
+    """워치리스트 저장소 (SQLite) 와 폴링 로직"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watch_batches (
+                    kind TEXT NOT NULL,
+                    batch_no INTEGER NOT NULL,
+                    interval_sec INTEGER NOT NULL,
+                    next_poll_at REAL NOT NULL,
+                    last_polled_at REAL,
+                    etag TEXT,
+                    PRIMARY KEY (kind, batch_no)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_watch_batches_due ON watch_batches (next_poll_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watch_resources (
+                    kind TEXT NOT NULL,
+                    resource_id TEXT NOT NULL,
+                    batch_no INTEGER NOT NULL,
+                    added_at REAL NOT NULL,
+                    etag TEXT,
+                    data BLOB,
+                    last_changed_at REAL,
+                    PRIMARY KEY (kind, resource_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_watch_resources_batch ON watch_resources (kind, batch_no)")
+            self._local.conn = conn
+        return conn
+
+    def add(self, kind: str, resource_ids: List[str], interval_sec: int = WATCHLIST_DEFAULT_INTERVAL) -> int:
+        """
+        리소스를 워치리스트에 추가 (이미 있으면 그대로) 하고 새로 추가된 수를 반환
+        같은 주기의 빈자리가 있는 배치부터 채우고, 구성이 바뀐 배치는 ETag 를 비움
+        """
+        if kind not in WATCH_KINDS:
+            raise ValueError(f"알 수 없는 종류: {kind}")
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = {
+                rid for (rid,) in conn.execute("SELECT resource_id FROM watch_resources WHERE kind = ?", (kind,))
+            }
+            new_ids = [rid for rid in dict.fromkeys(resource_ids) if rid and rid not in existing]
+            open_batches = conn.execute(
+                """
+                SELECT b.batch_no, COUNT(r.resource_id) FROM watch_batches b
+                LEFT JOIN watch_resources r ON r.kind = b.kind AND r.batch_no = b.batch_no
+                WHERE b.kind = ? AND b.interval_sec = ?
+                GROUP BY b.batch_no HAVING COUNT(r.resource_id) < ? ORDER BY b.batch_no
+                """,
+                (kind, interval_sec, VIDEOS_LIST_BATCH),
+            ).fetchall()
+            next_batch_no = conn.execute(
+                "SELECT COALESCE(MAX(batch_no), -1) + 1 FROM watch_batches WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+
+            touched = set()
+            slots = [[batch_no, count] for batch_no, count in open_batches]
+            for rid in new_ids:
+                if not slots:
+                    offset = (next_batch_no * _SPREAD_RATIO % 1.0) * interval_sec
+                    conn.execute(
+                        "INSERT INTO watch_batches (kind, batch_no, interval_sec, next_poll_at) VALUES (?, ?, ?, ?)",
+                        (kind, next_batch_no, interval_sec, now + offset),
+                    )
+                    slots.append([next_batch_no, 0])
+                    next_batch_no += 1
+                slot = slots[0]
+                conn.execute(
+                    "INSERT INTO watch_resources (kind, resource_id, batch_no, added_at) VALUES (?, ?, ?, ?)",
+                    (kind, rid, slot[0], now),
+                )
+                touched.add(slot[0])
+                slot[1] += 1
+                if slot[1] >= VIDEOS_LIST_BATCH:
+                    slots.pop(0)
+            conn.executemany(
+                "UPDATE watch_batches SET etag = NULL WHERE kind = ? AND batch_no = ?",
+                [(kind, batch_no) for batch_no in touched],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(new_ids)
+
+    def remove(self, kind: str, resource_ids: List[str]) -> int:
+        """워치리스트에서 빼고 뺀 수를 반환 (구성이 바뀐 배치는 ETag 를 비우고, 빈 배치는 삭제)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            placeholders = ", ".join("?" for _ in resource_ids)
+            batches = [
+                batch_no for (batch_no,) in conn.execute(
+                    f"SELECT DISTINCT batch_no FROM watch_resources WHERE kind = ? AND resource_id IN ({placeholders})",
+                    [kind, *resource_ids],
+                )
+            ]
+            removed = conn.execute(
+                f"DELETE FROM watch_resources WHERE kind = ? AND resource_id IN ({placeholders})", [kind, *resource_ids],
+            ).rowcount
+            conn.executemany(
+                "UPDATE watch_batches SET etag = NULL WHERE kind = ? AND batch_no = ?", [(kind, b) for b in batches],
+            )
+            conn.execute(
+                """
+                DELETE FROM watch_batches WHERE kind = ? AND NOT EXISTS (
+                    SELECT 1 FROM watch_resources r WHERE r.kind = watch_batches.kind AND r.batch_no = watch_batches.batch_no
+                )
+                """,
+                (kind,),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def counts(self) -> Dict[str, int]:
+        """종류별 추적 중인 리소스 수"""
+        rows = self._conn().execute("SELECT kind, COUNT(*) FROM watch_resources GROUP BY kind").fetchall()
+        return dict(rows)
+
+    def load(self, kind: str) -> pd.DataFrame:
+        """종류별 리소스 목록과 마지막으로 받은 item (data 는 dict)"""
+        rows = self._conn().execute(
+            """
+            SELECT r.resource_id, r.batch_no, b.interval_sec, b.next_poll_at, b.last_polled_at,
+                   r.last_changed_at, r.etag, r.data
+            FROM watch_resources r JOIN watch_batches b ON b.kind = r.kind AND b.batch_no = r.batch_no
+            WHERE r.kind = ? ORDER BY r.resource_id
+            """,
+            (kind,),
+        ).fetchall()
+        df = pd.DataFrame(rows, columns=[
+            "resource_id", "batch_no", "interval_sec", "next_poll_at", "last_polled_at", "last_changed_at", "etag", "data",
+        ])
+        df["data"] = [json.loads(zlib.decompress(d)) if d else None for d in df["data"]]
+        for col in ["next_poll_at", "last_polled_at", "last_changed_at"]:
+            df[col] = pd.to_datetime(df[col], unit="s", utc=True)
+        return df
+
+    def _due_batches(self, now: float, limit: int) -> List[tuple]:
+        return self._conn().execute(
+            """
+            SELECT kind, batch_no, interval_sec, etag FROM watch_batches
+            WHERE next_poll_at <= ? ORDER BY next_poll_at LIMIT ?
+            """,
+            (now, limit),
+        ).fetchall()
+
+    def _poll_batch(self, youtube, kind: str, batch_no: int, interval_sec: int, etag: str, now: float):
+        """배치 1개 새로고침 → (304 여부, 바뀐 item 목록, 그대로인 수, 응답에 없는 수)"""
+        conn = self._conn()
+        known = dict(conn.execute(
+            "SELECT resource_id, etag FROM watch_resources WHERE kind = ? AND batch_no = ? ORDER BY resource_id",
+            (kind, batch_no),
+        ).fetchall())
+        spec = WATCH_KINDS[kind]
+        resp = api_list_conditional(
+            youtube, spec["endpoint"], etag, part=spec["part"], id=",".join(known), maxResults=VIDEOS_LIST_BATCH,
+        )
+
+        changed, unchanged = [], 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if resp is not None:
+                for item in resp.get("items", []):
+                    rid = item.get("id")
+                    if rid not in known:
+                        continue
+                    if item.get("etag") and item.get("etag") == known[rid]:
+                        unchanged += 1
+                        continue
+                    changed.append(item)
+                conn.executemany(
+                    """
+                    UPDATE watch_resources SET etag = ?, data = ?, last_changed_at = ?
+                    WHERE kind = ? AND resource_id = ?
+                    """,
+                    [
+                        (item.get("etag"), zlib.compress(json.dumps(item, ensure_ascii=False).encode("utf-8")), now,
+                         kind, item["id"])
+                        for item in changed
+                    ],
+                )
+            conn.execute(
+                """
+                UPDATE watch_batches SET etag = COALESCE(?, etag), last_polled_at = ?, next_poll_at = ?
+                WHERE kind = ? AND batch_no = ?
+                """,
+                (resp.get("etag") if resp else None, now, now + interval_sec, kind, batch_no),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        returned = len(changed) + unchanged if resp is not None else len(known)
+        return resp is None, changed, unchanged, len(known) - returned
+
+    def poll_due(
+        self, api_key: str, max_units: int = None, now: float = None,
+        on_change: Callable[[str, List[Dict]], None] = None,
+    ) -> PollReport:
+        """
+        다음 폴링 시각이 지난 배치를 오래된 순서로 새로고침 (max_units 를 넘지 않는 만큼만)
+        바뀐 item 은 종류별로 모아 반환하고, on_change(kind, items) 가 있으면 배치마다 호출
+        바뀐 영상의 조회수 관측/키워드 색인 쓰기는 INGEST_QUEUE 로 넘김 (폴링 루프에서 쓰기 잠금을 기다리지 않음)
+        """
+        now = time.time() if now is None else now
+        limit = -1 if max_units is None else max_units // min(QUOTA_COST[s["endpoint"]] for s in WATCH_KINDS.values())
+        youtube = build_youtube(api_key)
+        batches = not_modified = unchanged = missing = units = 0
+        changed: Dict[str, List[Dict]] = {}
+        for kind, batch_no, interval_sec, etag in self._due_batches(now, limit):
+            cost = QUOTA_COST[WATCH_KINDS[kind]["endpoint"]]
+            if max_units is not None and units + cost > max_units:
+                break
+            was_304, items, same, gone = self._poll_batch(youtube, kind, batch_no, interval_sec, etag, now)
+            batches += 1
+            units += cost
+            not_modified += was_304
+            unchanged += same
+            missing += gone
+            if items:
+                if kind == "video":
+                    INGEST_QUEUE.submit(VIEW_OBSERVATIONS.record, items, now)
+                    INGEST_QUEUE.submit(KEYWORD_INDEX.update_items, items, now)
+                changed.setdefault(kind, []).extend(items)
+                if on_change is not None:
+                    on_change(kind, items)
+        return PollReport(batches, not_modified, changed, unchanged, missing, units)
+
+
+WATCHLIST = Watchlist(WATCHLIST_DB)
+
+
+class WatchlistPoller:
+    """
+    워치리스트를 백그라운드 스레드에서 주기적으로 폴링
+    하루 쿼터(daily_units)를 틱마다 나눠 적립하고, 적립된 만큼만 써서 폴링이 하루에 고르게 퍼지도록 함
+    """
+
+    def __init__(
+        self, api_key: str, watchlist: Watchlist = WATCHLIST, daily_units: int = WATCHLIST_DAILY_UNITS,
+        tick_sec: float = 60.0, on_change: Callable[[str, List[Dict]], None] = None,
+        on_error: Callable[[Exception], None] = None,
+    ):
+        self.api_key = api_key
+        self.watchlist = watchlist
+        self.daily_units = daily_units
+        self.tick_sec = tick_sec
+        self.on_change = on_change
+        self.on_error = on_error
+        self.last_report: PollReport = None
+        self._allowance = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def tick(self) -> PollReport:
+        """적립된 쿼터 안에서 한 번 폴링 (밀린 배치가 없으면 적립분은 하루치까지만 쌓임)"""
+        self._allowance = min(self._allowance + self.daily_units * self.tick_sec / 86400, self.daily_units)
+        report = self.watchlist.poll_due(self.api_key, max_units=int(self._allowance), on_change=self.on_change)
+        self._allowance -= report.units
+        self.last_report = report
+        return report
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:  # 쿼터 소진/네트워크 오류가 나도 다음 틱에 다시 시도
+                if self.on_error is not None:
+                    self.on_error(e)
+            self._stop.wait(self.tick_sec)
+
+    def start(self) -> "WatchlistPoller":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="watchlist-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)